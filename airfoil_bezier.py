@@ -0,0 +1,437 @@
+"""
+Auswertung der Bezier-Kurven aus der Profildatenbank ohne Fusion-API.
+
+Die Kontrollpolygone kommen wie von sqlDatabase.get_airfoil_coordinates geliefert als
+(top_r, bottom), beide Seiten jeweils von der Nase zur Endleiste. Ausgewertet wird über eine
+vorberechnete Bernstein-Basismatrix, mehrere Profile auf einmal mit einer Matrixmultiplikation.
+
+Ist NumPy installiert (z.B. außerhalb von Fusion 360), wird es verwendet und die Funktionen
+liefern Arrays, sonst wird in reinem Python gerechnet und es werden Listen geliefert.
+"""
+
+import heapq
+from functools import lru_cache
+from itertools import repeat
+from math import comb, cos, dist, hypot, pi
+from operator import itemgetter, mul
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEGREE = 9
+
+
+def parameter_values(count, spacing="cosine"):
+    # Parameterwerte 0..1, "cosine" verdichtet die Punkte an Nase und Endleiste
+    if count < 2:
+        return (0.0,)
+    if spacing == "cosine":
+        return tuple(0.5 * (1.0 - cos(pi * i / (count - 1))) for i in range(count))
+    return tuple(i / (count - 1) for i in range(count))
+
+
+def _basis_rows(degree, t_values):
+    coefficients = [comb(degree, k) for k in range(degree + 1)]
+    return tuple(
+        tuple(coefficients[k] * t ** k * (1.0 - t) ** (degree - k) for k in range(degree + 1))
+        for t in t_values
+    )
+
+
+@lru_cache(maxsize=32)
+def _bernstein_rows(degree, t_values):
+    return _basis_rows(degree, t_values)
+
+
+@lru_cache(maxsize=32)
+def _bernstein_array(degree, t_values):
+    basis = np.array(_bernstein_rows(degree, t_values))
+    basis.flags.writeable = False
+    return basis
+
+
+def bernstein_matrix(degree, t_values):
+    # Basismatrix (len(t_values) x degree + 1), wird je Grad und Parametersatz nur einmal berechnet
+    t_values = tuple(float(t) for t in t_values)
+    if np is not None:
+        return _bernstein_array(degree, t_values)
+    return _bernstein_rows(degree, t_values)
+
+
+def _evaluate_rows(basis, control_points):
+    xs = [float(point[0]) for point in control_points]
+    ys = [float(point[1]) for point in control_points]
+    return [(sum(map(mul, row, xs)), sum(map(mul, row, ys))) for row in basis]
+
+
+def evaluate_curve(control_points, t_values):
+    # Punkte (x, y) einer Bezier-Kurve beliebigen Grades an den Stellen t_values
+    basis = bernstein_matrix(len(control_points) - 1, t_values)
+    if np is not None:
+        return basis @ np.asarray(control_points, dtype=np.float64)[:, :2]
+    return _evaluate_rows(basis, control_points)
+
+
+def evaluate_airfoils(airfoils, t_values):
+    # Wertet viele Profile (Liste von (top_r, bottom)) gleichen Grades auf einmal aus.
+    # NumPy: Array der Form (Profile, 2 Seiten, len(t_values), 2)
+    # sonst: Liste von (oben, unten) mit Listen von (x, y)
+    airfoils = list(airfoils)
+    if not airfoils:
+        return np.empty((0, 2, len(t_values), 2)) if np is not None else []
+
+    degree = len(airfoils[0][0]) - 1
+    basis = bernstein_matrix(degree, t_values)
+
+    if np is not None:
+        polygons = np.asarray(airfoils, dtype=np.float64)[..., :2]
+        return basis @ polygons
+
+    return [(_evaluate_rows(basis, top), _evaluate_rows(basis, bottom)) for top, bottom in airfoils]
+
+
+def span_stations(count):
+    # Gleichmäßig verteilte Spannweitenstationen 0 (Wurzel) .. 1 (Spitze)
+    if count < 2:
+        return (0.0,)
+    return tuple(i / (count - 1) for i in range(count))
+
+
+def blend_airfoils(root, tip, stations, weight=None):
+    # Zwischenprofile zwischen root und tip (je (top_r, bottom), gleicher Grad) an den Stationen.
+    # weight bildet eine Station auf den Anteil des tip-Profils ab, ohne weight wird linear gemischt.
+    # NumPy: Array der Form (Stationen, 2 Seiten, Grad + 1, 2), sonst Liste von (oben, unten)
+    if len(root[0]) != len(tip[0]) or len(root[1]) != len(tip[1]):
+        raise ValueError("root and tip airfoil must have the same number of control points")
+
+    weights = [float(weight(eta)) if weight is not None else float(eta) for eta in stations]
+
+    if np is not None:
+        root = np.asarray(root, dtype=np.float64)[..., :2]
+        tip = np.asarray(tip, dtype=np.float64)[..., :2]
+        return root + np.asarray(weights)[:, None, None, None] * (tip - root)
+
+    def blend_side(root_side, tip_side, w):
+        return [(r[0] + w * (t[0] - r[0]), r[1] + w * (t[1] - r[1])) for r, t in zip(root_side, tip_side)]
+
+    return [(blend_side(root[0], tip[0], w), blend_side(root[1], tip[1], w)) for w in weights]
+
+
+DESCRIPTOR_NAMES = ("thickness", "thickness_x", "camber", "camber_x", "le_radius", "te_gap", "area")
+DESCRIPTOR_SAMPLES = 100
+
+
+def _interpolate(grid, xs, ys):
+    # Lineare Interpolation auf aufsteigende Stützstellen xs, außerhalb konstant (wie numpy.interp)
+    values = []
+    k = 0
+    last = len(xs) - 1
+    for x in grid:
+        if x <= xs[0]:
+            values.append(ys[0])
+            continue
+        if x >= xs[last]:
+            values.append(ys[last])
+            continue
+        while xs[k + 1] < x:
+            k += 1
+        x0, x1 = xs[k], xs[k + 1]
+        values.append(ys[k] if x1 == x0 else ys[k] + (ys[k + 1] - ys[k]) * (x - x0) / (x1 - x0))
+    return values
+
+
+def _nose_radius(polygon):
+    # Krümmungsradius der Bezier-Kurve im ersten Kontrollpunkt (t = 0)
+    n = len(polygon) - 1
+    (x0, y0), (x1, y1), (x2, y2) = [(float(p[0]), float(p[1])) for p in polygon[:3]]
+    ax, ay = x1 - x0, y1 - y0
+    bx, by = x2 - x1, y2 - y1
+    cross = abs(ax * by - ay * bx)
+    if cross == 0.0:
+        return None
+    return (ax * ax + ay * ay) ** 1.5 * n / ((n - 1) * cross)
+
+
+def airfoil_descriptors(airfoils, samples=DESCRIPTOR_SAMPLES):
+    # Geometrische Kennwerte je Profil (top_r, bottom) in der Reihenfolge DESCRIPTOR_NAMES,
+    # alle Längen bezogen auf die Profiltiefe: maximale Dicke und deren Lage, maximale Wölbung
+    # und deren Lage, Nasenradius, Spalt an der Endleiste und Fläche
+    airfoils = list(airfoils)
+    if not airfoils:
+        return []
+
+    t_values = parameter_values(samples)
+    curves = evaluate_airfoils(airfoils, t_values)
+    descriptors = []
+
+    for (top, bottom), (upper, lower) in zip(airfoils, curves):
+        nose_x = float(top[0][0])
+        chord = min(float(top[-1][0]), float(bottom[-1][0])) - nose_x
+        if chord <= 0.0:
+            descriptors.append((None,) * len(DESCRIPTOR_NAMES))
+            continue
+
+        grid = [nose_x + chord * t for t in t_values]
+        if np is not None:
+            y_upper = np.interp(grid, upper[:, 0], upper[:, 1])
+            y_lower = np.interp(grid, lower[:, 0], lower[:, 1])
+            thickness = y_upper - y_lower
+            camber = 0.5 * (y_upper + y_lower)
+            i = int(np.argmax(thickness))
+            j = int(np.argmax(np.abs(camber)))
+            area = float(np.sum((thickness[1:] + thickness[:-1]) * np.diff(grid))) * 0.5
+        else:
+            y_upper = _interpolate(grid, [p[0] for p in upper], [p[1] for p in upper])
+            y_lower = _interpolate(grid, [p[0] for p in lower], [p[1] for p in lower])
+            thickness = [u - l for u, l in zip(y_upper, y_lower)]
+            camber = [0.5 * (u + l) for u, l in zip(y_upper, y_lower)]
+            i = max(range(len(thickness)), key=thickness.__getitem__)
+            j = max(range(len(camber)), key=lambda k: abs(camber[k]))
+            area = 0.5 * sum((thickness[k + 1] + thickness[k]) * (grid[k + 1] - grid[k]) for k in range(len(grid) - 1))
+
+        radii = [r for r in (_nose_radius(top), _nose_radius(bottom)) if r is not None]
+        te_gap = ((float(top[-1][0]) - float(bottom[-1][0])) ** 2 + (float(top[-1][1]) - float(bottom[-1][1])) ** 2) ** 0.5
+
+        descriptors.append((
+            float(thickness[i]) / chord,
+            (grid[i] - nose_x) / chord,
+            float(camber[j]) / chord,
+            (grid[j] - nose_x) / chord,
+            sum(radii) / len(radii) / chord if radii else None,
+            te_gap / chord,
+            area / chord ** 2,
+        ))
+
+    return descriptors
+
+
+def shape_vector(top_r, bottom):
+    # Kontrollpolygon als flacher Vektor (x0, y0, x1, y1, ...) von der Endleiste oben über die
+    # Nase zur Endleiste unten, verschoben auf die Nase und skaliert auf die Profiltiefe
+    points = list(reversed(top_r)) + list(bottom)[1:]
+    nose_x, nose_y = float(top_r[0][0]), float(top_r[0][1])
+    chord = max(float(top_r[-1][0]), float(bottom[-1][0])) - nose_x
+    if chord <= 0.0:
+        chord = 1.0
+    return tuple(value for point in points
+                 for value in ((float(point[0]) - nose_x) / chord, (float(point[1]) - nose_y) / chord))
+
+
+def shape_matrix(vectors):
+    # Vektoren aus shape_vector für nearest_shapes, mit NumPy als Array, sonst als Liste
+    if np is not None:
+        return np.asarray(vectors, dtype=np.float64).reshape(len(vectors), -1)
+    return list(vectors)
+
+
+def nearest_shapes(query, vectors, k=10):
+    # Die k nächsten Vektoren zu query (euklidischer Abstand) als [(Index, Abstand), ...],
+    # aufsteigend sortiert, Suche ohne Baum über alle Vektoren
+    if len(vectors) == 0 or k <= 0:
+        return []
+
+    if np is not None:
+        query = np.asarray(query, dtype=np.float64)
+        difference = vectors - query
+        distances = np.sqrt(np.einsum("ij,ij->i", difference, difference))
+        k = min(k, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [(int(i), float(distances[i])) for i in nearest]
+
+    return heapq.nsmallest(k, enumerate(map(dist, vectors, repeat(query))), key=itemgetter(1))
+
+
+FIT_SAMPLES = 60
+FIT_CORRECTIONS = 2
+
+
+def parse_coordinate_text(text):
+    # Punktdatei im Selig-Format (Endleiste oben -> Nase -> Endleiste unten) oder im
+    # Lednicer-Format (Punktzahlen, dann Ober- und Unterseite je von der Nase zur Endleiste)
+    # -> (Name, Oberseite, Unterseite), beide Seiten von der Nase zur Endleiste
+    rows = text.splitlines()
+    name = rows[0].strip() if rows else ""
+    points = []
+    for number, line in enumerate(rows[1:], 2):
+        if not line.strip():
+            continue
+        try:
+            x, y = map(float, line.split())
+        except ValueError:
+            raise ValueError(f"line {number}: expected 'x y', got '{line.strip()}'")
+        points.append((x, y))
+
+    if points and points[0][0] > 1.5 and points[0][1] > 1.5:
+        upper_count, lower_count = int(points[0][0]), int(points[0][1])
+        if upper_count + lower_count != len(points) - 1:
+            raise ValueError(f"Lednicer header announces {upper_count} + {lower_count} points, "
+                             f"file has {len(points) - 1}")
+        upper = points[1:upper_count + 1]
+        lower = points[upper_count + 1:]
+    else:
+        nose = min(range(len(points)), key=lambda i: points[i][0]) if points else 0
+        upper = points[nose::-1]
+        lower = points[nose:]
+
+    if len(upper) < 4 or len(lower) < 4:
+        raise ValueError(f"need at least 4 points per side, got {len(upper)} upper and {len(lower)} lower")
+    return name, upper, lower
+
+
+def format_coordinate_text(name, upper, lower):
+    # Gegenstück zu parse_coordinate_text: Selig-Format, Endleiste oben -> Nase -> Endleiste unten
+    points = list(reversed(list(upper))) + list(lower)[1:]
+    return name + "\n" + "".join(f"{float(x):.6f} {float(y):.6f}\n" for x, y in points)
+
+
+def _resample(points, s_values):
+    # Punkte auf dem Polygonzug an den Stellen s_values (0..1) der Bogenlänge
+    lengths = [0.0]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        lengths.append(lengths[-1] + hypot(x1 - x0, y1 - y0))
+    if lengths[-1] <= 0.0:
+        raise ValueError("airfoil side has zero length")
+    grid = [s * lengths[-1] for s in s_values]
+    return list(zip(_interpolate(grid, lengths, [p[0] for p in points]),
+                    _interpolate(grid, lengths, [p[1] for p in points])))
+
+
+def _solve(matrix, rhs):
+    # Gauß-Elimination mit Spaltenpivotsuche für die kleinen Normalgleichungen des Fits
+    n = len(rhs)
+    rows = [list(row) + [value] for row, value in zip(matrix, rhs)]
+    for i in range(n):
+        pivot = max(range(i, n), key=lambda r: abs(rows[r][i]))
+        rows[i], rows[pivot] = rows[pivot], rows[i]
+        for r in range(i + 1, n):
+            factor = rows[r][i] / rows[i][i]
+            for c in range(i, n + 1):
+                rows[r][c] -= factor * rows[i][c]
+    solution = [0.0] * n
+    for i in reversed(range(n)):
+        solution[i] = (rows[i][n] - sum(rows[i][c] * solution[c] for c in range(i + 1, n))) / rows[i][i]
+    return solution
+
+
+def _least_squares(basis, columns, rhs):
+    # Normalgleichungen für die Spalten columns der Basismatrix
+    a = [[row[k] for row in basis] for k in columns]
+    return _solve([[sum(map(mul, ai, aj)) for aj in a] for ai in a], [sum(map(mul, ai, rhs)) for ai in a])
+
+
+def _fit_side_rows(samples, t_values, degree, corrections):
+    # Ein Profilseite von der Nase zur Endleiste: Nase, Endleiste und x des zweiten Punkts fest
+    (x0, y0), (xn, yn) = samples[0], samples[-1]
+    basis = bernstein_matrix(degree, t_values)
+
+    for iteration in range(corrections + 1):
+        free_x = _least_squares(basis, range(2, degree),
+                                [q[0] - (b[0] + b[1]) * x0 - b[degree] * xn for q, b in zip(samples, basis)])
+        free_y = _least_squares(basis, range(1, degree),
+                                [q[1] - b[0] * y0 - b[degree] * yn for q, b in zip(samples, basis)])
+        polygon = [(x0, y0), (x0, free_y[0])] + list(zip(free_x, free_y[1:])) + [(xn, yn)]
+        curve = _evaluate_rows(basis, polygon)
+        if iteration == corrections:
+            break
+
+        # Newton-Schritt je Punkt auf den Fußpunkt der Kurve, Randparameter bleiben 0 und 1
+        first = [(degree * (b[0] - a[0]), degree * (b[1] - a[1])) for a, b in zip(polygon, polygon[1:])]
+        second = [((degree - 1) * (b[0] - a[0]), (degree - 1) * (b[1] - a[1])) for a, b in zip(first, first[1:])]
+        d1 = _evaluate_rows(_basis_rows(degree - 1, t_values), first)
+        d2 = _evaluate_rows(_basis_rows(degree - 2, t_values), second)
+        corrected = [t_values[0]]
+        for i in range(1, len(t_values) - 1):
+            ex, ey = curve[i][0] - samples[i][0], curve[i][1] - samples[i][1]
+            slope = d1[i][0] ** 2 + d1[i][1] ** 2 + ex * d2[i][0] + ey * d2[i][1]
+            t = t_values[i] - (ex * d1[i][0] + ey * d1[i][1]) / slope if slope > 0.0 else t_values[i]
+            corrected.append(min(max(t, 0.0), 1.0))
+        corrected.append(t_values[-1])
+        t_values = tuple(corrected)
+        basis = _basis_rows(degree, t_values)
+
+    error = max(hypot(c[0] - q[0], c[1] - q[1]) for c, q in zip(curve, samples))
+    return polygon, error
+
+
+def _basis_array(degree, t_values):
+    t = np.asarray(t_values, dtype=np.float64)[..., None]
+    k = np.arange(degree + 1)
+    coefficients = np.array([comb(degree, i) for i in k], dtype=np.float64)
+    return coefficients * t ** k * (1.0 - t) ** (degree - k)
+
+
+def _fit_sides_array(samples, t_values, degree, corrections):
+    # Wie _fit_side_rows für alle Seiten auf einmal, samples hat die Form (Seiten, Punkte, 2)
+    sides = len(samples)
+    first, last = samples[:, 0], samples[:, -1]
+    basis = np.broadcast_to(bernstein_matrix(degree, t_values), (sides, len(t_values), degree + 1))
+    t = np.broadcast_to(np.asarray(t_values), (sides, len(t_values)))
+
+    def least_squares(a, rhs):
+        normal = np.einsum("smi,smj->sij", a, a)
+        return np.linalg.solve(normal, np.einsum("smi,sm->si", a, rhs)[..., None])[..., 0]
+
+    for iteration in range(corrections + 1):
+        rhs_x = samples[..., 0] - (basis[..., 0] + basis[..., 1]) * first[:, None, 0] - basis[..., degree] * last[:, None, 0]
+        rhs_y = samples[..., 1] - basis[..., 0] * first[:, None, 1] - basis[..., degree] * last[:, None, 1]
+        polygons = np.empty((sides, degree + 1, 2))
+        polygons[:, 0] = first
+        polygons[:, 1, 0] = first[:, 0]
+        polygons[:, 2:degree, 0] = least_squares(basis[..., 2:degree], rhs_x)
+        polygons[:, 1:degree, 1] = least_squares(basis[..., 1:degree], rhs_y)
+        polygons[:, degree] = last
+        curves = basis @ polygons
+        if iteration == corrections:
+            break
+
+        first_derivative = degree * np.diff(polygons, axis=1)
+        second_derivative = (degree - 1) * np.diff(first_derivative, axis=1)
+        d1 = _basis_array(degree - 1, t) @ first_derivative
+        d2 = _basis_array(degree - 2, t) @ second_derivative
+        difference = curves - samples
+        slope = np.einsum("smd,smd->sm", d1, d1) + np.einsum("smd,smd->sm", difference, d2)
+        step = np.einsum("smd,smd->sm", difference, d1) / np.where(slope > 0.0, slope, np.inf)
+        t = np.clip(t - step, 0.0, 1.0)
+        t[:, 0], t[:, -1] = t_values[0], t_values[-1]
+        basis = _basis_array(degree, t)
+
+    errors = np.sqrt(np.einsum("smd,smd->sm", curves - samples, curves - samples)).max(axis=1)
+    return polygons, errors
+
+
+def fit_airfoils(airfoils, degree=DEGREE, corrections=FIT_CORRECTIONS, samples=FIT_SAMPLES):
+    # Least-Squares-Fit von Bezier-Kurven des Grades degree an Punktdateien, airfoils = Liste von
+    # (Oberseite, Unterseite) wie von parse_coordinate_text. Beide Seiten werden nach Bogenlänge
+    # auf dieselben Parameterwerte verteilt und teilen sich die Bernstein-Basismatrix; corrections
+    # Newton-Schritte projizieren die Punkte danach auf die Kurve (Parameterkorrektur).
+    # Nase und Endleisten bleiben fest, der zweite Kontrollpunkt liegt senkrecht über bzw. unter
+    # der Nase wie in den bez.dat-Dateien.
+    # -> Liste von (top_r, bottom, Fehler), Fehler = größte Abweichung bezogen auf die Profiltiefe
+    airfoils = list(airfoils)
+    if not airfoils:
+        return []
+
+    t_values = parameter_values(samples)
+    sides = []
+    for upper, lower in airfoils:
+        sides.append(_resample(upper, t_values))
+        sides.append(_resample([upper[0]] + list(lower[1:]), t_values))
+
+    if np is not None:
+        polygons, errors = _fit_sides_array(np.asarray(sides, dtype=np.float64), t_values, degree, corrections)
+        polygons = [[(float(x), float(y)) for x, y in polygon] for polygon in polygons]
+        errors = [float(error) for error in errors]
+    else:
+        fits = [_fit_side_rows(side, t_values, degree, corrections) for side in sides]
+        polygons = [polygon for polygon, error in fits]
+        errors = [error for polygon, error in fits]
+
+    results = []
+    for i in range(0, len(sides), 2):
+        top_r, bottom = polygons[i], polygons[i + 1]
+        chord = max(top_r[-1][0], bottom[-1][0]) - top_r[0][0]
+        results.append((top_r, bottom, max(errors[i], errors[i + 1]) / chord if chord > 0.0 else float("inf")))
+    return results
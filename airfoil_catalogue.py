@@ -0,0 +1,184 @@
+"""
+Schreibgeschützter Profilkatalog als Binärdatei für große, gemeinsam genutzte Bibliotheken.
+
+Aufbau (little-endian):
+    Kopf            HEADER, siehe unten
+    Punkte          float64-Paare (x, y) aller Profile hintereinander
+    Punktindex      count + 1 uint64, Nummer des ersten Punkts je Profil
+    Namensindex     count + 1 uint64, Byte-Offset des Namens im Namensblock
+    Namensblock     UTF-8-Namen hintereinander
+
+Die Profile sind wie in sqlDatabase.get_sorted_airfoils sortiert (COLLATE NOCASE, dann Name),
+gesucht wird per Binärsuche im Namensindex. Die Datei wird mit mmap geöffnet, Indizes und
+Punkte werden ohne Kopie gelesen (memoryview bzw. numpy.frombuffer), so dass Öffnen und Suchen
+nicht von der Größe der Bibliothek abhängen.
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"AIRFCAT\x00"
+VERSION = 1
+# Magic, Version, Anzahl Profile, Offsets von Punkten, Punktindex, Namensindex, Namensblock
+HEADER = struct.Struct("<8sIIQQQQ")
+
+# COLLATE NOCASE von SQLite faltet nur A-Z
+_NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def sort_key(name):
+    # Sortierung wie ORDER BY airfoil_name COLLATE NOCASE, airfoil_name
+    return name.translate(_NOCASE), name
+
+
+def write_catalogue(path, batches):
+    # Schreibt einen Katalog aus Paketen von (Name, Koordinaten), z.B. von
+    # sqlDatabase.iter_airfoil_batches, die Namen müssen nach sort_key sortiert sein.
+    # Die Punkte werden direkt geschrieben, nur Namen und Indizes bleiben im Speicher.
+    # Geschrieben wird in eine temporäre Datei, die zum Schluss den Katalog ersetzt.
+    temporary = path + ".tmp"
+    names = []
+    point_index = [0]
+    previous = None
+
+    try:
+        with open(temporary, "wb") as file:
+            file.write(b"\x00" * HEADER.size)
+
+            for batch in batches:
+                for name, coordinates in batch:
+                    key = sort_key(name)
+                    if previous is not None and key <= previous:
+                        raise ValueError(f"airfoils must be sorted by name, '{name}' follows '{previous[1]}'")
+                    previous = key
+
+                    file.write(struct.pack(f"<{2 * len(coordinates)}d", *(value for point in coordinates for value in point)))
+                    names.append(name.encode())
+                    point_index.append(point_index[-1] + len(coordinates))
+
+            name_index = [0]
+            for name in names:
+                name_index.append(name_index[-1] + len(name))
+
+            point_index_offset = file.tell()
+            file.write(struct.pack(f"<{len(point_index)}Q", *point_index))
+            name_index_offset = file.tell()
+            file.write(struct.pack(f"<{len(name_index)}Q", *name_index))
+            names_offset = file.tell()
+            file.write(b"".join(names))
+
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, len(names), HEADER.size, point_index_offset, name_index_offset, names_offset))
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+    os.replace(temporary, path)
+    return len(names)
+
+
+class AirfoilCatalogue:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count, points_offset, point_index_offset, name_index_offset, names_offset = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not an airfoil catalogue of version {VERSION}")
+
+        view = memoryview(self._map)
+        if sys.byteorder == "little":
+            self._point_index = view[point_index_offset:name_index_offset].cast("Q")
+            self._name_index = view[name_index_offset:names_offset].cast("Q")
+            self._points = view[points_offset:point_index_offset].cast("d")
+        else:
+            self._point_index = struct.unpack_from(f"<{self.count + 1}Q", self._map, point_index_offset)
+            self._name_index = struct.unpack_from(f"<{self.count + 1}Q", self._map, name_index_offset)
+            self._points = struct.unpack_from(f"<{self._point_index[-1] * 2}d", self._map, points_offset)
+        self._names = view[names_offset:]
+        self._points_offset = points_offset
+
+    def __len__(self):
+        return self.count
+
+    def name(self, i):
+        return str(self._names[self._name_index[i]:self._name_index[i + 1]], "utf-8")
+
+    def _bisect(self, key, right=False):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = sort_key(self.name(middle))
+            if middle_key < key or (right and middle_key == key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, name):
+        # Position von name im Katalog oder None
+        i = self._bisect(sort_key(name))
+        return i if i < self.count and self.name(i) == name else None
+
+    def names(self):
+        return [self.name(i) for i in range(self.count)]
+
+    def search(self, prefix="", after=None, limit=100):
+        # Wie sqlDatabase.search_airfoils: bis zu limit Namen mit prefix (ohne Beachtung der
+        # Groß-/Kleinschreibung von A-Z), after = letzter Name der vorigen Seite
+        lower = prefix.translate(_NOCASE)
+        upper = lower + "\U0010ffff"
+        i = self._bisect((lower, ""))
+        if after is not None:
+            i = max(i, self._bisect(sort_key(after), right=True))
+
+        names = []
+        while i < self.count and len(names) < limit:
+            name = self.name(i)
+            if name.translate(_NOCASE) >= upper:
+                break
+            names.append(name)
+            i += 1
+        return names
+
+    def points(self, i):
+        # Kontrollpunkte des i-ten Profils ohne Kopie: NumPy-Array (Punkte, 2), sonst flache
+        # memoryview (x0, y0, x1, y1, ...). Das Ergebnis verweist auf die gemappte Datei, solange
+        # es lebt, kann close() die Datei nicht freigeben (siehe dort).
+        start, end = self._point_index[i], self._point_index[i + 1]
+        if np is not None:
+            return np.frombuffer(self._map, dtype="<f8", count=2 * (end - start),
+                                 offset=self._points_offset + 16 * start).reshape(-1, 2)
+        return self._points[2 * start:2 * end]
+
+    def coordinates(self, name):
+        # Kontrollpunkte als [(x, y), ...] wie in airfoil_data gespeichert oder None
+        i = self.find(name)
+        if i is None:
+            return None
+        start, end = self._point_index[i], self._point_index[i + 1]
+        values = self._points[2 * start:2 * end]
+        return list(zip(values[0::2], values[1::2]))
+
+    def close(self):
+        # Gibt die Datei frei. Leben noch Ergebnisse von points(), lehnt mmap.close() mit
+        # BufferError ab; dann bleibt die Abbildung bestehen und wird mit dem letzten Verweis
+        # vom Garbage Collector geschlossen. close() läuft beim Beenden des Add-ins
+        # (sqlDatabase.close), ein Fehler hier darf das Aufräumen danach nicht verhindern.
+        for view in (self._point_index, self._name_index, self._points, self._names):
+            if isinstance(view, memoryview):
+                view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
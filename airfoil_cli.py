@@ -0,0 +1,273 @@
+"""
+Kommandozeilenwerkzeug für die Profildatenbank ohne Fusion 360, z.B. um eine Bibliothek auf
+einem Build-Server zu importieren und indiziert an die Konstrukteure weiterzugeben.
+
+    python airfoil_cli.py import ordner/ --workers 8 --processes --remove-missing
+    python airfoil_cli.py list --prefix NACA --where "thickness 9 12"
+    python airfoil_cli.py export bibliothek.zip --format selig
+    python airfoil_cli.py stats --json
+    python airfoil_cli.py quarantine --json
+    python airfoil_cli.py blend "NACA 2412" "NACA 0009" --stations 6 --prefix Flügel
+
+Ergebnisse gehen nach stdout, Meldungen der Datenbank und der Fortschritt nach stderr.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+try:
+    from . import airfoil_database
+except ImportError:
+    import airfoil_database
+
+
+def import_command(db, args, output):
+    files = []
+    folders = []
+    for path in args.paths:
+        # Absolute Pfade wie in sync_folder, sonst erkennt ein späterer Ordnerabgleich die
+        # Manifest-Einträge nicht wieder
+        (folders if os.path.isdir(path) else files).append(os.path.abspath(path))
+
+    def progress(done, total):
+        print(f"\r{done}/{total} files", end="", file=sys.stderr, flush=True)
+
+    options = {"workers": args.workers, "use_processes": args.processes, "progress": progress}
+    results = [db.sync_folder(folder, remove_missing=args.remove_missing, **options) for folder in folders]
+    if files:
+        results.append(db.import_airfoils_bulk(files, **options))
+    print(file=sys.stderr)
+
+    totals = {key: sum(result.get(key, 0) for result in results)
+              for key in ("imported", "updated", "skipped", "failed", "quarantined", "removed")}
+    print(", ".join(f"{key} {value}" for key, value in totals.items()), file=output)
+    for result in results:
+        for file_path, message in result["errors"]:
+            print(f"failed: {file_path}: {message}", file=output)
+        for airfoil_name, error in result["fitted"]:
+            if error > airfoil_database.FIT_ERROR_WARNING:
+                print(f"poor fit: {airfoil_name}: {error * 100:.2f} % of chord", file=output)
+
+    db.optimize()
+    return 1 if args.strict and totals["failed"] else 0
+
+
+def quarantine_command(db, args, output):
+    entries = db.quarantine_entries()
+    if args.json:
+        json.dump(entries, output, indent=2)
+        print(file=output)
+    else:
+        for entry in entries:
+            print(f"{entry['path']}\t{entry['airfoil_name']}\t{airfoil_database.QUARANTINE_REASON_SEPARATOR.join(entry['reasons'])}", file=output)
+    return 1 if args.strict and entries else 0
+
+
+def blend_command(db, args, output):
+    # Zwischenprofile zwischen Wurzel- und Spitzenprofil an gleichmäßig verteilten Stationen,
+    # gespeichert als "<prefix> <Station in %>". Wurzel und Spitze selbst sind schon in der Bibliothek.
+    root = db.get_airfoil_coordinates(args.root)
+    tip = db.get_airfoil_coordinates(args.tip)
+    if root[0] is None or tip[0] is None:
+        return 1
+
+    stations = airfoil_database.airfoil_bezier.span_stations(args.stations)[1:-1]
+    try:
+        blended = airfoil_database.airfoil_bezier.blend_airfoils(
+            root, tip, stations, weight=lambda eta: eta ** args.exponent)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    prefix = args.prefix or f"{args.root} - {args.tip}"
+    airfoils = [(f"{prefix} {round(eta * 100, 2):g}",
+                 [(float(x), float(y)) for x, y in top_r],
+                 [(float(x), float(y)) for x, y in bottom])
+                for eta, (top_r, bottom) in zip(stations, blended)]
+    count = db.store_airfoils(airfoils)
+    for airfoil_name, top_r, bottom in airfoils[:count]:
+        print(airfoil_name, file=output)
+    return 0 if count == len(airfoils) else 1
+
+
+def export_command(db, args, output):
+    count = db.export_airfoils(args.target, args.format, archive=args.zip or None, samples=args.samples)
+    print(f"exported {count} airfoils to {args.target}", file=output)
+    return 0
+
+
+def delete_command(db, args, output):
+    names = args.names
+    if names == ["-"]:
+        names = [line.strip() for line in sys.stdin if line.strip()]
+    count = db.delete_airfoils(names)
+    print(f"deleted {count} of {len(names)} airfoils", file=output)
+    return 0 if count == len(names) else 1
+
+
+def list_command(db, args, output):
+    try:
+        ranges = airfoil_database.parse_descriptor_filter(args.where) if args.where else None
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    # Seitenweise über den Namensindex, auch bei sehr großen Bibliotheken mit wenig Speicher
+    after = None
+    count = 0
+    while args.limit is None or count < args.limit:
+        page_size = airfoil_database.SEARCH_LIMIT if args.limit is None else min(airfoil_database.SEARCH_LIMIT, args.limit - count)
+        names = db.search_airfoils(args.prefix, after, page_size, ranges)
+        for name in names:
+            print(name, file=output)
+        count += len(names)
+        if len(names) < page_size:
+            break
+        after = names[-1]
+    return 0
+
+
+def similar_command(db, args, output):
+    top_r, bottom = db.get_airfoil_coordinates(args.name)
+    if top_r is None:
+        return 1
+    for airfoil_name, distance in db.find_similar_airfoils(args.name, args.k):
+        print(f"{airfoil_name}\t{distance:.5f}", file=output)
+    return 0
+
+
+def stats_command(db, args, output):
+    statistics = db.statistics()
+    if args.json:
+        json.dump(statistics, output, indent=2)
+        print(file=output)
+        return 0
+
+    for key, value in statistics.items():
+        if key == "descriptors":
+            for name, (low, high) in value.items():
+                if low is not None:
+                    print(f"{name}: {low * 100:.2f} % .. {high * 100:.2f} %", file=output)
+        elif key == "degrees":
+            print(f"degrees: {', '.join(f'{degree} ({count})' for degree, count in value.items())}", file=output)
+        else:
+            print(f"{key.replace('_', ' ')}: {value}", file=output)
+    return 0
+
+
+def catalogue_command(db, args, output):
+    count = db.write_catalogue(args.target)
+    print(f"wrote {count} airfoils to {args.target}", file=output)
+    return 0
+
+
+def optimize_command(db, args, output):
+    # Vor der Weitergabe: ohne NumPy beim Import ausgelassene Kennwerte nachrechnen
+    db.ensure_descriptors()
+    db.optimize()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Manage the airfoil library without Fusion 360.")
+    parser.add_argument("--database", default=airfoil_database.default_database_path(),
+                        help="airfoil database (default: %(default)s)")
+    parser.add_argument("--catalogue", help="read-only catalogue searched by list, similar and stats "
+                                            "(default: AIRFOIL_CATALOGUE or airfoil_catalogue.afc next to the database)")
+    parser.add_argument("--profile", action="store_true", help="print timings of the database calls to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import", help="import .bez.dat and Selig/Lednicer files or folders")
+    command.add_argument("paths", nargs="+", help="files or folders, folders are synchronised incrementally")
+    command.add_argument("--workers", type=int, default=airfoil_database.IMPORT_WORKERS,
+                         help="parallel parsers (default: %(default)s)")
+    command.add_argument("--processes", action="store_true", help="parse in processes instead of threads")
+    command.add_argument("--remove-missing", action="store_true",
+                         help="remove airfoils whose files were deleted from an imported folder")
+    command.add_argument("--strict", action="store_true", help="exit with status 1 if any file or airfoil was rejected")
+    command.set_defaults(run=import_command, use_catalogue=False)
+
+    command = commands.add_parser("quarantine", help="list airfoils and files rejected during imports with their reasons")
+    command.add_argument("--json", action="store_true")
+    command.add_argument("--strict", action="store_true", help="exit with status 1 if the quarantine is not empty")
+    command.set_defaults(run=quarantine_command, use_catalogue=False)
+
+    command = commands.add_parser("blend", help="store intermediate airfoils between a root and a tip airfoil")
+    command.add_argument("root")
+    command.add_argument("tip")
+    command.add_argument("--stations", type=int, default=5,
+                         help="span stations including root and tip (default: %(default)s)")
+    command.add_argument("--prefix", help="name prefix of the stored airfoils (default: 'ROOT - TIP')")
+    command.add_argument("--exponent", type=float, default=1.0,
+                         help="share of the tip airfoil is station ** EXPONENT (default: %(default)s, linear)")
+    command.set_defaults(run=blend_command, use_catalogue=False)
+
+    command = commands.add_parser("export", help="export all airfoils to a folder or a .zip file")
+    command.add_argument("target")
+    command.add_argument("--format", choices=sorted(airfoil_database.EXPORT_EXTENSIONS), default="bez")
+    command.add_argument("--zip", action="store_true", help="write a zip archive even without .zip extension")
+    command.add_argument("--samples", type=int, default=airfoil_database.EXPORT_SAMPLES,
+                         help="points per side for selig files (default: %(default)s)")
+    command.set_defaults(run=export_command, use_catalogue=False)
+
+    command = commands.add_parser("delete", help="delete airfoils by name, '-' reads names from stdin")
+    command.add_argument("names", nargs="+")
+    command.set_defaults(run=delete_command, use_catalogue=False)
+
+    command = commands.add_parser("list", help="list airfoil names")
+    command.add_argument("--prefix", default="", help="case-insensitive name prefix")
+    command.add_argument("--where", help="geometry filter in %% of chord, e.g. 'thickness 9 12; camber * 2'")
+    command.add_argument("--limit", type=int, help="maximum number of names")
+    command.set_defaults(run=list_command, use_catalogue=True)
+
+    command = commands.add_parser("similar", help="airfoils with the most similar control polygon")
+    command.add_argument("name")
+    command.add_argument("-k", type=int, default=10, help="number of results (default: %(default)s)")
+    command.set_defaults(run=similar_command, use_catalogue=True)
+
+    command = commands.add_parser("stats", help="library statistics")
+    command.add_argument("--json", action="store_true")
+    command.set_defaults(run=stats_command, use_catalogue=True)
+
+    command = commands.add_parser("catalogue", help="write the library as read-only catalogue file")
+    command.add_argument("target")
+    command.set_defaults(run=catalogue_command, use_catalogue=False)
+
+    command = commands.add_parser("optimize", help="compute missing geometry descriptors, update query planner "
+                                                 "statistics and checkpoint the WAL")
+    command.set_defaults(run=optimize_command, use_catalogue=False)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output = sys.stdout
+    airfoil_database.profiler.enabled = args.profile
+
+    # Meldungen von sqlDatabase (print) nach stderr, stdout bleibt für die Ergebnisse
+    with contextlib.redirect_stdout(sys.stderr):
+        catalogue = None
+        catalogue_path = args.catalogue or airfoil_database.default_catalogue_path(args.database)
+        if args.use_catalogue and os.path.exists(catalogue_path):
+            catalogue = airfoil_database.airfoil_catalogue.AirfoilCatalogue(catalogue_path)
+
+        db = airfoil_database.sqlDatabase(args.database, catalogue)
+        try:
+            db.create_airfoil_table()
+            status = args.run(db, args, output)
+        finally:
+            db.close()
+
+        if args.profile:
+            print(airfoil_database.profiler.summary())
+            print(json.dumps(airfoil_database.profiler.report()["database"]))
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,987 @@
+"""
+Profildatenbank (sqlite3) ohne Fusion-API.
+
+Enthält das Schema samt Migration, Import (bez.dat und gefittete Punktdateien), Suche, Export
+und den Zugriff auf einen Katalog. Genutzt vom Fusion-Skript bezier_airfoil_import_database, vom
+Kommandozeilenwerkzeug airfoil_cli und von den Benchmarks.
+"""
+
+import sqlite3
+import sys
+from array import array
+from collections import OrderedDict
+import heapq
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import os
+import hashlib
+import json
+import zipfile
+
+try:
+    from . import airfoil_bezier, airfoil_catalogue, airfoil_parser, airfoil_validation
+    from .airfoil_profiler import PhaseProfiler
+except ImportError:
+    import airfoil_bezier
+    import airfoil_catalogue
+    import airfoil_parser
+    import airfoil_validation
+    from airfoil_profiler import PhaseProfiler
+
+
+def default_database_path():
+    # airfoil_data.db im Windows-Benutzerverzeichnis, sonst im Home-Verzeichnis
+    try:
+        return os.path.join(os.environ['USERPROFILE'], 'airfoil_data.db')
+    except KeyError:
+        return os.path.join(os.path.expanduser('~'), 'airfoil_data.db')
+
+
+def default_catalogue_path(database):
+    # AIRFOIL_CATALOGUE (z.B. eine Datei im Netzwerk), sonst airfoil_catalogue.afc neben der Datenbank
+    return os.environ.get('AIRFOIL_CATALOGUE', os.path.join(os.path.dirname(database), 'airfoil_catalogue.afc'))
+
+
+NUM_POINTS = airfoil_parser.NUM_POINTS
+
+# Schema 1: je Profil 38 REAL-Spalten x1..y19
+# Schema 2: Kontrollpunkte als ein BLOB aus float64 (little endian) x1, y1, x2, y2, ...
+# Schema 3: zusätzlich import_manifest für den inkrementellen Ordnerabgleich
+# Schema 4: zusätzlich airfoil_descriptors mit geometrischen Kennwerten je Profil
+# Schema 5: zusätzlich quarantine für beim Import abgelehnte Profile und Dateien
+SCHEMA_VERSION = 5
+V1_COLUMNS = [f"{axis}{i + 1}" for i in range(NUM_POINTS) for axis in ("x", "y")]
+
+CREATE_TABLE_QUERY = '''
+    CREATE TABLE IF NOT EXISTS airfoil_data (
+        airfoil_name TEXT PRIMARY KEY,
+        degree INTEGER NOT NULL,
+        point_count INTEGER NOT NULL,
+        points BLOB NOT NULL
+    )
+'''
+
+# Index für sortierte Listen und Präfixsuche ohne Beachtung der Groß-/Kleinschreibung
+CREATE_NAME_INDEX_QUERY = '''
+    CREATE INDEX IF NOT EXISTS airfoil_name_nocase
+    ON airfoil_data (airfoil_name COLLATE NOCASE, airfoil_name)
+'''
+
+# Je importierter Datei Pfad, mtime, Größe und Inhalts-Hash, damit unveränderte Dateien
+# beim erneuten Import eines Ordners übersprungen werden können. airfoil_name enthält bei
+# Dateien mit mehreren Abschnitten alle Namen, getrennt durch MANIFEST_NAME_SEPARATOR.
+CREATE_MANIFEST_TABLE_QUERY = '''
+    CREATE TABLE IF NOT EXISTS import_manifest (
+        path TEXT PRIMARY KEY,
+        mtime REAL NOT NULL,
+        size INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        airfoil_name TEXT
+    )
+'''
+
+MANIFEST_NAME_SEPARATOR = "\n"
+
+MANIFEST_UPSERT_QUERY = '''
+    INSERT INTO import_manifest (path, mtime, size, content_hash, airfoil_name)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(path) DO UPDATE SET
+        mtime = excluded.mtime,
+        size = excluded.size,
+        content_hash = excluded.content_hash,
+        airfoil_name = excluded.airfoil_name
+'''
+
+# Kennwerte aus airfoil_bezier.airfoil_descriptors, bezogen auf die Profiltiefe
+CREATE_DESCRIPTOR_TABLE_QUERY = f'''
+    CREATE TABLE IF NOT EXISTS airfoil_descriptors (
+        airfoil_name TEXT PRIMARY KEY REFERENCES airfoil_data (airfoil_name) ON DELETE CASCADE,
+        {", ".join(f"{name} REAL" for name in airfoil_bezier.DESCRIPTOR_NAMES)}
+    )
+'''
+
+CREATE_DESCRIPTOR_INDEX_QUERIES = [
+    f'CREATE INDEX IF NOT EXISTS airfoil_descriptors_{name} ON airfoil_descriptors ({name})'
+    for name in ("thickness", "camber")
+]
+
+DESCRIPTOR_UPSERT_QUERY = f'''
+    INSERT INTO airfoil_descriptors (airfoil_name, {", ".join(airfoil_bezier.DESCRIPTOR_NAMES)})
+    VALUES (?, {", ".join(["?"] * len(airfoil_bezier.DESCRIPTOR_NAMES))})
+    ON CONFLICT(airfoil_name) DO UPDATE SET
+        {", ".join(f"{name} = excluded.{name}" for name in airfoil_bezier.DESCRIPTOR_NAMES)}
+'''
+
+# Beim Import abgelehnte Profile (airfoil_validation) und nicht lesbare Dateien (airfoil_name
+# leer) mit den Gründen, getrennt durch QUARANTINE_REASON_SEPARATOR. Die Einträge einer Datei
+# werden bei jedem erneuten Lesen der Datei ersetzt.
+CREATE_QUARANTINE_TABLE_QUERY = '''
+    CREATE TABLE IF NOT EXISTS quarantine (
+        path TEXT NOT NULL,
+        airfoil_name TEXT NOT NULL,
+        reasons TEXT NOT NULL,
+        content_hash TEXT,
+        quarantined TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (path, airfoil_name)
+    )
+'''
+
+QUARANTINE_REASON_SEPARATOR = "; "
+
+QUARANTINE_UPSERT_QUERY = '''
+    INSERT INTO quarantine (path, airfoil_name, reasons, content_hash)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(path, airfoil_name) DO UPDATE SET
+        reasons = excluded.reasons,
+        content_hash = excluded.content_hash,
+        quarantined = CURRENT_TIMESTAMP
+'''
+
+UPSERT_QUERY = '''
+    INSERT INTO airfoil_data (airfoil_name, degree, point_count, points)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(airfoil_name) DO UPDATE SET
+        degree = excluded.degree,
+        point_count = excluded.point_count,
+        points = excluded.points
+'''
+
+
+def pack_points(coordinates):
+    # [(x, y), ...] -> BLOB, lesbar mit numpy.frombuffer(blob, "<f8") ohne Kopie
+    points = array('d', [coord for pair in coordinates for coord in pair])
+    if sys.byteorder == 'big':
+        points.byteswap()
+    return points.tobytes()
+
+
+def unpack_points(blob):
+    # BLOB -> [(x, y), ...]
+    points = array('d')
+    points.frombytes(blob)
+    if sys.byteorder == 'big':
+        points.byteswap()
+    return list(zip(points[0::2], points[1::2]))
+
+
+def descriptor_rows(named_coordinates):
+    # [(name, coordinates), ...] -> Datensätze für DESCRIPTOR_UPSERT_QUERY, alle Profile eines
+    # Grades auf einmal
+    by_degree = {}
+    for name, coordinates in named_coordinates:
+        by_degree.setdefault((len(coordinates) - 1) // 2, []).append((name, coordinates))
+
+    rows = []
+    for degree, airfoils in by_degree.items():
+        polygons = [airfoil_parser.split_polygon(coordinates, degree) for name, coordinates in airfoils]
+        descriptors = airfoil_bezier.airfoil_descriptors(polygons)
+        rows += [(name, *values) for (name, coordinates), values in zip(airfoils, descriptors)]
+    return rows
+
+
+def airfoil_record(airfoil_name, coordinates):
+    # Datensatz für UPSERT_QUERY, Ober- und Unterseite teilen sich den Nasenpunkt
+    return airfoil_name, (len(coordinates) - 1) // 2, len(coordinates), pack_points(coordinates)
+
+COORDINATE_CACHE_SIZE = 128
+
+EXPORT_EXTENSIONS = {"bez": ".bez.dat", "selig": ".dat"}
+EXPORT_SAMPLES = 81
+EXPORT_BATCH_SIZE = 256
+# Zeichen, die in Dateinamen unter Windows nicht erlaubt sind, werden als %XX geschrieben
+EXPORT_RESERVED_CHARACTERS = set('<>:"/\\|?*%')
+
+IMPORT_WORKERS = os.cpu_count() or 1
+IMPORT_CHUNK_SIZE = 256
+# Höchstens so viele Namen je "IN (?, ...)", weit unter der SQLite-Grenze für SQL-Variablen
+# (32766, ältere Versionen 999), auch wenn ein Paket Dateien mit sehr vielen Abschnitten enthält
+NAME_QUERY_BATCH = 500
+# Gefittete Punktdateien mit größerer Abweichung (bezogen auf die Profiltiefe) werden gemeldet
+FIT_ERROR_WARNING = 0.002
+# Ohne NumPy (z.B. in Fusion) kosten die Kennwerte ein Vielfaches des Parsens; der Import lässt
+# sie dann aus, sqlDatabase.ensure_descriptors rechnet sie vor der ersten Abfrage nach
+IMPORT_DESCRIPTORS = airfoil_bezier.np is not None
+
+# Standardseitengröße von search_airfoils
+SEARCH_LIMIT = 100
+
+
+db_stats = {"connections": 0, "queries": 0}
+
+profiler = PhaseProfiler()
+profiler.counters["database"] = db_stats
+
+DATABASE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -8000',
+    'PRAGMA foreign_keys = ON',
+)
+
+
+def reset_database_stats():
+    # Zähler für Verbindungen und ausgeführte SQL-Anweisungen je Befehl zurücksetzen
+    db_stats["connections"] = 0
+    db_stats["queries"] = 0
+
+
+def _count_query(statement):
+    db_stats["queries"] += 1
+
+
+def export_file_name(airfoil_name):
+    # Dateiname ohne Endung, umkehrbar und eindeutig für verschiedene Profilnamen
+    return "".join(f"%{ord(c):02X}" if c in EXPORT_RESERVED_CHARACTERS or ord(c) < 32 else c
+                   for c in airfoil_name)
+
+
+def export_texts(airfoils, file_format, t_values):
+    # [(Name, Koordinaten), ...] -> [(Name, Dateiinhalt), ...], Selig-Dateien werden je Grad
+    # mit einer gemeinsamen Auswertung aller Profile des Pakets abgetastet
+    if file_format == "bez":
+        return [(name, airfoil_parser.format_bez_text(name, coordinates)) for name, coordinates in airfoils]
+
+    texts = [None] * len(airfoils)
+    by_degree = {}
+    for i, (name, coordinates) in enumerate(airfoils):
+        by_degree.setdefault((len(coordinates) - 1) // 2, []).append(i)
+
+    for degree, indices in by_degree.items():
+        polygons = [airfoil_parser.split_polygon(airfoils[i][1], degree) for i in indices]
+        curves = airfoil_bezier.evaluate_airfoils(polygons, t_values)
+        for i, (upper, lower) in zip(indices, curves):
+            texts[i] = (airfoils[i][0], airfoil_bezier.format_coordinate_text(airfoils[i][0], upper, lower))
+    return texts
+
+
+def parse_airfoil_files(file_paths, known_files=None, point_count=NUM_POINTS):
+    # Liest eine Liste von bez.dat- oder Punktdateien und liefert die Datensätze für UPSERT_QUERY
+    # und DESCRIPTOR_UPSERT_QUERY, die Zeilen für MANIFEST_UPSERT_QUERY, (Name, Fitfehler) der
+    # gefitteten Punktdateien, die abgelehnten Dateien und Profile als (Pfad, Meldung) sowie die
+    # Zeilen für QUARANTINE_UPSERT_QUERY. bez.dat-Dateien liefern ein Profil je Abschnitt,
+    # Punktdateien werden gesammelt und zusammen gefittet. Alle Profile des Pakets werden danach
+    # gemeinsam mit airfoil_validation.validate_airfoils geprüft (point_count siehe dort).
+    # Dateien, deren Inhalts-Hash dem in known_files ({Pfad: (hash, Name)}) entspricht, werden
+    # nicht geparst. Läuft ohne Datenbankverbindung, also auch im Worker.
+    candidates = []
+    point_files = []
+    file_rows = []
+    manifest_rows = []
+    failed = []
+    quarantine_rows = []
+
+    for file_path in file_paths:
+        content_hash = None
+        try:
+            stat = os.stat(file_path)
+            with open(file_path, 'rb') as file:
+                data = file.read()
+            content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+            known = known_files.get(file_path) if known_files else None
+            if known is not None and known[0] == content_hash:
+                manifest_rows.append((file_path, stat.st_mtime, stat.st_size, content_hash, known[1]))
+                continue
+
+            file_row = (file_path, stat.st_mtime, stat.st_size, content_hash)
+            text = data.decode(errors="replace")
+            if airfoil_parser.is_coordinate_text(text, file_path):
+                airfoil_name, upper, lower = airfoil_bezier.parse_coordinate_text(text)
+                point_files.append((file_row, airfoil_name, upper, lower))
+                file_rows.append(file_row)
+                continue
+
+            sections = airfoil_parser.parse_bez_text(text)
+        except Exception as e:
+            failed.append((file_path, str(e)))
+            quarantine_rows.append((file_path, "", str(e), content_hash))
+            # Wie Dateien ohne gültiges Profil (siehe unten) ins Manifest, sofern sie gelesen wurden
+            if content_hash is not None:
+                manifest_rows.append((file_path, stat.st_mtime, stat.st_size, content_hash, None))
+            continue
+
+        candidates += [(file_row, airfoil_name, coordinates, None) for airfoil_name, coordinates in sections]
+        file_rows.append(file_row)
+
+    sides = [(upper, lower) for file_row, airfoil_name, upper, lower in point_files]
+    try:
+        fits = airfoil_bezier.fit_airfoils(sides)
+    except Exception:
+        # Eine entartete Punktdatei (Seite ohne Länge, singuläre Normalgleichungen) darf nicht
+        # das ganze Paket verwerfen: dann wird jede Datei einzeln gefittet
+        fits = []
+        for side in sides:
+            try:
+                fits.append(airfoil_bezier.fit_airfoils([side])[0])
+            except Exception as e:
+                fits.append(e)
+
+    for (file_row, airfoil_name, upper, lower), fit in zip(point_files, fits):
+        if isinstance(fit, Exception):
+            failed.append((file_row[0], f"'{airfoil_name}': {fit}"))
+            quarantine_rows.append((file_row[0], airfoil_name, str(fit), file_row[3]))
+            continue
+        top_r, bottom, error = fit
+        candidates.append((file_row, airfoil_name, airfoil_parser.fitted_coordinates(top_r, bottom), error))
+
+    reasons = airfoil_validation.validate_airfoils([coordinates for file_row, name, coordinates, error in candidates],
+                                                   point_count)
+    accepted = []
+    accepted_names = {file_row: [] for file_row in file_rows}
+    fitted = []
+    for (file_row, airfoil_name, coordinates, error), problems in zip(candidates, reasons):
+        if problems:
+            message = QUARANTINE_REASON_SEPARATOR.join(problems)
+            failed.append((file_row[0], f"'{airfoil_name}': {message}"))
+            quarantine_rows.append((file_row[0], airfoil_name, message, file_row[3]))
+            continue
+        accepted.append((airfoil_name, coordinates))
+        accepted_names[file_row].append(airfoil_name)
+        if error is not None:
+            fitted.append((airfoil_name, error))
+
+    # Auch Dateien ohne gültiges Profil kommen ins Manifest, damit sie erst nach einer Änderung
+    # wieder gelesen werden, ihre Einträge in quarantine bleiben bis dahin bestehen. Für Dateien,
+    # die sich nicht parsen lassen, geschieht das schon oben.
+    for file_row, names in accepted_names.items():
+        manifest_rows.append((*file_row, MANIFEST_NAME_SEPARATOR.join(names) if names else None))
+
+    records = [airfoil_record(airfoil_name, coordinates) for airfoil_name, coordinates in accepted]
+    descriptors = descriptor_rows(accepted) if IMPORT_DESCRIPTORS else []
+    return records, descriptors, manifest_rows, fitted, failed, quarantine_rows
+
+
+def scan_airfoil_folder(folder):
+    # (Pfad, mtime, Größe) aller bez.dat-Dateien eines Ordners, os.scandir liefert die
+    # Dateiattribute unter Windows ohne zusätzlichen Zugriff je Datei
+    files = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and (entry.name.endswith("dat") or entry.name.endswith("bez")):
+                stat = entry.stat()
+                files.append((os.path.abspath(entry.path), stat.st_mtime, stat.st_size))
+    return files
+
+
+def merge_airfoil_names(*name_lists, limit=None):
+    # Führt sortierte Namenslisten (Datenbank, Katalog) zu einer sortierten Liste ohne Doppelte zusammen
+    names = []
+    for name in heapq.merge(*name_lists, key=airfoil_catalogue.sort_key):
+        if not names or names[-1] != name:
+            names.append(name)
+            if limit is not None and len(names) == limit:
+                break
+    return names
+
+
+def parse_descriptor_filter(text):
+    # "thickness 9 11; camber_x * 30" -> {"thickness": (0.09, 0.11), "camber_x": (None, 0.3)}
+    # Werte in % der Profiltiefe, "*" = keine Grenze
+    ranges = {}
+    for i, part in enumerate(part for part in text.split(";") if part.strip()):
+        fields = part.split()
+        if len(fields) != 3 or fields[0] not in airfoil_bezier.DESCRIPTOR_NAMES:
+            raise ValueError(f"geometry filter {i + 1}: expected '<{'|'.join(airfoil_bezier.DESCRIPTOR_NAMES)}> min max', got '{part.strip()}'")
+        try:
+            low, high = [None if value == "*" else float(value) / 100.0 for value in fields[1:]]
+        except ValueError:
+            raise ValueError(f"geometry filter {i + 1}: min and max must be numbers or '*', got '{part.strip()}'")
+        ranges[fields[0]] = (low, high)
+    return ranges
+
+
+class sqlDatabase:
+    def __init__(self, db, catalogue=None):
+        # Initialisiert die Datenbankverbindung und speichert den Pfad zur Datenbank.
+        # catalogue (airfoil_catalogue.AirfoilCatalogue) ergänzt Abfragen und Listen um die
+        # Profile eines schreibgeschützten Katalogs, Profile der Datenbank haben Vorrang.
+        self.db = db
+        self.catalogue = catalogue
+        self.conn = sqlite3.connect(self.db, cached_statements=256)
+        for pragma in DATABASE_PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.set_trace_callback(_count_query)
+        db_stats["connections"] += 1
+
+        # LRU-Cache für get_airfoil_coordinates, ungültig bei eigenen Schreibzugriffen und
+        # bei Änderungen anderer Verbindungen (PRAGMA data_version)
+        self._coordinate_cache = OrderedDict()
+        self._data_version = None
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+        # Namen und normierte Kontrollpolygone für find_similar_airfoils, wird bei der ersten
+        # Suche aufgebaut und wie der Koordinaten-Cache verworfen
+        self._shape_index = None
+
+        # Fehlen Kennwerte in airfoil_descriptors? None = unbekannt (siehe ensure_descriptors)
+        self._descriptors_missing = None
+
+    def create_airfoil_table(self):
+        try:
+            c = self.conn.cursor()
+
+            version = c.execute('PRAGMA user_version').fetchone()[0]
+            if version == SCHEMA_VERSION:
+                # Schema aktuell, alle Tabellen und Indizes existieren bereits
+                return
+
+            columns = [row[1] for row in c.execute('PRAGMA table_info(airfoil_data)')]
+
+            if version < SCHEMA_VERSION and "x1" in columns:
+                self.migrate_column_table()
+
+            c.execute(CREATE_TABLE_QUERY)
+            c.execute(CREATE_NAME_INDEX_QUERY)
+            c.execute(CREATE_MANIFEST_TABLE_QUERY)
+            c.execute(CREATE_DESCRIPTOR_TABLE_QUERY)
+            for query in CREATE_DESCRIPTOR_INDEX_QUERIES:
+                c.execute(query)
+            c.execute(CREATE_QUARANTINE_TABLE_QUERY)
+            self.conn.commit()
+
+            if version < 4:
+                self.update_descriptors()
+
+            c.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self.conn.commit()
+            #print("Tabelle 'airfoil_data' erfolgreich erstellt.")
+
+        except sqlite3.Error as e:
+            print(f"Fehler beim Erstellen der Tabelle: {e}")
+
+    def update_descriptors(self, batch_size=IMPORT_CHUNK_SIZE):
+        # Berechnet die Kennwerte aller Profile ohne Eintrag in airfoil_descriptors nach
+        rows = self.conn.execute('''
+            SELECT airfoil_name, points FROM airfoil_data
+            WHERE airfoil_name NOT IN (SELECT airfoil_name FROM airfoil_descriptors)
+        ''').fetchall()
+
+        with self.conn:
+            for i in range(0, len(rows), batch_size):
+                batch = [(name, unpack_points(points)) for name, points in rows[i:i + batch_size]]
+                self.conn.executemany(DESCRIPTOR_UPSERT_QUERY, descriptor_rows(batch))
+
+        return len(rows)
+
+    def ensure_descriptors(self):
+        # Rechnet die vom Import ausgelassenen Kennwerte (IMPORT_DESCRIPTORS) nach, bevor sie
+        # abgefragt werden. Nur beim ersten Aufruf und nach Importen bzw. Änderungen anderer
+        # Verbindungen wird nach fehlenden Einträgen gesucht.
+        self._check_data_version()
+        if self._descriptors_missing is not False:
+            self.update_descriptors()
+            self._descriptors_missing = False
+
+    def migrate_column_table(self):
+        # Überträgt eine Datenbank aus Schema 1 (x1..y19) in einer Transaktion nach Schema 2
+        c = self.conn.cursor()
+        try:
+            c.execute('BEGIN')
+            c.execute('ALTER TABLE airfoil_data RENAME TO airfoil_data_v1')
+            c.execute(CREATE_TABLE_QUERY)
+
+            records = []
+            for row in c.execute(f'SELECT airfoil_name, {", ".join(V1_COLUMNS)} FROM airfoil_data_v1').fetchall():
+                values = row[1:]
+                coordinates = [(values[i], values[i + 1]) for i in range(0, len(values), 2)
+                               if values[i] is not None and values[i + 1] is not None]
+                records.append(airfoil_record(row[0], coordinates))
+
+            c.executemany(UPSERT_QUERY, records)
+            c.execute('DROP TABLE airfoil_data_v1')
+            self.conn.commit()
+            print(f"{len(records)} Airfoils in das neue Datenbankformat übertragen.")
+
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    @profiler.timed
+    def read_airfoil_from_bez(self, file_path):
+        # Importiert alle Profile einer bez.dat- oder Punktdatei mit Prüfung und Quarantäne wie
+        # import_airfoils_bulk und liefert dessen Ergebnis, Fehler stehen in "errors" statt in der Konsole
+        return self.import_airfoils_bulk([os.path.abspath(file_path)])
+
+    @profiler.timed
+    def import_airfoils_bulk(self, file_paths, workers=1, chunk_size=IMPORT_CHUNK_SIZE, use_processes=False,
+                             progress=None, cancel_event=None, known_files=None, point_count=NUM_POINTS):
+        # Liest die Dateien in Paketen von chunk_size (bei workers > 1 parallel im Thread- bzw.
+        # Prozesspool) und schreibt jedes fertige Paket per executemany. Alle Pakete laufen in
+        # einer einzigen Transaktion (ein commit statt einem pro Datei), geschrieben wird nur
+        # von diesem Thread aus.
+        # progress(verarbeitet, gesamt) wird nach jedem Paket aufgerufen. Ist cancel_event gesetzt,
+        # endet der Import nach dem laufenden Paket, bereits geschriebene Pakete bleiben erhalten.
+        # known_files, point_count: siehe parse_airfoil_files, jede gelesene Datei kommt ins
+        # import_manifest. Abgelehnte Profile und Dateien stehen in errors und in der Tabelle
+        # quarantine, deren Einträge für erneut gelesene Dateien ersetzt werden.
+        file_paths = list(file_paths)
+        chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+
+        chunk_known_files = [{path: known_files[path] for path in chunk if path in known_files} if known_files else None
+                             for chunk in chunks]
+
+        executor = None
+        if workers > 1 and len(chunks) > 1:
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            executor = pool(max_workers=workers)
+            results = executor.map(parse_airfoil_files, chunks, chunk_known_files, repeat(point_count))
+        else:
+            results = map(parse_airfoil_files, chunks, chunk_known_files, repeat(point_count))
+
+        imported = 0
+        updated = 0
+        skipped = 0
+        quarantined = 0
+        processed = 0
+        cancelled = False
+        fitted = []
+        failed = []
+
+        self.invalidate_cache()
+
+        try:
+            with self.conn:
+                for chunk, (records, descriptors, manifest_rows, fits, errors, quarantine_rows) in zip(chunks, results):
+                    if cancel_event is not None and cancel_event.is_set():
+                        cancelled = True
+                        break
+
+                    # Namen, die im Paket mehrfach vorkommen, zählen nur einmal
+                    names = list({record[0] for record in records})
+                    existing = self._count_existing(names)
+
+                    self.conn.executemany(UPSERT_QUERY, records)
+                    if descriptors:
+                        self.conn.executemany(DESCRIPTOR_UPSERT_QUERY, descriptors)
+                    elif records:
+                        # Kennwerte überschriebener Profile sind veraltet, ensure_descriptors rechnet sie neu
+                        self.conn.executemany('DELETE FROM airfoil_descriptors WHERE airfoil_name = ?',
+                                              [(record[0],) for record in records])
+                        self._descriptors_missing = True
+                    self.conn.executemany(MANIFEST_UPSERT_QUERY, manifest_rows)
+                    unchanged = {row[0] for row in manifest_rows if known_files and row[0] in known_files
+                                 and known_files[row[0]][0] == row[3]}
+                    self.conn.executemany('DELETE FROM quarantine WHERE path = ?',
+                                          [(path,) for path in chunk if path not in unchanged])
+                    self.conn.executemany(QUARANTINE_UPSERT_QUERY, quarantine_rows)
+                    updated += existing
+                    imported += len(names) - existing
+                    skipped += len(unchanged)
+                    quarantined += len(quarantine_rows)
+                    fitted.extend(fits)
+                    failed.extend(errors)
+
+                    processed += len(chunk)
+                    if progress is not None:
+                        progress(processed, len(file_paths))
+        except sqlite3.Error as e:
+            print(f"Fehler beim Import der Airfoils: {e}")
+            failed = [(file_path, str(e)) for file_path in file_paths]
+            imported = 0
+            updated = 0
+            skipped = 0
+            quarantined = 0
+            fitted = []
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        return {"imported": imported, "updated": updated, "skipped": skipped, "failed": len(failed),
+                "errors": failed, "quarantined": quarantined, "fitted": fitted, "cancelled": cancelled}
+
+    def _count_existing(self, airfoil_names):
+        # Anzahl der Namen, die bereits in airfoil_data stehen, in Abfragen zu je NAME_QUERY_BATCH Namen
+        count = 0
+        for i in range(0, len(airfoil_names), NAME_QUERY_BATCH):
+            batch = airfoil_names[i:i + NAME_QUERY_BATCH]
+            count += self.conn.execute(
+                f'SELECT COUNT(*) FROM airfoil_data WHERE airfoil_name IN ({", ".join(["?"] * len(batch))})',
+                batch).fetchone()[0]
+        return count
+
+    def sync_folder(self, folder, remove_missing=False, **import_options):
+        # Inkrementeller Import eines Ordners: gelesen werden nur Dateien, deren mtime oder Größe
+        # vom import_manifest abweicht, geschrieben nur die mit geändertem Inhalt.
+        # remove_missing entfernt Profile, deren Datei aus dem Ordner verschwunden ist.
+        files = scan_airfoil_folder(folder)
+        manifest = {row[0]: row[1:] for row in
+                    self.conn.execute('SELECT path, mtime, size, content_hash, airfoil_name FROM import_manifest')}
+
+        changed = [path for path, mtime, size in files if manifest.get(path, (None, None))[:2] != (mtime, size)]
+        known_files = {path: manifest[path][2:] for path in changed if path in manifest}
+
+        result = self.import_airfoils_bulk(changed, known_files=known_files, **import_options)
+        result["skipped"] += len(files) - len(changed)
+        result["removed"] = 0
+
+        if remove_missing and not result["cancelled"]:
+            result["removed"] = self.remove_missing_files(folder, {path for path, mtime, size in files})
+
+        return result
+
+    def remove_missing_files(self, folder, present_paths):
+        # Löscht Manifest-Einträge von Dateien direkt in folder, die nicht mehr in present_paths
+        # stehen, samt ihrer Profile, sofern keine andere Datei dasselbe Profil liefert
+        folder = os.path.abspath(folder)
+        manifest = self.conn.execute('SELECT path, airfoil_name FROM import_manifest').fetchall()
+        missing = [path for path, names in manifest if os.path.dirname(path) == folder and path not in present_paths]
+        missing_paths = set(missing)
+        remaining_names = {name for path, names in manifest if path not in missing_paths and names is not None
+                           for name in names.split(MANIFEST_NAME_SEPARATOR)}
+        removed_names = {name for path, names in manifest if path in missing_paths and names is not None
+                         for name in names.split(MANIFEST_NAME_SEPARATOR)} - remaining_names
+        quarantined_paths = [path for path, in self.conn.execute('SELECT DISTINCT path FROM quarantine')
+                             if os.path.dirname(path) == folder and path not in present_paths]
+
+        self.invalidate_cache()
+        try:
+            with self.conn:
+                self.conn.executemany('DELETE FROM import_manifest WHERE path = ?', [(path,) for path in missing])
+                self.conn.executemany('DELETE FROM airfoil_data WHERE airfoil_name = ?',
+                                      [(name,) for name in removed_names])
+                self.conn.executemany('DELETE FROM quarantine WHERE path = ?', [(path,) for path in quarantined_paths])
+            return len(missing)
+        except sqlite3.Error as e:
+            print(f"Fehler beim Entfernen gelöschter Dateien: {e}")
+            return 0
+
+
+    def store_airfoils(self, airfoils):
+        # Schreibt Profile als (name, top_r, bottom) wie von get_airfoil_coordinates geliefert,
+        # z.B. berechnete Zwischenprofile, in einer Transaktion
+        named_coordinates = [(name, list(reversed(top_r)) + list(bottom)[1:]) for name, top_r, bottom in airfoils]
+        records = [airfoil_record(name, coordinates) for name, coordinates in named_coordinates]
+        self.invalidate_cache()
+        try:
+            with self.conn:
+                self.conn.executemany(UPSERT_QUERY, records)
+                self.conn.executemany(DESCRIPTOR_UPSERT_QUERY, descriptor_rows(named_coordinates))
+            return len(records)
+        except sqlite3.Error as e:
+            print(f"Fehler beim Speichern der Airfoils: {e}")
+            return 0
+
+    def insert_or_update_airfoil(self, airfoil_name, coordinates):
+        try:
+            c = self.conn.cursor()
+            c.execute(UPSERT_QUERY, airfoil_record(airfoil_name, coordinates))
+            c.executemany(DESCRIPTOR_UPSERT_QUERY, descriptor_rows([(airfoil_name, coordinates)]))
+            self.invalidate_cache(airfoil_name)
+            print(f"Koordinaten für '{airfoil_name}' erfolgreich gespeichert.")
+
+            self.conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"Fehler beim Verarbeiten des Airfoils '{airfoil_name}': {e}")
+
+    def invalidate_cache(self, airfoil_name=None):
+        if airfoil_name is None:
+            self._coordinate_cache.clear()
+        else:
+            self._coordinate_cache.pop(airfoil_name, None)
+        self._shape_index = None
+
+    def _check_data_version(self):
+        # Verwirft die Caches, wenn eine andere Verbindung die Datenbank geändert hat
+        data_version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+        if data_version != self._data_version:
+            self.invalidate_cache()
+            if self._data_version is not None:
+                self._descriptors_missing = None
+            self._data_version = data_version
+
+    def cache_info(self):
+        return dict(self.cache_stats, size=len(self._coordinate_cache), maxsize=COORDINATE_CACHE_SIZE)
+
+    @profiler.timed
+    def get_airfoil_coordinates(self, airfoil_name):
+        try:
+            self._check_data_version()
+
+            cached = self._coordinate_cache.get(airfoil_name)
+            if cached is not None:
+                self._coordinate_cache.move_to_end(airfoil_name)
+                self.cache_stats["hits"] += 1
+                return list(cached[0]), list(cached[1])
+
+            self.cache_stats["misses"] += 1
+        except sqlite3.Error as e:
+            print(f"Fehler beim Prüfen des Caches für '{airfoil_name}': {e}")
+
+        top_r, bottom = self._load_airfoil_coordinates(airfoil_name)
+        if top_r is not None:
+            self._coordinate_cache[airfoil_name] = (tuple(top_r), tuple(bottom))
+            if len(self._coordinate_cache) > COORDINATE_CACHE_SIZE:
+                self._coordinate_cache.popitem(last=False)
+
+        return top_r, bottom
+
+    def _load_airfoil_coordinates(self, airfoil_name):
+        try:
+            c = self.conn.cursor()
+
+            c.execute('''
+                SELECT degree, points
+                FROM airfoil_data
+                WHERE airfoil_name = ?
+            ''', (airfoil_name,))
+
+            result = c.fetchone()
+            if result:
+
+                degree, points = result
+                return airfoil_parser.split_polygon(unpack_points(points), degree)
+
+            coordinates = self.catalogue.coordinates(airfoil_name) if self.catalogue is not None else None
+            if coordinates is not None:
+                return airfoil_parser.split_polygon(coordinates, (len(coordinates) - 1) // 2)
+            else:
+                print(f"Airfoil '{airfoil_name}' nicht gefunden.")
+                return None, None
+
+        except sqlite3.Error as e:
+            print(f"Fehler beim Abrufen der Koordinaten für '{airfoil_name}': {e}")
+            return None, None
+
+    def _load_shape_index(self):
+        names = []
+        vectors = []
+        for airfoil_name, degree, points in self.conn.execute(
+                'SELECT airfoil_name, degree, points FROM airfoil_data WHERE point_count = ?', (NUM_POINTS,)):
+            names.append(airfoil_name)
+            vectors.append(airfoil_bezier.shape_vector(*airfoil_parser.split_polygon(unpack_points(points), degree)))
+        return names, airfoil_bezier.shape_matrix(vectors)
+
+    @profiler.timed
+    def find_similar_shapes(self, top_r, bottom, k=10):
+        # Die k Profile mit dem geringsten Abstand der normierten Kontrollpolygone zu (top_r, bottom)
+        # als [(Name, Abstand), ...], aufsteigend sortiert
+        if len(top_r) + len(bottom) - 1 != NUM_POINTS:
+            raise ValueError(f"similarity search needs {NUM_POINTS} control points, got {len(top_r) + len(bottom) - 1}")
+
+        try:
+            self._check_data_version()
+            if self._shape_index is None:
+                self._shape_index = self._load_shape_index()
+        except sqlite3.Error as e:
+            print(f"Fehler beim Aufbau des Ähnlichkeitsindex: {e}")
+            return []
+
+        names, vectors = self._shape_index
+        query = airfoil_bezier.shape_vector(top_r, bottom)
+        return [(names[i], distance) for i, distance in airfoil_bezier.nearest_shapes(query, vectors, k)]
+
+    def find_similar_airfoils(self, airfoil_name, k=10):
+        # Die k ähnlichsten gespeicherten Profile zu airfoil_name, ohne das Profil selbst
+        top_r, bottom = self.get_airfoil_coordinates(airfoil_name)
+        if top_r is None:
+            return []
+        matches = self.find_similar_shapes(top_r, bottom, k + 1)
+        return [match for match in matches if match[0] != airfoil_name][:k]
+
+    @profiler.timed
+    def get_sorted_airfoils(self):
+        try:
+            c = self.conn.cursor()
+            c.execute('SELECT airfoil_name FROM airfoil_data ORDER BY airfoil_name COLLATE NOCASE, airfoil_name')
+            airfoil_names = [row[0] for row in c.fetchall()]
+            if self.catalogue is not None:
+                airfoil_names = merge_airfoil_names(airfoil_names, self.catalogue.names())
+            return airfoil_names
+        except sqlite3.Error as e:
+            print(f"Fehler beim Abrufen der sortierten Airfoils: {e}")
+            return []
+
+    @profiler.timed
+    def search_airfoils(self, prefix="", after=None, limit=SEARCH_LIMIT, ranges=None):
+        # Bis zu limit Namen, die mit prefix beginnen, sortiert wie get_sorted_airfoils.
+        # after = letzter Name der vorigen Seite (Keyset-Pagination über den Namensindex)
+        # ranges = {Kennwert: (min, max)} aus DESCRIPTOR_NAMES, None = keine Grenze. Der Katalog hat
+        # keine Kennwerte, mit ranges werden nur Profile der Datenbank gefunden.
+        query = '''
+            SELECT airfoil_name FROM airfoil_data
+            WHERE airfoil_name COLLATE NOCASE >= ? AND airfoil_name COLLATE NOCASE < ?
+        '''
+        params = [prefix, prefix + "\U0010ffff"]
+
+        if ranges:
+            self.ensure_descriptors()
+            conditions = []
+            for name, (low, high) in ranges.items():
+                if name not in airfoil_bezier.DESCRIPTOR_NAMES:
+                    raise ValueError(f"unknown descriptor '{name}'")
+                if low is not None:
+                    conditions.append(f"d.{name} >= ?")
+                    params.append(low)
+                if high is not None:
+                    conditions.append(f"d.{name} <= ?")
+                    params.append(high)
+            if conditions:
+                query += f" AND airfoil_name IN (SELECT d.airfoil_name FROM airfoil_descriptors d WHERE {' AND '.join(conditions)})"
+
+        if after is not None:
+            query += " AND (airfoil_name COLLATE NOCASE, airfoil_name) > (?, ?)"
+            params += [after, after]
+
+        query += " ORDER BY airfoil_name COLLATE NOCASE, airfoil_name LIMIT ?"
+        params.append(limit)
+
+        try:
+            names = [row[0] for row in self.conn.execute(query, params)]
+        except sqlite3.Error as e:
+            print(f"Fehler bei der Suche nach '{prefix}': {e}")
+            return []
+
+        if self.catalogue is not None and not ranges:
+            names = merge_airfoil_names(names, self.catalogue.search(prefix, after, limit), limit=limit)
+        return names
+
+    def iter_airfoil_batches(self, batch_size=EXPORT_BATCH_SIZE):
+        # Alle Profile als Listen von (Name, Koordinaten) mit höchstens batch_size Einträgen,
+        # sortiert wie get_sorted_airfoils. Der Cursor bleibt offen und liefert die Zeilen
+        # schrittweise, es liegt nie die ganze Tabelle im Speicher.
+        cursor = self.conn.execute(
+            'SELECT airfoil_name, points FROM airfoil_data ORDER BY airfoil_name COLLATE NOCASE, airfoil_name')
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [(airfoil_name, unpack_points(points)) for airfoil_name, points in rows]
+        finally:
+            cursor.close()
+
+    @profiler.timed
+    def export_airfoils(self, target, file_format="bez", archive=None, samples=EXPORT_SAMPLES,
+                        batch_size=EXPORT_BATCH_SIZE):
+        # Schreibt alle Profile als bez.dat (file_format "bez", lesbar mit read_airfoil_from_bez) oder
+        # als Selig-Punktdatei mit samples Punkten je Seite (file_format "selig") in den Ordner target,
+        # mit archive (Standard: target endet auf .zip) in ein einziges Zip-Archiv.
+        # Gelesen und geschrieben wird paketweise, liefert die Anzahl der Dateien.
+        if file_format not in EXPORT_EXTENSIONS:
+            raise ValueError(f"unknown export format '{file_format}', expected one of {sorted(EXPORT_EXTENSIONS)}")
+        if archive is None:
+            archive = target.lower().endswith(".zip")
+
+        t_values = airfoil_bezier.parameter_values(samples)
+        extension = EXPORT_EXTENSIONS[file_format]
+
+        if archive:
+            zip_file = zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED)
+        else:
+            zip_file = None
+            os.makedirs(target, exist_ok=True)
+
+        # Namen, die sich nur in der Groß-/Kleinschreibung unterscheiden, folgen in dieser
+        # Sortierung direkt aufeinander und bekommen ein Suffix, Windows unterscheidet sie nicht
+        previous_name = None
+        duplicates = 0
+        count = 0
+
+        try:
+            for batch in self.iter_airfoil_batches(batch_size):
+                for airfoil_name, text in export_texts(batch, file_format, t_values):
+                    file_name = export_file_name(airfoil_name)
+                    if file_name.lower() == previous_name:
+                        duplicates += 1
+                        file_name += f"~{duplicates}"
+                    else:
+                        previous_name = file_name.lower()
+                        duplicates = 0
+                    file_name += extension
+
+                    if zip_file is not None:
+                        zip_file.writestr(file_name, text)
+                    else:
+                        with open(os.path.join(target, file_name), 'w', encoding='utf-8') as file:
+                            file.write(text)
+                    count += 1
+        finally:
+            if zip_file is not None:
+                zip_file.close()
+
+        return count
+
+    @profiler.timed
+    def delete_airfoil(self, airfoil_name):
+        try:
+            c = self.conn.cursor()
+            c.execute('DELETE FROM airfoil_data WHERE airfoil_name = ?', (airfoil_name,))
+            self.invalidate_cache(airfoil_name)
+            self.conn.commit()
+            print(f"Airfoil '{airfoil_name}' erfolgreich gelöscht.")
+
+        except sqlite3.Error as e:
+            print(f"Fehler beim Löschen des Airfoils '{airfoil_name}': {e}")
+
+    @profiler.timed
+    def delete_airfoils(self, airfoil_names):
+        # Löscht mehrere Profile in einer Transaktion, liefert die Anzahl gelöschter Profile
+        airfoil_names = list(airfoil_names)
+        self.invalidate_cache()
+        try:
+            with self.conn:
+                # rowcount zählt nur airfoil_data, nicht die per ON DELETE CASCADE gelöschten Kennwerte
+                return self.conn.executemany('DELETE FROM airfoil_data WHERE airfoil_name = ?',
+                                             [(name,) for name in airfoil_names]).rowcount
+        except sqlite3.Error as e:
+            print(f"Fehler beim Löschen der Airfoils: {e}")
+            return 0
+
+    def statistics(self):
+        # Kennzahlen der Bibliothek: Anzahl Profile und Dateien im Manifest, Schemaversion,
+        # Dateigröße und Wertebereich je Kennwert (in Anteilen der Profiltiefe)
+        self.ensure_descriptors()
+        c = self.conn.cursor()
+        page_count = c.execute('PRAGMA page_count').fetchone()[0]
+        page_size = c.execute('PRAGMA page_size').fetchone()[0]
+        columns = ", ".join(f"MIN({name}), MAX({name})" for name in airfoil_bezier.DESCRIPTOR_NAMES)
+        ranges = c.execute(f'SELECT {columns} FROM airfoil_descriptors').fetchone()
+
+        return {
+            "airfoils": c.execute('SELECT COUNT(*) FROM airfoil_data').fetchone()[0],
+            "degrees": dict(c.execute('SELECT degree, COUNT(*) FROM airfoil_data GROUP BY degree ORDER BY degree')),
+            "manifest_files": c.execute('SELECT COUNT(*) FROM import_manifest').fetchone()[0],
+            "quarantined": c.execute('SELECT COUNT(*) FROM quarantine').fetchone()[0],
+            "catalogue_airfoils": len(self.catalogue) if self.catalogue is not None else 0,
+            "schema_version": c.execute('PRAGMA user_version').fetchone()[0],
+            "size_bytes": page_count * page_size,
+            "descriptors": {name: (ranges[2 * i], ranges[2 * i + 1])
+                            for i, name in enumerate(airfoil_bezier.DESCRIPTOR_NAMES)},
+        }
+
+    def quarantine_entries(self):
+        # Abgelehnte Profile und Dateien als Liste von dicts, sortiert nach Pfad und Name
+        rows = self.conn.execute('''
+            SELECT path, airfoil_name, reasons, content_hash, quarantined FROM quarantine
+            ORDER BY path, airfoil_name
+        ''')
+        return [{"path": path, "airfoil_name": airfoil_name,
+                 "reasons": reasons.split(QUARANTINE_REASON_SEPARATOR),
+                 "content_hash": content_hash, "quarantined": quarantined}
+                for path, airfoil_name, reasons, content_hash, quarantined in rows]
+
+    def write_quarantine_report(self, path):
+        # Schreibt quarantine_entries als JSON, z.B. für Fusion, wo print nicht sichtbar ist.
+        # Liefert die Anzahl der Einträge.
+        entries = self.quarantine_entries()
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(entries, file, indent=2)
+        return len(entries)
+
+    def optimize(self):
+        # Aktualisiert die Statistiken des Abfrageplaners und schreibt das WAL in die Datenbank
+        # zurück, z.B. nach einem großen Import vor der Weitergabe der Datei
+        self.conn.execute('PRAGMA optimize')
+        self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def write_catalogue(self, path, batch_size=EXPORT_BATCH_SIZE):
+        # Schreibt alle Profile der Datenbank als Katalog für airfoil_catalogue.AirfoilCatalogue
+        return airfoil_catalogue.write_catalogue(path, self.iter_airfoil_batches(batch_size))
+
+    def close(self):
+        self.conn.close()
+        if self.catalogue is not None:
+            self.catalogue.close()
+        print("Datenbankverbindung geschlossen.")
@@ -0,0 +1,138 @@
+"""
+Einlesen von Profildateien ohne Fusion-API, gemeinsam für beide Fusion-Skripte und airfoil_database.
+
+bez.dat: ein oder mehrere Abschnitte aus Profilname und 2 * Grad + 1 Kontrollpunkten "x y" von der
+Endleiste oben über die Nase zur Endleiste unten (Ober- und Unterseite teilen sich den Nasenpunkt).
+Der BezierAirfoilDesigner schreibt Grad 9, also NUM_POINTS Punkte. Ein Abschnitt endet mit der
+nächsten Zeile, die nicht aus genau zwei Zahlen besteht, Leerzeilen werden überall übersprungen.
+Alle anderen Dateien werden als Selig- oder Lednicer-Punktdatei gelesen und mit Bezierkurven
+gefittet (airfoil_bezier.parse_coordinate_text, airfoil_bezier.fit_airfoils).
+"""
+
+from decimal import Decimal
+
+try:
+    from . import airfoil_bezier
+except ImportError:
+    import airfoil_bezier
+
+NUM_POINTS = 19
+BEZ_EXTENSIONS = (".bez.dat", ".bez")
+# Nachkommastellen der Koordinaten in den Dateien des BezierAirfoilDesigners
+BEZ_DECIMALS = 16
+
+
+def is_coordinate_text(text, file_path=None):
+    # Dateien mit der Endung .bez.dat oder .bez sind immer bez.dat-Dateien (beliebig viele Abschnitte
+    # und Grade). Ohne diese Endung gilt ein Text mit genau NUM_POINTS Zeilen nach dem Namen als
+    # bez.dat, alles andere wird als Punktdatei (Selig/Lednicer) gelesen und gefittet.
+    if file_path is not None and file_path.lower().endswith(BEZ_EXTENSIONS):
+        return False
+    return sum(1 for line in text.splitlines()[1:] if line.strip()) != NUM_POINTS
+
+
+def _finish_section(airfoil_name, coordinates, line_number, degree):
+    count = len(coordinates)
+    if degree is not None and count != 2 * degree + 1:
+        raise ValueError(f"airfoil '{airfoil_name}' (line {line_number}): {count} control points, "
+                         f"expected {2 * degree + 1} for degree {degree}")
+    if count < 3 or count % 2 == 0:
+        raise ValueError(f"airfoil '{airfoil_name}' (line {line_number}): {count} control points, "
+                         f"expected an odd number of at least 3 (2 * degree + 1)")
+    return airfoil_name, coordinates
+
+
+def iter_bez_sections(lines, degree=None):
+    # Liefert die Abschnitte einer bez.dat-Datei als (Profilname, [(x, y), ...]) in einem Durchgang
+    # über lines (Datei, Liste oder Generator von Zeilen). Ein Abschnitt wird erst geparst, wenn
+    # der vorige abgeholt wurde. Die erste Zeile ist immer ein Name, danach ist nur eine Zeile aus
+    # genau zwei Zahlen ein Punkt, jede andere Zeile beginnt einen neuen Abschnitt (auch Namen wie
+    # "2412 mod"). Punktzahlen, die keinem Grad (bzw. nicht degree) entsprechen, ergeben
+    # ValueError mit der Zeilennummer des Abschnitts.
+    airfoil_name = None
+    start = 0
+    coordinates = []
+
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields:
+            continue
+
+        if airfoil_name is not None:
+            if len(fields) == 2:
+                try:
+                    coordinates.append((float(fields[0]), float(fields[1])))
+                    continue
+                except ValueError:
+                    pass
+
+            yield _finish_section(airfoil_name, coordinates, start, degree)
+
+        airfoil_name = line.strip()
+        start = number
+        coordinates = []
+
+    if airfoil_name is not None:
+        yield _finish_section(airfoil_name, coordinates, start, degree)
+
+
+def iter_bez_file(file_path, degree=None):
+    # Wie iter_bez_sections, die Datei wird zeilenweise gelesen, auch große Sammeldateien
+    # liegen nie ganz im Speicher
+    with open(file_path, encoding="utf-8", errors="replace") as file:
+        yield from iter_bez_sections(file, degree)
+
+
+def parse_bez_text(text, degree=None):
+    # Alle Abschnitte einer bez.dat-Datei als [(Profilname, [(x, y), ...]), ...]
+    sections = list(iter_bez_sections(text.splitlines(), degree))
+    if not sections:
+        raise ValueError("no airfoil found")
+    return sections
+
+
+def format_bez_number(value):
+    # Feste Schreibweise ohne Exponent wie in den bez.dat-Dateien. Ergeben 16 Nachkommastellen beim
+    # Einlesen nicht denselben float (kleine Werte), wird die kürzeste exakte Darstellung (repr)
+    # ausgeschrieben und auf BEZ_DECIMALS Stellen aufgefüllt.
+    value = float(value)
+    text = f"{value:.{BEZ_DECIMALS}f}"
+    if float(text) == value:
+        return text
+    whole, _, fraction = format(Decimal(repr(value)), "f").partition(".")
+    return f"{whole}.{fraction.ljust(BEZ_DECIMALS, '0')}"
+
+
+def format_bez_text(airfoil_name, coordinates):
+    # Gegenstück zu parse_bez_text, verlustfrei (siehe format_bez_number)
+    return airfoil_name + "\n" + "".join(f"{format_bez_number(x)} {format_bez_number(y)}\n" for x, y in coordinates)
+
+
+def split_polygon(coordinates, degree):
+    # Gespeicherte Punktfolge (Endleiste oben -> Nase -> Endleiste unten) -> (top_r, bottom),
+    # beide Seiten von der Nase zur Endleiste
+    top_r = list(reversed(coordinates[:degree + 1]))
+    bottom = list(coordinates[degree:])
+    return top_r, bottom
+
+
+def fitted_coordinates(top_r, bottom):
+    # Ergebnis von airfoil_bezier.fit_airfoils -> gespeicherte Punktfolge
+    return list(reversed(top_r)) + list(bottom)[1:]
+
+
+def read_airfoil_text(text, file_path=None):
+    # [(Profilname, Kontrollpunkte, Fitfehler), ...] aus dem Inhalt einer bez.dat-Datei (ein
+    # Eintrag je Abschnitt, Fitfehler None) oder einer Punktdatei (ein gefittetes Profil)
+    if is_coordinate_text(text, file_path):
+        airfoil_name, upper, lower = airfoil_bezier.parse_coordinate_text(text)
+        (top_r, bottom, fit_error), = airfoil_bezier.fit_airfoils([(upper, lower)])
+        return [(airfoil_name, fitted_coordinates(top_r, bottom), fit_error)]
+
+    return [(airfoil_name, coordinates, None) for airfoil_name, coordinates in parse_bez_text(text)]
+
+
+def read_airfoil_file(file_path):
+    # Wie read_airfoil_text, ungültige UTF-8-Zeichen werden ersetzt
+    with open(file_path, 'rb') as file:
+        return read_airfoil_text(file.read().decode(errors="replace"), file_path)
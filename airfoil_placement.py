@@ -0,0 +1,68 @@
+"""
+Planung der Platzierung eines Profils ohne Fusion-API: Namen, Werte und Ausdrücke der
+Benutzerparameter, die airfoil_sketch in Fusion anlegt.
+
+Je Seite (oben, unten) und Kontrollpunkt i gibt es
+    xdat<Seite><Suffix><i>, ydat<Seite><Suffix><i>  Koordinaten bezogen auf die Profiltiefe
+    x<Seite><Suffix><i>, y<Seite><Suffix><i>        Bemaßungen = xdat * root * invy bzw. ydat * root * invx
+dazu root<Suffix> (Profiltiefe in cm), invx<Suffix>, invy<Suffix> (Spiegelungen) und bei
+Platzierung ohne Endleistenpunkt die Bemaßung wurzeltiefe<Suffix>.
+"""
+
+# Kontrollpunkte je Seite, die Skizze nutzt zwei Splines vom Grad 9
+CONTROL_POINTS = 10
+SIDES = ("oben", "unten")
+
+# Profiltiefe in cm ohne gewählten Endleistenpunkt und ohne Bemaßungsparameter
+DEFAULT_CHORD = 10
+
+
+def valid_suffix(suffix):
+    # Parameternamen in Fusion: als Suffix sind nur Buchstaben vorgesehen
+    return str(suffix).isalpha()
+
+
+def driver_name(suffix):
+    return "root" + str(suffix)
+
+
+def chord_dimension_name(suffix):
+    return "wurzeltiefe" + str(suffix)
+
+
+def driver_expression(source):
+    # root* ist dimensionslos in cm, source eine Länge (Parameter oder Bemaßung)
+    return str(source) + " * 0.1 / mm"
+
+
+def point_names(suffix, side):
+    # [(x-Bemaßung, y-Bemaßung), ...] der Kontrollpunkte einer Seite von der Nase zur Endleiste
+    return [(f"x{side}{suffix}{i}", f"y{side}{suffix}{i}") for i in range(CONTROL_POINTS)]
+
+
+def plan_parameters(top_r, bottom, suffix, chord=DEFAULT_CHORD):
+    # Benutzerparameter in der Reihenfolge ihrer Anlage als
+    # (Name, Wert, Einheit, Kommentar, Ausdruck oder None, Favorit)
+    if len(top_r) != CONTROL_POINTS or len(bottom) != CONTROL_POINTS:
+        raise ValueError(f"placement needs {CONTROL_POINTS} control points per side (degree 9), "
+                         f"got top {len(top_r)}, bottom {len(bottom)}")
+
+    suffix = str(suffix)
+    parameters = [
+        (driver_name(suffix), chord, "", driver_name(suffix), None, True),
+        ("invx" + suffix, 1, "", "switch to bottom", None, True),
+        ("invy" + suffix, 1, "", "switch to bottom1", None, True),
+    ]
+
+    for side, points in zip(SIDES, (top_r, bottom)):
+        for i, ((x, y), (x_name, y_name)) in enumerate(zip(points, point_names(suffix, side))):
+            x_data = f"xdat{side}{suffix}{i}"
+            y_data = f"ydat{side}{suffix}{i}"
+            parameters += [
+                (x_data, float(x), "mm", "", None, False),
+                (y_data, float(y), "mm", "", None, False),
+                (x_name, float(x) * chord, "mm", "", f"{x_data} * root{suffix} * invy{suffix}", False),
+                (y_name, float(y) * chord, "mm", "", f"{y_data} * root{suffix} * invx{suffix}", i == CONTROL_POINTS - 1),
+            ]
+
+    return parameters
@@ -0,0 +1,73 @@
+"""
+Zeitmessung der Phasen einer Platzierung und einzelner Funktionsaufrufe, ohne Fusion-API.
+Genutzt von beiden Fusion-Skripten, airfoil_database und den Benchmarks.
+"""
+
+import functools
+import json
+import time
+
+
+class PhaseProfiler:
+    # Opt-in Zeitmessung (time.perf_counter) der Phasen von Foil.Execute und der
+    # Datenbankaufrufe samt Aufrufzählern, ausgegeben als JSON und als Zusammenfassung
+    def __init__(self):
+        self.enabled = False
+        self.phases = {}
+        self.calls = {}
+        # Weitere Zähler für den Bericht, z.B. die Fusion-API-Aufrufe oder die Datenbankzugriffe
+        self.counters = {}
+        self._lap_start = None
+
+    def start(self):
+        self.phases = {}
+        self.calls = {}
+        self._lap_start = time.perf_counter()
+
+    @staticmethod
+    def record(entries, name, seconds):
+        entry = entries.setdefault(name, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+
+    def lap(self, name):
+        # Zeit seit dem letzten lap (bzw. start) der Phase name zuschreiben
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.record(self.phases, name, now - self._lap_start)
+        self._lap_start = now
+
+    def timed(self, function):
+        name = function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(self.calls, name, time.perf_counter() - start)
+
+        return wrapper
+
+    def report(self):
+        return {
+            "phases": self.phases,
+            "calls": self.calls,
+            "total_seconds": sum(entry["seconds"] for entry in self.phases.values()),
+            **{name: dict(counter) for name, counter in self.counters.items()},
+        }
+
+    def summary(self):
+        report = self.report()
+        lines = [f'{name}: {entry["seconds"] * 1000:.1f} ms' for name, entry in report["phases"].items()]
+        lines.append(f'total: {report["total_seconds"] * 1000:.1f} ms')
+        lines += [f'{name}: {entry["seconds"] * 1000:.1f} ms ({entry["calls"]}x)' for name, entry in report["calls"].items()]
+        return "\n".join(lines)
+
+    def write_report(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
@@ -0,0 +1,249 @@
+"""
+Platzierung eines Profils in einer Fusion-Skizze, gemeinsam für bezier_airfoil_import und
+bezier_airfoil_import_database. Die Parameter plant airfoil_placement, hier werden nur Skizze,
+Splines, Bemaßungen und Abhängigkeiten angelegt.
+"""
+
+import adsk.core, adsk.fusion
+from collections import Counter
+
+try:
+    from . import airfoil_placement
+except ImportError:
+    import airfoil_placement
+
+_user_parameters = {}
+_parameter_index = {}
+
+# Fusion-API-Aufrufe der letzten Platzierung und Obergrenze je Profil
+api_calls = Counter()
+API_CALL_BUDGET = {
+    "userParameters.add": 83,
+    "expression": 84,
+    "dimension": 42,
+    "addCoincident": 4,
+    "isFixed": 60,
+}
+
+ui = None
+app = adsk.core.Application.get()
+if app:
+    ui = app.userInterface
+
+# Das aktive Design wird erst beim ersten Zugriff aufgelöst, nicht beim Laden des Skripts
+_design = None
+
+
+def get_design():
+    global _design
+    if _design is None or not _design.isValid:
+        _design = adsk.fusion.Design.cast(app.activeProduct)
+    return _design
+
+
+def count_api_call(name):
+    api_calls[name] += 1
+
+
+def check_api_calls():
+    # Meldet, wenn eine Platzierung mehr Fusion-Aufrufe braucht als in API_CALL_BUDGET vorgesehen
+    exceeded = {name: count for name, count in api_calls.items() if count > API_CALL_BUDGET.get(name, 0)}
+    if exceeded:
+        print(f"Mehr Fusion-API-Aufrufe als vorgesehen: {exceeded}, Budget: {API_CALL_BUDGET}")
+    return exceeded
+
+
+def find_parameter(name):
+    # Parameter über den Namen statt über Schleifen durch design.allParameters.
+    # Selbst angelegte Parameter stehen in _user_parameters, andere werden per itemByName
+    # gesucht und in _parameter_index gemerkt.
+    for index in (_user_parameters, _parameter_index):
+        parameter = index.get(name)
+        if parameter is not None and parameter.isValid and parameter.name == name:
+            return parameter
+
+    parameter = get_design().allParameters.itemByName(name)
+    if parameter:
+        _parameter_index[name] = parameter
+    return parameter
+
+
+def create_parameters(design, parameters):
+    # Legt die von airfoil_placement.plan_parameters geplanten Benutzerparameter an
+    for name, value, units, comment, expression, favorite in parameters:
+        parameter = design.userParameters.add(name, adsk.core.ValueInput.createByReal(value), units, comment)
+        count_api_call("userParameters.add")
+        _user_parameters[name] = parameter
+        if expression is not None:
+            parameter.expression = expression
+            count_api_call("expression")
+        if favorite:
+            parameter.isFavorite = True
+
+
+def place_airfoil(nose, tail, suf, param_drive, load_coordinates, profiler, defer_compute=True, sketch=None):
+    # Platziert ein Profil an nose (und tail) oder ohne Punkte in sketch bzw. einer neuen Skizze
+    # auf der xy-Ebene. load_coordinates() liefert (top_r, bottom) von der Nase zur Endleiste.
+    api_calls.clear()
+
+    top_r, bottom = load_coordinates()
+    profiler.lap("coordinates")
+    if top_r is None:
+        return
+    if len(top_r) != airfoil_placement.CONTROL_POINTS or len(bottom) != airfoil_placement.CONTROL_POINTS:
+        ui.messageBox(f'Splinedegree of the airfoil does not match 9 (detected: top {len(top_r)} points, '
+                      f'bottom {len(bottom)} points instead of {airfoil_placement.CONTROL_POINTS})')
+        return
+
+    design = get_design()
+    root = design.rootComponent
+
+    wurzeltiefe = airfoil_placement.DEFAULT_CHORD   # Wird bei Bamaßung geändert, Units sind hier immer cm
+
+    if nose != 0:
+        sketchT = nose.parentSketch
+        point_nose = nose
+        halb_ausrichten = True
+    else:
+        sketchT = sketch if sketch is not None else root.sketches.add(root.xYConstructionPlane)
+        halb_ausrichten = False
+
+    if tail != 0:
+        point_tail = tail
+        ausrichten = True
+    else:
+        ausrichten = False
+
+    if ausrichten is True:
+        line_sehne = sketchT.sketchCurves.sketchLines.addByTwoPoints(point_nose, point_tail)
+        line_sehne.isConstruction = False
+        wurzeltiefe = line_sehne.length
+
+    if not airfoil_placement.valid_suffix(suf):
+        ui.messageBox("suffix contains signs other than alphanum")
+
+    # Im Massenmodus wird die Skizze erst gelöst, nachdem alle Bemaßungen und Ausdrücke gesetzt sind
+    sketchT.isComputeDeferred = defer_compute
+    try:
+        linex = sketchT.sketchCurves.sketchLines.addByTwoPoints(adsk.core.Point3D.create(0, 0, 0), adsk.core.Point3D.create(100, 0, 0))
+        linex.isConstruction = True
+        linex.isFixed = True
+
+        liney = sketchT.sketchCurves.sketchLines.addByTwoPoints(adsk.core.Point3D.create(0, 0, 0), adsk.core.Point3D.create(0, 1, 0))
+        liney.isConstruction = True
+        liney.isFixed = True
+
+        dim = sketchT.sketchDimensions
+        driver_name = airfoil_placement.driver_name(suf)
+        chord_name = airfoil_placement.chord_dimension_name(suf)
+
+        # create "random" sketchPoints to get a degree 3 spline (api generates only 3 or 5 degree)
+        controlPoints1 = [adsk.core.Point3D.create(x, y, 0) for x, y in ((0.1, 1), (0.33, 1.2), (0.66, 1.2), (0.1, 1))]
+        controlPoints2 = [adsk.core.Point3D.create(x, y, 0) for x, y in ((0.1, -1), (0.33, -1.2), (0.66, -1.2), (0.1, -1))]
+
+        # sketch curves
+        curve1 = sketchT.sketchCurves.sketchControlPointSplines.add(controlPoints1, 3)
+        curve2 = sketchT.sketchCurves.sketchControlPointSplines.add(controlPoints2, 3)
+
+        # set curves to degree 9, this adds up to a sum of 10 points each
+        curve1.degree = 9
+        curve2.degree = 9
+
+        for point in controlPoints1 + controlPoints2:
+            point.isFixed = True
+
+        profiler.lap("sketch setup")
+
+        create_parameters(design, airfoil_placement.plan_parameters(top_r, bottom, suf, wurzeltiefe))
+        names_oben = airfoil_placement.point_names(suf, "oben")
+        names_unten = airfoil_placement.point_names(suf, "unten")
+        profiler.lap("create_parameters")
+
+        textPoint = adsk.core.Point3D.create(0, 1, 0)
+
+        def dim_pointsx(coll, names):
+
+            for i in range(airfoil_placement.CONTROL_POINTS):
+                coll.controlPoints[i].isFixed = False
+                count_api_call("isFixed")
+                dim.addOffsetDimension(liney, coll.controlPoints[i], textPoint, True)
+                count_api_call("dimension")
+                dim[-1].parameter.expression = _user_parameters[names[i][0]].name
+                count_api_call("expression")
+                coll.controlPoints[i].isFixed = True
+                count_api_call("isFixed")
+
+        def dim_pointsy(coll, names):
+
+            for i in range(airfoil_placement.CONTROL_POINTS):
+                coll.controlPoints[i].isFixed = False
+                count_api_call("isFixed")
+                dim.addOffsetDimension(linex, coll.controlPoints[i], textPoint, True)
+                count_api_call("dimension")
+                dim[-1].parameter.expression = _user_parameters[names[i][1]].name
+                count_api_call("expression")
+
+        dim_pointsx(curve2, names_unten)
+        dim_pointsy(curve2, names_unten)
+        dim_pointsx(curve1, names_oben)
+        dim_pointsy(curve1, names_oben)
+        profiler.lap("dimensions")
+
+        linex.isFixed = False
+        liney.isFixed = False
+
+        sketchT.geometricConstraints.addCoincident(liney.startSketchPoint, curve1.controlFrameLines[0].startSketchPoint)
+        count_api_call("addCoincident")
+        sketchT.geometricConstraints.addCoincident(liney.endSketchPoint, curve1.controlFrameLines[0].endSketchPoint)
+        count_api_call("addCoincident")
+
+        sketchT.geometricConstraints.addCoincident(liney.startSketchPoint, linex.startSketchPoint)
+        count_api_call("addCoincident")
+        dim.addAngularDimension(linex, liney, textPoint, True)
+        count_api_call("dimension")
+
+        dim[-1].parameter.expression = "90 deg"
+        count_api_call("expression")
+
+        if halb_ausrichten is True:
+            sketchT.geometricConstraints.addCoincident(liney.startSketchPoint, point_nose)
+            count_api_call("addCoincident")
+
+        if ausrichten is True:
+            dim.addDistanceDimension(linex.endSketchPoint, point_tail, 0, textPoint, True)
+            count_api_call("dimension")
+            dim[-1].value = 0
+
+        if param_drive != "":
+            _user_parameters[driver_name].expression = airfoil_placement.driver_expression(param_drive)
+            count_api_call("expression")
+            parameter = find_parameter(str(param_drive))
+            if parameter:
+                parameter.isFavorite = True
+
+        if ausrichten is False:
+            if param_drive == "":
+                dim.addDistanceDimension(linex.endSketchPoint, linex.startSketchPoint, 0, textPoint, True)
+                count_api_call("dimension")
+                dim[-1].value = airfoil_placement.DEFAULT_CHORD
+                dim[-1].parameter.name = chord_name
+                parameter = find_parameter(chord_name)
+                if parameter:
+                    parameter.isFavorite = True
+                    _user_parameters[driver_name].expression = airfoil_placement.driver_expression(chord_name)
+                    count_api_call("expression")
+                    _user_parameters[driver_name].isFavorite = False
+            elif find_parameter(str(param_drive)):
+                dim.addDistanceDimension(linex.endSketchPoint, linex.startSketchPoint, 0, textPoint, True)
+                count_api_call("dimension")
+                dim[-1].parameter.name = chord_name
+                parameter = find_parameter(chord_name)
+                if parameter:
+                    parameter.expression = str(param_drive) + " / mm"
+                    count_api_call("expression")
+
+        profiler.lap("constraints")
+    finally:
+        sketchT.isComputeDeferred = False
+    profiler.lap("solve")
+    check_api_calls()
@@ -0,0 +1,153 @@
+"""
+Prüfung importierter Profile vor dem Schreiben in die Datenbank, ohne Fusion-API.
+
+Geprüft wird die gespeicherte Punktfolge (Endleiste oben -> Nase -> Endleiste unten):
+    - Punktzahl NUM_POINTS (Grad 9, wie ihn die Skizze erwartet)
+    - nur endliche Koordinaten, kein NaN oder inf
+    - gemeinsamer Nasenpunkt: der zweite Kontrollpunkt beider Seiten liegt senkrecht über bzw.
+      unter der Nase (die Skizze legt dort die y-Achse durch, siehe airfoil_sketch)
+    - x steigt entlang der Kurve jeder Seite von der Nase zur Endleiste monoton an. Steigt x schon
+      im Kontrollpolygon monoton (bez.dat des BezierAirfoilDesigners), gilt das auch für die
+      Kurve, sonst wird sie an MONOTONIC_SAMPLES Stellen ausgewertet (gefittete Punktdateien
+      haben auch bei kleinem Fitfehler Kontrollpunkte mit springendem x).
+    - Endleiste geschlossen, Spalt höchstens TE_GAP_TOLERANCE der Profiltiefe
+
+Ist NumPy installiert, werden alle Profile eines Pakets mit derselben Punktzahl als ein Array
+geprüft, sonst jedes Profil einzeln in reinem Python. Beide Wege liefern dieselben Gründe.
+"""
+
+from math import hypot, isfinite
+
+try:
+    from . import airfoil_bezier
+    from .airfoil_parser import NUM_POINTS
+except ImportError:
+    import airfoil_bezier
+    from airfoil_parser import NUM_POINTS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Größter Spalt an der Endleiste und Rundungstoleranz der x-Vergleiche, bezogen auf die Profiltiefe
+TE_GAP_TOLERANCE = 0.005
+X_TOLERANCE = 1e-6
+MONOTONIC_SAMPLES = 100
+
+NON_FINITE = "NaN or infinite coordinates"
+NO_CHORD = "trailing edge not behind the leading edge"
+LEADING_EDGE = "sides do not share a vertical tangent at the leading edge"
+UPPER_NOT_MONOTONIC = "x not increasing from leading to trailing edge on the upper side"
+LOWER_NOT_MONOTONIC = "x not increasing from leading to trailing edge on the lower side"
+
+
+def _reasons(finite, chord, leading_edge, upper_monotonic, lower_monotonic, te_gap, te_gap_tolerance):
+    # Gründe eines Profils aus den Einzelprüfungen, gemeinsam für NumPy und reines Python
+    if not finite:
+        return [NON_FINITE]
+    if chord <= 0.0:
+        return [NO_CHORD]
+
+    reasons = []
+    if not leading_edge:
+        reasons.append(LEADING_EDGE)
+    if not upper_monotonic:
+        reasons.append(UPPER_NOT_MONOTONIC)
+    if not lower_monotonic:
+        reasons.append(LOWER_NOT_MONOTONIC)
+    if te_gap > te_gap_tolerance:
+        reasons.append(f"trailing edge open by {te_gap:.2%} of chord")
+    return reasons
+
+
+def _increasing(points, tolerance):
+    return all(b[0] - a[0] >= -tolerance for a, b in zip(points, points[1:]))
+
+
+def _curve(points):
+    return airfoil_bezier.evaluate_curve(points, airfoil_bezier.parameter_values(MONOTONIC_SAMPLES))
+
+
+def _increasing_array(xs, tolerance, degree):
+    # xs: x der Kontrollpunkte (Profile, degree + 1), die Kurven werden nur für die Profile mit
+    # nicht monotonem Kontrollpolygon ausgewertet, alle mit einer Matrixmultiplikation
+    increasing = (np.diff(xs, axis=1) >= -tolerance[:, None]).all(axis=1)
+    check = np.flatnonzero(~increasing)
+    if len(check):
+        curves = airfoil_bezier.bernstein_matrix(degree, airfoil_bezier.parameter_values(MONOTONIC_SAMPLES)) @ xs[check].T
+        increasing[check] = (np.diff(curves, axis=0) >= -tolerance[check]).all(axis=0)
+    return increasing
+
+
+def _check_rows(coordinates, degree, te_gap_tolerance):
+    if not all(isfinite(x) and isfinite(y) for x, y in coordinates):
+        return [NON_FINITE]
+
+    top = coordinates[degree::-1]
+    bottom = coordinates[degree:]
+    nose_x = coordinates[degree][0]
+    chord = min(top[-1][0], bottom[-1][0]) - nose_x
+    if chord <= 0.0:
+        return [NO_CHORD]
+
+    tolerance = X_TOLERANCE * chord
+    leading_edge = abs(top[1][0] - nose_x) <= tolerance and abs(bottom[1][0] - nose_x) <= tolerance
+    upper_monotonic = _increasing(top, tolerance) or _increasing(_curve(top), tolerance)
+    lower_monotonic = _increasing(bottom, tolerance) or _increasing(_curve(bottom), tolerance)
+    te_gap = hypot(top[-1][0] - bottom[-1][0], top[-1][1] - bottom[-1][1]) / chord
+    return _reasons(True, chord, leading_edge, upper_monotonic, lower_monotonic, te_gap, te_gap_tolerance)
+
+
+def _check_array(points, degree, te_gap_tolerance):
+    # points: Array (Profile, 2 * degree + 1, 2), alle Prüfungen für das ganze Paket auf einmal
+    finite = np.isfinite(points).all(axis=(1, 2))
+    points = np.where(finite[:, None, None], points, 0.0)
+
+    top = points[:, degree::-1]
+    bottom = points[:, degree:]
+    nose_x = points[:, degree, 0]
+    chord = np.minimum(top[:, -1, 0], bottom[:, -1, 0]) - nose_x
+    scale = np.where(chord > 0.0, chord, 1.0)
+    tolerance = X_TOLERANCE * scale
+
+    leading_edge = (np.abs(top[:, 1, 0] - nose_x) <= tolerance) & (np.abs(bottom[:, 1, 0] - nose_x) <= tolerance)
+    upper_monotonic = _increasing_array(top[:, :, 0], tolerance, degree)
+    lower_monotonic = _increasing_array(bottom[:, :, 0], tolerance, degree)
+    gap = top[:, -1] - bottom[:, -1]
+    te_gap = np.hypot(gap[:, 0], gap[:, 1]) / scale
+
+    valid = finite & (chord > 0.0) & leading_edge & upper_monotonic & lower_monotonic & (te_gap <= te_gap_tolerance)
+    return [[] if valid[k] else
+            _reasons(bool(finite[k]), float(chord[k]), bool(leading_edge[k]), bool(upper_monotonic[k]),
+                     bool(lower_monotonic[k]), float(te_gap[k]), te_gap_tolerance)
+            for k in range(len(points))]
+
+
+def validate_airfoils(airfoils, point_count=NUM_POINTS, te_gap_tolerance=TE_GAP_TOLERANCE):
+    # airfoils: Liste von Punktfolgen [(x, y), ...] -> je Profil die Liste der Gründe für eine
+    # Ablehnung, leer bei gültigen Profilen. point_count=None lässt jeden Grad zu.
+    airfoils = list(airfoils)
+    reasons = [[] for _ in airfoils]
+    by_count = {}
+
+    for i, coordinates in enumerate(airfoils):
+        count = len(coordinates)
+        if point_count is not None and count != point_count:
+            reasons[i].append(f"{count} control points, expected {point_count}")
+        elif count < 3 or count % 2 == 0:
+            reasons[i].append(f"{count} control points, expected an odd number of at least 3")
+        else:
+            by_count.setdefault(count, []).append(i)
+
+    for count, indices in by_count.items():
+        degree = (count - 1) // 2
+        if np is not None:
+            points = np.asarray([airfoils[i] for i in indices], dtype=np.float64)
+            found = _check_array(points, degree, te_gap_tolerance)
+        else:
+            found = [_check_rows(list(airfoils[i]), degree, te_gap_tolerance) for i in indices]
+        for i, problems in zip(indices, found):
+            reasons[i] = problems
+
+    return reasons
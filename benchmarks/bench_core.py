@@ -0,0 +1,216 @@
+"""
+Micro-Benchmarks der Fusion-unabhängigen Module (Parser, Prüfung, Platzierungsplanung, Datenbank).
+
+    python benchmarks/bench_core.py --count 2000 --repeat 5
+    python benchmarks/bench_core.py --json bench.json
+
+Die Profile werden aus sample.bez.dat mit zufällig skalierter Dicke erzeugt und in ein
+temporäres Verzeichnis geschrieben. Je Benchmark wird die beste von --repeat Laufzeiten
+ausgegeben, gesamt und je Profil.
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import airfoil_bezier
+import airfoil_database
+import airfoil_parser
+import airfoil_placement
+import airfoil_validation
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample.bez.dat")
+
+
+def make_bez_texts(count, seed=0):
+    rng = random.Random(seed)
+    (airfoil_name, coordinates), = airfoil_parser.parse_bez_text(open(SAMPLE, encoding="utf-8").read())
+    texts = []
+    for i in range(count):
+        scale = 0.8 + 0.4 * rng.random()
+        texts.append(airfoil_parser.format_bez_text(f"bench {i:06d}", [(x, y * scale) for x, y in coordinates]))
+    return texts
+
+
+def make_selig_texts(count, seed=0):
+    # NACA-4-Profile mit 61 Punkten je Seite, wie sie aus Profilsammlungen kommen
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        m, p, t = 0.04 * rng.random(), 0.3 + 0.2 * rng.random(), 0.08 + 0.08 * rng.random()
+        upper, lower = [], []
+        for k in range(61):
+            x = (1 - math.cos(math.pi * k / 60)) / 2
+            yt = 5 * t * (0.2969 * math.sqrt(x) - 0.126 * x - 0.3516 * x ** 2 + 0.2843 * x ** 3 - 0.1015 * x ** 4)
+            yc = m / p ** 2 * (2 * p * x - x * x) if x < p else m / (1 - p) ** 2 * (1 - 2 * p + 2 * p * x - x * x)
+            upper.append((x, yc + yt))
+            lower.append((x, yc - yt))
+        texts.append(airfoil_bezier.format_coordinate_text(f"naca {i:06d}", upper, lower))
+    return texts
+
+
+def write_files(folder, texts, extension):
+    paths = []
+    for i, text in enumerate(texts):
+        path = os.path.join(folder, f"{i:06d}{extension}")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        paths.append(path)
+    return paths
+
+
+def measure(function, repeat, setup=None):
+    # Beste Laufzeit in Sekunden, setup() läuft vor jeder Messung und liefert die Argumente
+    best = None
+    result = None
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def run_benchmarks(count, repeat, workers):
+    folder = tempfile.mkdtemp(prefix="airfoil_bench_")
+    results = []
+
+    def record(name, seconds, items):
+        results.append({"name": name, "items": items, "seconds": seconds,
+                        "us_per_item": seconds / items * 1e6 if items else None})
+
+    try:
+        bez_texts = make_bez_texts(count)
+        selig_count = max(1, count // 10)
+        selig_texts = make_selig_texts(selig_count)
+        os.makedirs(os.path.join(folder, "bez"))
+        os.makedirs(os.path.join(folder, "selig"))
+        bez_paths = write_files(os.path.join(folder, "bez"), bez_texts, ".bez.dat")
+        selig_paths = write_files(os.path.join(folder, "selig"), selig_texts, ".dat")
+
+        # Parser
+        seconds, parsed = measure(lambda: [airfoil_parser.parse_bez_text(text) for text in bez_texts], repeat)
+        record("parse_bez_text", seconds, count)
+        seconds, _ = measure(lambda: [airfoil_parser.read_airfoil_text(text) for text in bez_texts], repeat)
+        record("read_airfoil_text bez", seconds, count)
+        seconds, _ = measure(lambda: [airfoil_parser.read_airfoil_text(text) for text in selig_texts], repeat)
+        record("read_airfoil_text selig (fit each)", seconds, selig_count)
+        seconds, _ = measure(lambda: airfoil_database.parse_airfoil_files(selig_paths), repeat)
+        record("parse_airfoil_files selig (batch fit)", seconds, selig_count)
+        seconds, _ = measure(lambda: airfoil_database.parse_airfoil_files(bez_paths), repeat)
+        record("parse_airfoil_files bez", seconds, count)
+
+        # Prüfung vor dem Import
+        coordinates = [sections[0][1] for sections in parsed]
+        seconds, _ = measure(lambda: airfoil_validation.validate_airfoils(coordinates), repeat)
+        record("validate_airfoils", seconds, count)
+
+        # Platzierung
+        polygons = [airfoil_parser.split_polygon(sections[0][1], 9) for sections in parsed]
+        seconds, _ = measure(lambda: [airfoil_placement.plan_parameters(top_r, bottom, "a", 10) for top_r, bottom in polygons],
+                             repeat)
+        record("plan_parameters", seconds, count)
+
+        # Datenbank
+        database = os.path.join(folder, "bench.db")
+
+        def fresh_database():
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(database + suffix):
+                    os.remove(database + suffix)
+            db = airfoil_database.sqlDatabase(database)
+            db.create_airfoil_table()
+            return db,
+
+        def import_files(db, paths=bez_paths, **options):
+            result = db.import_airfoils_bulk(paths, **options)
+            db.close()
+            return result
+
+        def import_per_file(db, paths=bez_paths):
+            # Früherer Weg zum Vergleich: jede Datei einzeln lesen, ein commit je Profil
+            for path in paths:
+                for airfoil_name, coordinates, fit_error in airfoil_parser.read_airfoil_file(path):
+                    db.insert_or_update_airfoil(airfoil_name, coordinates)
+            db.close()
+
+        seconds, _ = measure(import_files, repeat, fresh_database)
+        record("import_airfoils_bulk", seconds, count)
+        seconds, _ = measure(import_per_file, repeat, fresh_database)
+        record("insert_or_update_airfoil per file", seconds, count)
+
+        def imported_database():
+            db, = fresh_database()
+            db.import_airfoils_bulk(bez_paths)
+            return db,
+
+        # Ohne NumPy lässt der Import die Kennwerte aus, die erste Abfrage rechnet sie nach
+        seconds, _ = measure(lambda db: db.ensure_descriptors() or db.close(), repeat, imported_database)
+        record("ensure_descriptors after import", seconds, count)
+        if workers > 1:
+            seconds, _ = measure(lambda db: import_files(db, workers=workers), repeat, fresh_database)
+            record(f"import_airfoils_bulk {workers} threads", seconds, count)
+
+        db = airfoil_database.sqlDatabase(database)
+        db.create_airfoil_table()
+        db.import_airfoils_bulk(bez_paths)
+        names = [sections[0][0] for sections in parsed]
+
+        seconds, _ = measure(lambda: db.search_airfoils("", None, airfoil_database.SEARCH_LIMIT), repeat)
+        record("search_airfoils first page", seconds, 1)
+        seconds, _ = measure(lambda: db.search_airfoils("", None, airfoil_database.SEARCH_LIMIT,
+                                                        {"thickness": (0.09, 0.11)}), repeat)
+        record("search_airfoils thickness filter", seconds, 1)
+        seconds, _ = measure(lambda: [db._load_airfoil_coordinates(name) for name in names], repeat)
+        record("get_airfoil_coordinates uncached", seconds, count)
+        seconds, _ = measure(lambda: [db.get_airfoil_coordinates(names[0]) for _ in range(count)], repeat)
+        record("get_airfoil_coordinates cached", seconds, count)
+        seconds, _ = measure(lambda: db.find_similar_airfoils(names[0], 10), repeat, lambda: db.invalidate_cache() or ())
+        record("find_similar_airfoils (build index)", seconds, count)
+        seconds, _ = measure(lambda: db.find_similar_airfoils(names[0], 10), repeat)
+        record("find_similar_airfoils (cached index)", seconds, count)
+        seconds, _ = measure(lambda: db.export_airfoils(os.path.join(folder, "export")), repeat)
+        record("export_airfoils bez", seconds, count)
+        db.close()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parser, placement planning and database without Fusion 360.")
+    parser.add_argument("--count", type=int, default=1000, help="airfoils per benchmark (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the best is reported (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=airfoil_database.IMPORT_WORKERS,
+                        help="threads for the parallel import benchmark (default: %(default)s)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    # Meldungen der Datenbank (z.B. beim Schließen) würden die Tabelle unterbrechen
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = run_benchmarks(args.count, args.repeat, args.workers)
+
+    print(f"numpy: {airfoil_bezier.np is not None}, airfoils: {args.count}, best of {args.repeat}")
+    for result in results:
+        per_item = f"{result['us_per_item']:10.1f} us/item" if result["us_per_item"] is not None else ""
+        print(f"{result['name']:40s} {result['seconds'] * 1000:10.2f} ms {per_item}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"numpy": airfoil_bezier.np is not None, "count": args.count, "repeat": args.repeat,
+                       "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Vergleich des Parsers in einem Durchgang (airfoil_parser) mit dem früheren Regex-Parser aus
+Foil.get_profile an einem Korpus einzelner bez.dat-Dateien.
+
+    python benchmarks/bench_parser.py --count 100000
+    python benchmarks/bench_parser.py --count 100000 --folder korpus/   (Korpus bleibt erhalten)
+
+Gemessen werden das Parsen der schon gelesenen Texte und der vollständige Weg mit Öffnen und
+Lesen jeder Datei, außerdem das Streamen einer Sammeldatei mit allen Profilen als Abschnitte.
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import airfoil_parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample.bez.dat")
+
+
+def legacy_profile(text):
+    # Foil.get_profile vor der Umstellung auf airfoil_parser, ohne Dateizugriff
+    muster = r"-?\d+\.\d{3,}"
+
+    find_koord = re.compile(fr"^\s*({muster})\s*({muster})\s*$", flags=re.MULTILINE)
+
+    for abschnitt in text.split("\n\n"):
+        koordinaten = find_koord.findall(abschnitt)
+
+        if not koordinaten:
+            continue
+
+    oben = [[float(koordinaten[i][0]), float(koordinaten[i][1]), 0.0] for i in
+            range(0, int(0.5 * (len(koordinaten) + 1)))]
+    unten = [[float(koordinaten[i][0]), float(koordinaten[i][1]), 0.0] for i in
+             range(int(0.5 * (len(koordinaten) - 1)), len(koordinaten))]
+
+    return list(reversed(oben)), unten
+
+
+def legacy_profile_file(file_path):
+    with open(file_path, encoding="utf-8") as file:
+        return legacy_profile(file.read())
+
+
+def profile(text):
+    # Gleiches Ergebnis wie legacy_profile mit dem neuen Parser
+    (airfoil_name, coordinates), = airfoil_parser.parse_bez_text(text, degree=9)
+    return airfoil_parser.split_polygon(coordinates, 9)
+
+
+def profile_file(file_path):
+    (airfoil_name, coordinates), = airfoil_parser.iter_bez_file(file_path, degree=9)
+    return airfoil_parser.split_polygon(coordinates, 9)
+
+
+def make_corpus(folder, count, seed=0):
+    rng = random.Random(seed)
+    with open(SAMPLE, encoding="utf-8") as file:
+        (airfoil_name, coordinates), = airfoil_parser.parse_bez_text(file.read())
+
+    paths = []
+    for i in range(count):
+        scale = 0.8 + 0.4 * rng.random()
+        path = os.path.join(folder, f"{i:06d}.bez.dat")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(airfoil_parser.format_bez_text(f"corpus {i:06d}", [(x, y * scale) for x, y in coordinates]))
+        paths.append(path)
+    return paths
+
+
+def timed(name, function, items):
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    print(f"{name:32s} {seconds:8.2f} s {seconds / items * 1e6:8.1f} us/file")
+    return seconds, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the single-pass bez.dat parser with the former regex parser.")
+    parser.add_argument("--count", type=int, default=100000, help="files in the corpus (default: %(default)s)")
+    parser.add_argument("--folder", help="keep the corpus in this folder and reuse it on the next run")
+    args = parser.parse_args(argv)
+
+    folder = args.folder or tempfile.mkdtemp(prefix="airfoil_corpus_")
+    os.makedirs(folder, exist_ok=True)
+    try:
+        paths = sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".bez.dat"))
+        if len(paths) != args.count:
+            for path in paths:
+                os.remove(path)
+            paths = make_corpus(folder, args.count)
+
+        texts = []
+        for path in paths:
+            with open(path, encoding="utf-8") as file:
+                texts.append(file.read())
+
+        print(f"corpus: {len(paths)} files in {folder}")
+        legacy_seconds, legacy = timed("regex, text", lambda: [legacy_profile(text) for text in texts], len(texts))
+        new_seconds, new = timed("single pass, text", lambda: [profile(text) for text in texts], len(texts))
+        print(f"{'speedup':32s} {legacy_seconds / new_seconds:8.2f} x")
+
+        same = all([(x, y) for x, y, z in top] == top_new and [(x, y) for x, y, z in bottom] == bottom_new
+                   for (top, bottom), (top_new, bottom_new) in zip(legacy, new))
+        print(f"{'same control points':32s} {same}")
+        if not same:
+            # Ein Vergleich mit einem Regex-Parser, der Punkte verliert, misst nichts
+            print("error: the parsers disagree on the corpus", file=sys.stderr)
+            return 1
+
+        legacy_seconds, _ = timed("regex, files", lambda: [legacy_profile_file(path) for path in paths], len(paths))
+        new_seconds, _ = timed("single pass, files", lambda: [profile_file(path) for path in paths], len(paths))
+        print(f"{'speedup':32s} {legacy_seconds / new_seconds:8.2f} x")
+
+        # Alle Profile als Abschnitte einer Datei, gelesen ohne sie ganz in den Speicher zu laden
+        collection = os.path.join(folder, "collection.txt")
+        with open(collection, "w", encoding="utf-8") as file:
+            file.writelines(text if text.endswith("\n") else text + "\n" for text in texts)
+        timed("single pass, one collection", lambda: sum(1 for _ in airfoil_parser.iter_bez_file(collection, 9)),
+              len(texts))
+        os.remove(collection)
+    finally:
+        if not args.folder:
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,10 +31,28 @@ yoben*9, yunten*9 = Abstand der Punkte an der Endleiste von der Wurzellinie (ggf
 """
 
 import adsk.core, adsk.fusion, adsk.cam, traceback
-import sqlite3
 import re
 import os
+import time
+import json
+import threading
 import os.path
+from collections import Counter
+
+try:
+    from . import airfoil_catalogue, airfoil_placement, airfoil_sketch
+    from .airfoil_database import (FIT_ERROR_WARNING, IMPORT_WORKERS, db_stats, default_catalogue_path,
+                                   default_database_path, parse_descriptor_filter, profiler, reset_database_stats,
+                                   sqlDatabase)
+    from .airfoil_profiler import PhaseProfiler
+except ImportError:
+    import airfoil_catalogue
+    import airfoil_placement
+    import airfoil_sketch
+    from airfoil_database import (FIT_ERROR_WARNING, IMPORT_WORKERS, db_stats, default_catalogue_path,
+                                  default_database_path, parse_descriptor_filter, profiler, reset_database_stats,
+                                  sqlDatabase)
+    from airfoil_profiler import PhaseProfiler
 
 COMMAND_ID = "Airfoil"
 
@@ -44,41 +62,254 @@ B2_BUTTON_ID = "delete selected airfoil"
 B2_BUTTON_NAME = "delete"
 B3_BUTTON_ID = "import all files from folder"
 B3_BUTTON_NAME = "import"
+B4_BUTTON_ID = "load more airfoils"
+B4_BUTTON_NAME = "more"
+B5_BUTTON_ID = "find similar airfoils"
+B5_BUTTON_NAME = "similar"
+B6_BUTTON_ID = "export airfoils"
+B6_BUTTON_NAME = "export"
+D2_EXPORT_FORMAT_ID = "export format"
 D1_DROPDOWN_ID = "Airfoils"
 D1_DROPDOWN_NAME = "Airfoils"
+F1_FILTER_ID = "filter airfoils"
+F1_FILTER_NAME = "filter"
+F2_DESCRIPTOR_FILTER_ID = "descriptor filter"
+F2_DESCRIPTOR_FILTER_NAME = "geometry"
+
+DROPDOWN_PAGE_SIZE = 100
+SIMILAR_AIRFOILS_SHOWN = 10
+
+# Export: Name im Dropdown -> file_format von sqlDatabase.export_airfoils
+EXPORT_FORMATS = {"bez.dat": "bez", "Selig points": "selig"}
+
+IMPORT_PROGRESS_EVENT_ID = "airfoil_import_progress"
+IMPORT_ERRORS_SHOWN = 20
 
 SE01_SELECTION1_COMMAND_ID = "optional points"
 ST02_INPUT_COMMAND_ID = "unique suffix"
 ST03_INPUT_COMMAND_ID = "driving dimension"
+CB01_INPUT_COMMAND_ID = "profile placement"
+CB02_INPUT_COMMAND_ID = "defer sketch compute"
+CB03_INPUT_COMMAND_ID = "remove deleted files"
+CB04_INPUT_COMMAND_ID = "export as zip"
+SE02_SECTION_PLANES_ID = "section planes"
+TB01_SECTIONS_ID = "wing sections"
 
 _handlers = []
 
-_user_parameters = {}
-
 ui = None
 app = adsk.core.Application.get()
 if app:
     ui = app.userInterface
 
 
-DATABASE = os.path.join(os.environ['USERPROFILE'], 'airfoil_data.db')
+DATABASE = default_database_path()
 
-try:
-    DATABASE = os.path.join(os.environ['USERPROFILE'], 'airfoil_data.db')
-except:
-    home_directory = os.path.expanduser( '~' )
-    DATABASE = os.path.join(home_directory, "airfoil_data.db" )
+PROFILE_REPORT = os.path.join(os.path.dirname(DATABASE), 'airfoil_profile.json')
+# Eine JSON-Zeile je Start mit den Zeiten bis zum Dialog und bis zur gefüllten Profilliste
+STARTUP_LOG = os.path.join(os.path.dirname(DATABASE), 'airfoil_startup.jsonl')
+# Alle beim Import abgelehnten Profile und Dateien samt Gründen, neu geschrieben nach jedem
+# Import mit Ablehnungen
+QUARANTINE_REPORT = os.path.join(os.path.dirname(DATABASE), 'airfoil_quarantine.json')
 
+# Schreibgeschützter Katalog einer gemeinsamen Bibliothek (siehe airfoil_catalogue), wird
+# zusätzlich zur Datenbank gelesen, wenn die Datei existiert. AIRFOIL_CATALOGUE kann auf eine
+# Datei im Netzwerk zeigen.
+CATALOGUE = default_catalogue_path(DATABASE)
 
-product = app.activeProduct
-design = adsk.fusion.Design.cast(product)
-root = design.rootComponent
-sketches = root.sketches
-planes = root.constructionPlanes
 
 global foil_id
 foil_id = ""
 
+global dropdown_filter, dropdown_ranges, dropdown_last_name
+dropdown_filter = ""
+dropdown_ranges = {}
+dropdown_last_name = None
+
+_import_job = None
+
+# Eine Datenbankverbindung je Add-In-Sitzung, geschlossen im FoilCommandDestroyHandler
+_database = None
+
+
+def get_database():
+    global _database
+    if _database is None:
+        catalogue = None
+        if os.path.exists(CATALOGUE):
+            try:
+                catalogue = airfoil_catalogue.AirfoilCatalogue(CATALOGUE)
+            except (OSError, ValueError) as e:
+                print(f"Katalog {CATALOGUE} konnte nicht geöffnet werden: {e}")
+        _database = sqlDatabase(DATABASE, catalogue)
+        _database.create_airfoil_table()
+    return _database
+
+
+def close_database():
+    global _database
+    if _database is not None:
+        print(f"Datenbankzugriffe: {db_stats}, Koordinaten-Cache: {_database.cache_info()}")
+        _database.close()
+        _database = None
+
+
+
+def load_dropdown_page(list_items, clear=False):
+    # Lädt die nächste Seite der zum Filter passenden Profile (Keyset-Pagination) in das Dropdown
+    global dropdown_last_name
+
+    if clear:
+        list_items.clear()
+        dropdown_last_name = None
+
+    names = get_database().search_airfoils(dropdown_filter, dropdown_last_name, DROPDOWN_PAGE_SIZE, dropdown_ranges)
+    for name in names:
+        list_items.add(name, False, '')
+
+    if names:
+        dropdown_last_name = names[-1]
+    return names
+
+
+_profiler = profiler
+_profiler.counters["api_calls"] = airfoil_sketch.api_calls
+
+# Zeiten von run() bis zum angezeigten Dialog und zur gefüllten Profilliste
+_startup = PhaseProfiler()
+_startup.enabled = True
+_startup.counters["database"] = db_stats
+
+
+def log_startup():
+    # Hängt die Startzeiten samt Größe der Zeitleiste an STARTUP_LOG an
+    report = _startup.report()
+    try:
+        timeline_count = airfoil_sketch.get_design().timeline.count
+    except:
+        timeline_count = None
+
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "time_to_dialog": sum(entry["seconds"] for name, entry in report["phases"].items() if name != "fill dropdown"),
+        "total_seconds": report["total_seconds"],
+        "phases": report["phases"],
+        "database": report["database"],
+        "timeline_count": timeline_count,
+    }
+    try:
+        with open(STARTUP_LOG, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        print(f"Startzeiten konnten nicht geschrieben werden: {e}")
+    return entry
+
+
+def start_folder_import(folder, remove_missing=False):
+    global _import_job
+
+    if _import_job is not None and _import_job.is_alive():
+        ui.messageBox("An import is already running.")
+        return
+
+    progress_dialog = ui.createProgressDialog()
+    progress_dialog.cancelButtonText = 'Cancel'
+    progress_dialog.isBackgroundTranslucent = False
+    progress_dialog.isCancelButtonShown = True
+    progress_dialog.show('Import airfoils', 'File %v of %m', 0, 1, 0)
+
+    _import_job = FolderImportThread(folder, remove_missing, progress_dialog)
+    _import_job.start()
+
+
+def finish_folder_import(job):
+    # Läuft im UI-Thread, sobald der Hintergrundimport fertig oder abgebrochen ist
+    global _import_job
+
+    job.join()
+    job.progress_dialog.hide()
+    _import_job = None
+
+    message = import_result_message(job.result)
+
+    try:
+        load_dropdown_page(dropdown_items, clear=True)
+    except:
+        pass
+
+    ui.messageBox(message)
+
+
+def import_result_message(result):
+    # Meldung zum Ergebnis von import_airfoils_bulk bzw. sync_folder. Gab es Ablehnungen, wird
+    # QUARANTINE_REPORT mit dem vollständigen Inhalt der Quarantäne neu geschrieben.
+    message = (f'Imported: {result["imported"]}, updated: {result["updated"]}, unchanged: {result["skipped"]}, '
+               f'removed: {result.get("removed", 0)}, failed: {result["failed"]}, '
+               f'fitted from point files: {len(result["fitted"])}')
+    if result["cancelled"]:
+        message = 'Import cancelled, files processed so far were saved.\n' + message
+    for file, error in result["errors"][:IMPORT_ERRORS_SHOWN]:
+        message += f'\n{os.path.basename(file)}: {error}'
+    if len(result["errors"]) > IMPORT_ERRORS_SHOWN:
+        message += f'\n... and {len(result["errors"]) - IMPORT_ERRORS_SHOWN} more'
+
+    poor_fits = sorted((fit for fit in result["fitted"] if fit[1] > FIT_ERROR_WARNING), key=lambda fit: -fit[1])
+    for name, error in poor_fits[:IMPORT_ERRORS_SHOWN]:
+        message += f'\n{name}: fit error {error:.2%} of chord'
+
+    if result.get("quarantined"):
+        try:
+            count = get_database().write_quarantine_report(QUARANTINE_REPORT)
+            message += f'\n\n{count} rejected airfoils and files in quarantine, see {QUARANTINE_REPORT}'
+        except OSError as e:
+            message += f'\n\nQuarantine report could not be written: {e}'
+    return message
+
+
+def cancel_folder_import():
+    # Bricht einen laufenden Import ab (z.B. beim Schließen des Dialogs) und wartet auf das Ende
+    global _import_job
+
+    if _import_job is not None:
+        _import_job.cancel_event.set()
+        _import_job.join()
+        _import_job.progress_dialog.hide()
+        _import_job = None
+    app.unregisterCustomEvent(IMPORT_PROGRESS_EVENT_ID)
+
+
+def parse_sections(text, section_planes=()):
+    # Eine Zeile je Rippe: "airfoil; chord; suffix; offset"
+    # chord = Zahl in mm oder Parameter/Ausdruck wie bei "driving dimension",
+    # offset = Abstand in mm von der xy-Ebene, nur nötig ohne gewählte Ebene für diese Zeile
+    sections = []
+    lines = [line for line in text.splitlines() if line.strip()]
+
+    for i, line in enumerate(lines):
+        fields = [field.strip() for field in line.split(";")]
+        if len(fields) < 3:
+            raise ValueError(f"section {i + 1}: expected 'airfoil; chord; suffix; offset', got '{line}'")
+
+        airfoil_name, chord, suffix = fields[:3]
+        try:
+            chord = f"{float(chord)} mm"
+        except ValueError:
+            pass
+
+        plane = section_planes[i] if i < len(section_planes) else None
+        if plane is None and (len(fields) < 4 or not fields[3]):
+            raise ValueError(f"section {i + 1}: no plane selected and no offset given")
+
+        sections.append({
+            "airfoil": airfoil_name,
+            "chord": chord,
+            "suffix": suffix,
+            "plane": plane,
+            "offset": float(fields[3]) if plane is None else 0.0,
+        })
+
+    return sections
+
 
 class FoilCommandExecuteHandler(adsk.core.CommandEventHandler):
     def __init__(self):
@@ -109,8 +340,22 @@ class FoilCommandExecuteHandler(adsk.core.CommandEventHandler):
             input2 = inputs[2]
             input3 = inputs[3]
 
+            _profiler.enabled = inputs.itemById(CB01_INPUT_COMMAND_ID).value
+
+            defer_compute = inputs.itemById(CB02_INPUT_COMMAND_ID).value
+            sections_text = inputs.itemById(TB01_SECTIONS_ID).text
+
             foil = Foil()
-            foil.Execute(nose, tail, input2.value, input3.value)
+            if sections_text.strip():
+                planes_input = inputs.itemById(SE02_SECTION_PLANES_ID)
+                section_planes = [planes_input.selection(i).entity for i in range(planes_input.selectionCount)]
+                foil.ExecuteSections(parse_sections(sections_text, section_planes), defer_compute)
+            else:
+                foil.Execute(nose, tail, input2.value, input3.value, defer_compute)
+
+            if _profiler.enabled:
+                _profiler.write_report(PROFILE_REPORT)
+                ui.messageBox(f'{_profiler.summary()}\n\nReport: {PROFILE_REPORT}')
 
         except:
             if ui:
@@ -123,7 +368,7 @@ class FoilCommandInputChangedHandler(adsk.core.InputChangedEventHandler):
         super().__init__()
     def notify(self, args):
         
-        global foil_id
+        global foil_id, dropdown_filter, dropdown_ranges
         
         try:
             eventArgs = adsk.core.InputChangedEventArgs.cast(args)
@@ -135,7 +380,7 @@ class FoilCommandInputChangedHandler(adsk.core.InputChangedEventHandler):
 
                 dlg = ui.createFileDialog()
                 dlg.title = 'Open bez.dat File'
-                dlg.filter = 'Airfoil bez.dat files (*.dat);;All Files (*.*)'
+                dlg.filter = 'Airfoil bez.dat or coordinate files (*.dat);;All Files (*.*)'
                 if dlg.showOpen() != adsk.core.DialogResults.DialogOK:
                     return
 
@@ -146,60 +391,100 @@ class FoilCommandInputChangedHandler(adsk.core.InputChangedEventHandler):
                 abs_path = os.path.abspath(file_path)
                 return abs_path
             
-            def update_dropdown_items():
+            def update_dropdown_items(clear=True):
 
-                DROPDOWN_ITEMS: adsk.core.ListItems = eventArgs.inputs.itemById('Airfoils').listItems
-                DROPDOWN_ITEMS.clear()
-
-                airfoil_list = db.get_sorted_airfoils()
-               
-                for i in range(len(airfoil_list)):
-                    DROPDOWN_ITEMS.add(str(airfoil_list[i]), True, '')
-                
-                if len(airfoil_list) == 0:
-                    DROPDOWN_ITEMS.classType
+                DROPDOWN_ITEMS: adsk.core.ListItems = eventArgs.inputs.itemById(D1_DROPDOWN_ID).listItems
+                load_dropdown_page(DROPDOWN_ITEMS, clear)
 
-            def get_input_path_filelist():
+            def get_input_folder():
                                  
                 folderDlg = ui.createFolderDialog()
                 folderDlg.title = 'Choose Folder' 
                 dlgResult = folderDlg.showDialog()
-                if dlgResult == adsk.core.DialogResults.DialogOK:
-                    foldername = folderDlg.folder
-                path_sel = os.path.abspath(foldername)
-                files = os.listdir(path_sel)
-                files_clean = []
-                paths = []
-                for f in files:
-                    if f.endswith("dat") or f.endswith("bez"):
-                        files_clean.append(f)
-                        paths.append(os.path.join(path_sel, f))
-
-                return paths, files_clean
+                if dlgResult != adsk.core.DialogResults.DialogOK:
+                    return None
+                return os.path.abspath(folderDlg.folder)
   
             # onInputChange for click Button
             if cmdInput.id == B1_BUTTON_ID:
                 
-                db = sqlDatabase(DATABASE)
+                db = get_database()
 
                 filename = get_input_filename()
-                                               
-                formatted_path = format_file_path(filename)
-                db.create_airfoil_table()
-                db.read_airfoil_from_bez(formatted_path)
+                if filename:
+                    formatted_path = format_file_path(filename)
+                    result = db.read_airfoil_from_bez(formatted_path)
+                    if result["failed"] or any(error > FIT_ERROR_WARNING for name, error in result["fitted"]):
+                        ui.messageBox(import_result_message(result))
 
-                update_dropdown_items()
+                    update_dropdown_items()
     
+            if cmdInput.id == F1_FILTER_ID:
+
+                dropdown_filter = cmdInput.value
+                update_dropdown_items()
+
+            if cmdInput.id == F2_DESCRIPTOR_FILTER_ID:
+
+                try:
+                    dropdown_ranges = parse_descriptor_filter(cmdInput.value)
+                except ValueError as e:
+                    ui.messageBox(str(e))
+                    return
+                update_dropdown_items()
+
+            if cmdInput.id == B4_BUTTON_ID:
+
+                update_dropdown_items(clear=False)
+
             if cmdInput.id == D1_DROPDOWN_ID:
   
                 objectItems = cmdInput.selectedItem
                 foil_id = objectItems.name
 
 
+            if cmdInput.id == B5_BUTTON_ID:
+
+                if not foil_id:
+                    ui.messageBox("Select an airfoil first.")
+                    return
+
+                matches = get_database().find_similar_airfoils(foil_id, SIMILAR_AIRFOILS_SHOWN)
+
+                DROPDOWN_ITEMS: adsk.core.ListItems = inputs.itemById(D1_DROPDOWN_ID).listItems
+                DROPDOWN_ITEMS.clear()
+                DROPDOWN_ITEMS.add(foil_id, True, '')
+                for name, distance in matches:
+                    DROPDOWN_ITEMS.add(name, False, '')
+
+                ui.messageBox(f"Airfoils similar to '{foil_id}':\n"
+                              + "\n".join(f"{name}: {distance:.4f}" for name, distance in matches))
+
+            if cmdInput.id == B6_BUTTON_ID:
+
+                file_format = EXPORT_FORMATS[inputs.itemById(D2_EXPORT_FORMAT_ID).selectedItem.name]
+
+                archive = inputs.itemById(CB04_INPUT_COMMAND_ID).value
+                if archive:
+                    dlg = ui.createFileDialog()
+                    dlg.title = 'Export airfoils'
+                    dlg.filter = 'Zip archive (*.zip)'
+                    if dlg.showSave() != adsk.core.DialogResults.DialogOK:
+                        return
+                    target = dlg.filename
+                    if not target.lower().endswith(".zip"):
+                        target += ".zip"
+                else:
+                    target = get_input_folder()
+                    if not target:
+                        return
+
+                count = get_database().export_airfoils(target, file_format, archive)
+                ui.messageBox(f"{count} airfoils exported to {target}")
+
             if cmdInput.id == B2_BUTTON_ID:
                 
-                db = sqlDatabase(DATABASE)
-                db.create_airfoil_table()
+                db = get_database()
                 db.delete_airfoil(foil_id)
                 
                 update_dropdown_items()
@@ -207,237 +492,170 @@ class FoilCommandInputChangedHandler(adsk.core.InputChangedEventHandler):
 
             if cmdInput.id == B3_BUTTON_ID:
                 
-                file_paths, files = get_input_path_filelist()
-                db = sqlDatabase(DATABASE)
-                db.create_airfoil_table()
-
+                folder = get_input_folder()
 
-                for file in file_paths:
-                    formatted_path = format_file_path(file)
-                    db.read_airfoil_from_bez(formatted_path)
-
-                update_dropdown_items()
-                ui.messageBox(f'Imported airfoils: {files}')
+                if folder:
+                    start_folder_import(folder, inputs.itemById(CB03_INPUT_COMMAND_ID).value)
 
         except:
             ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
 
 
-class FoilCommandDestroyHandler(adsk.core.CommandEventHandler):
-    def __init__(self):
-        super().__init__()
+class FolderImportThread(threading.Thread):
+    # Ordnerimport im Hintergrund mit eigener Datenbankverbindung, meldet den Fortschritt
+    # über das Custom Event IMPORT_PROGRESS_EVENT_ID an den Fusion-UI-Thread
+    def __init__(self, folder, remove_missing, progress_dialog):
+        super().__init__(daemon=True)
+        self.folder = folder
+        self.remove_missing = remove_missing
+        self.progress_dialog = progress_dialog
+        self.cancel_event = threading.Event()
+        self.result = None
 
-    def notify(self, args):
+    def run(self):
         try:
-            adsk.terminate()
-        except:
-            if ui:
-                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+            db = sqlDatabase(DATABASE)
+            try:
+                self.result = db.sync_folder(self.folder, self.remove_missing, workers=IMPORT_WORKERS,
+                                             progress=self.report, cancel_event=self.cancel_event)
+            finally:
+                db.close()
+        except Exception as e:
+            self.result = {"imported": 0, "updated": 0, "skipped": 0, "removed": 0, "failed": 1,
+                           "errors": [(self.folder, str(e))], "quarantined": 0, "fitted": [], "cancelled": False}
+        app.fireCustomEvent(IMPORT_PROGRESS_EVENT_ID, json.dumps({"done": True}))
 
+    def report(self, processed, total):
+        app.fireCustomEvent(IMPORT_PROGRESS_EVENT_ID, json.dumps({"processed": processed, "total": total}))
 
-class Foil:
-    def Execute(self, nose, tail, suf, param_drive):
 
-        wurzeltiefe = 10   # Wird bei Bamaßung geändert, Units sind hier immer cm
-        
-        if nose != 0:
-            sketchT = nose.parentSketch
-            point_nose = nose
-            halb_ausrichten = True
-        else:
-            sketchT = sketches.add(root.xYConstructionPlane)
-            halb_ausrichten = False
-
-        if tail != 0:
-            point_tail = tail
-            ausrichten = True
-        else:
-            ausrichten = False
-
-        if ausrichten is True:
-            line_sehne = sketchT.sketchCurves.sketchLines.addByTwoPoints(point_nose, point_tail)
-            line_sehne.isConstruction = False
-            wurzeltiefe = line_sehne.length
-    
-        if str(suf).isalpha() is False:
-            ui.messageBox("suffix contains signs other than alphanum")
-        else:
-            pass
+class FolderImportProgressHandler(adsk.core.CustomEventHandler):
+    def __init__(self):
+        super().__init__()
 
-        linex = sketchT.sketchCurves.sketchLines.addByTwoPoints(adsk.core.Point3D.create(0, 0, 0), adsk.core.Point3D.create(100, 0, 0))
-        linex.isConstruction = True
-        linex.isFixed = True
-        
-        liney = sketchT.sketchCurves.sketchLines.addByTwoPoints(adsk.core.Point3D.create(0, 0, 0), adsk.core.Point3D.create(0, 1, 0))
-        liney.isConstruction = True
-        liney.isFixed = True
-
-        def createParam(design, name, value, units, comment):
-            userValue = adsk.core.ValueInput.createByReal(value)
-            newParam = design.userParameters.add(name, userValue, units, comment)
-            _user_parameters[name] = newParam
-
-        dim = sketchT.sketchDimensions
-        driver_name = "root" + str(suf)
-        driver_val = wurzeltiefe
-
-        controlPoints1 = []
-        controlPoints2 = []
-
-        # create "random" sketchPoints to get a degree 3 spline (api generates only 3 or 5 degree)
-        p1 = adsk.core.Point3D.create(0.1, 1, 0)
-        p2 = adsk.core.Point3D.create(0.33, 1.2, 0)
-        p3 = adsk.core.Point3D.create(0.66, 1.2, 0)
-        p4 = adsk.core.Point3D.create(0.1, 1, 0)
-
-        p5 = adsk.core.Point3D.create(0.1, -1, 0)
-        p6 = adsk.core.Point3D.create(0.33, -1.2, 0)
-        p7 = adsk.core.Point3D.create(0.66, -1.2, 0)
-        p8 = adsk.core.Point3D.create(0.1, -1, 0)
-
-        controlPoints1.append(p1)
-        controlPoints1.append(p2)
-        controlPoints1.append(p3)
-        controlPoints1.append(p4)
-
-        controlPoints2.append(p5)
-        controlPoints2.append(p6)
-        controlPoints2.append(p7)
-        controlPoints2.append(p8)
-
-        # sketch curves
-        curve1 = sketchT.sketchCurves.sketchControlPointSplines.add(controlPoints1, 3)
-        curve2 = sketchT.sketchCurves.sketchControlPointSplines.add(controlPoints2, 3)
-
-        # set curves to degree 9, this adds up to a sum of 10 points each
-        curve1.degree = 9
-        curve2.degree = 9
-
-        coll1 = adsk.core.ObjectCollection.create()
-        coll2 = adsk.core.ObjectCollection.create()
-        coll3 = adsk.core.ObjectCollection.create()
-
-        for i in range(len(controlPoints1)):
-            coll1.add(controlPoints1[i])
-            controlPoints1[i].isFixed = True
-            coll3.add(controlPoints1[i])
-            coll2.add(controlPoints2[i])
-            coll3.add(controlPoints2[i])
-            controlPoints2[i].isFixed = True
-        
-        createParam(design, driver_name, driver_val, "", "root" + str(suf))
-        _user_parameters[driver_name].isFavorite = True
-        createParam(design, "invx" + str(suf), 1, "", "switch to bottom")
-        _user_parameters["invx" + str(suf)].isFavorite = True
-        createParam(design, "invy" + str(suf), 1, "", "switch to bottom1")
-        _user_parameters["invy" + str(suf)].isFavorite = True
-
-        def create_parameters(data, side):
-            name_collection = []
-            
-            for i in range(0, 10):
-                x = "xdat" + str(side) + str(suf) + str(i)
-                y = "ydat" + str(side) + str(suf) + str(i)
-                px = float(data[i][0])
-                py = float(data[i][1]) ############
-                createParam(design, str(x), px, "mm", "")
-                createParam(design, str(y), py, "mm", "")
-                xc = "x" + str(side) + str(suf) + str(i)
-                yc = "y" + str(side) + str(suf) + str(i)
-                name_collection.append((xc, yc))
-                pxc = float(data[i][0]) * driver_val
-                pyc = float(data[i][1]) * driver_val
-                createParam(design, str(xc), pxc, "mm", "")
-                _user_parameters[str(xc)].expression = str(x) + " * root" + str(suf) + "*invy" + str(suf)
-                createParam(design, str(yc), pyc, "mm", "")
-                _user_parameters[str(yc)].expression = str(y) + "  * root" + str(suf) + "*invx" + str(suf)
-                if i == 9:
-                    _user_parameters[str(yc)].isFavorite = True
-
-            return name_collection
+    def notify(self, args):
+        try:
+            job = _import_job
+            if job is None:
+                return
 
-       
-        db = sqlDatabase(DATABASE)
-        oben, unten = sqlDatabase.get_airfoil_coordinates(db, str(foil_id))
-        #ui.messageBox(str(oben))
+            info = json.loads(args.additionalInfo)
 
-        names_oben = create_parameters(oben, "oben")
-        names_unten = create_parameters(unten, "unten")
+            if job.progress_dialog.wasCancelled:
+                job.cancel_event.set()
 
-        textPoint = adsk.core.Point3D.create(0, 1, 0)
+            if "processed" in info:
+                job.progress_dialog.maximumValue = info["total"]
+                job.progress_dialog.progressValue = info["processed"]
 
-        def dim_pointsx(coll, names):
+            if info.get("done"):
+                finish_folder_import(job)
 
-            for i in range(0, 10):
-                coll.controlPoints[i].isFixed = False
-                dim.addOffsetDimension(liney, coll.controlPoints[i], textPoint, True)                 
-                dim[-1].parameter.expression = _user_parameters[names[i][0]].name
-                coll.controlPoints[i].isFixed = True
-               
-        def dim_pointsy(coll, names):
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
-            for i in range(0, 10):
-                coll.controlPoints[i].isFixed = False
-                dim.addOffsetDimension(linex, coll.controlPoints[i], textPoint, True)
-                dim[-1].parameter.expression = _user_parameters[names[i][1]].name
 
-        dim_pointsx(curve2, names_unten)
-        dim_pointsy(curve2, names_unten)
-        dim_pointsx(curve1, names_oben)
-        dim_pointsy(curve1, names_oben)
+class FoilCommandDestroyHandler(adsk.core.CommandEventHandler):
+    def __init__(self):
+        super().__init__()
 
-        linex.isFixed = False
-        liney.isFixed = False
+    def notify(self, args):
+        try:
+            cancel_folder_import()
+            close_database()
+            adsk.terminate()
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
-        sketchT.geometricConstraints.addCoincident(liney.startSketchPoint, curve1.controlFrameLines[0].startSketchPoint)
-        sketchT.geometricConstraints.addCoincident(liney.endSketchPoint, curve1.controlFrameLines[0].endSketchPoint)
 
-        liney.deleteMe
+class Foil:
+    def ExecuteSections(self, sections, defer_compute=True):
+        # Platziert mehrere Rippen in einem Befehl, jede in einer eigenen Skizze auf ihrer Ebene.
+        # Alle Profile werden vorab einmal gelesen, danach kommen sie aus dem Cache.
+        db = get_database()
+        missing = sorted({section["airfoil"] for section in sections
+                          if db.get_airfoil_coordinates(section["airfoil"])[0] is None})
+        if missing:
+            ui.messageBox(f"Airfoils not found in database: {missing}")
+            return
+
+        # Die Suffixe benennen die Parameter jeder Rippe; ein Fehler erst bei der n-ten Rippe
+        # ließe die vorherigen halb fertig im Design zurück
+        suffixes = [section["suffix"] for section in sections]
+        problems = []
+        duplicates = sorted({suffix for suffix in suffixes if suffixes.count(suffix) > 1})
+        if duplicates:
+            problems.append(f"Suffixes used more than once: {duplicates}")
+        invalid = [suffix for suffix in suffixes if not airfoil_placement.valid_suffix(suffix)]
+        if invalid:
+            problems.append(f"Suffixes may contain letters only: {invalid}")
+        existing = [suffix for suffix in dict.fromkeys(suffixes) if airfoil_placement.valid_suffix(suffix)
+                    and airfoil_sketch.find_parameter(airfoil_placement.driver_name(suffix))]
+        if existing:
+            problems.append(f"Airfoils with these suffixes already exist in the design: {existing}")
+        if problems:
+            ui.messageBox("\n".join(problems))
+            return
+
+        root = airfoil_sketch.get_design().rootComponent
+        planes = root.constructionPlanes
+
+        # Ein Bericht für alle Rippen: Phasen und Fusion-API-Aufrufe werden aufsummiert
+        _profiler.start()
+        batch_calls = Counter()
+        _profiler.counters["api_calls"] = batch_calls
+        for section in sections:
+            plane = section["plane"]
+            if plane is None:
+                plane_input = planes.createInput()
+                plane_input.setByOffset(root.xYConstructionPlane, adsk.core.ValueInput.createByString(f'{section["offset"]} mm'))
+                plane = planes.add(plane_input)
+            sketch = root.sketches.add(plane)
+            _profiler.lap("section plane")
+
+            self.Execute(0, 0, section["suffix"], section["chord"], defer_compute,
+                         airfoil_name=section["airfoil"], sketch=sketch, batch=True)
+            batch_calls.update(airfoil_sketch.api_calls)
+
+    def Execute(self, nose, tail, suf, param_drive, defer_compute=True, airfoil_name=None, sketch=None, batch=False):
+        # batch: Teil von ExecuteSections, das den Profiler einmal für alle Rippen startet
+        if not batch:
+            _profiler.start()
+            _profiler.counters["api_calls"] = airfoil_sketch.api_calls
+
+        def load_coordinates():
+            name = str(foil_id if airfoil_name is None else airfoil_name)
+            top_r, bottom = get_database().get_airfoil_coordinates(name)
+            if top_r is None:
+                ui.messageBox(f"Airfoil '{name}' not found in database")
+            return top_r, bottom
+
+        airfoil_sketch.place_airfoil(nose, tail, suf, param_drive, load_coordinates, _profiler, defer_compute, sketch)
 
-        sketchT.geometricConstraints.addCoincident(liney.startSketchPoint, linex.startSketchPoint)
-        dim.addAngularDimension(linex, liney, textPoint, True)
+       
+class FoilCommandActivateHandler(adsk.core.CommandEventHandler):
+    # Der Dialog ist sichtbar: erst jetzt Datenbank öffnen und die erste Seite der Profilliste laden
+    def __init__(self):
+        super().__init__()
+
+    def notify(self, args):
+        try:
+            # activate kommt auch, wenn der Befehl nach einem anderen wieder aktiv wird
+            if not _startup.enabled:
+                return
+            _startup.lap("show dialog")
+            reset_database_stats()
+            load_dropdown_page(dropdown_items, clear=True)
+            _startup.lap("fill dropdown")
+            log_startup()
+            _startup.enabled = False
+        except:
+            ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
-        dim[-1].parameter.expression = "90 deg"
-        
-        if halb_ausrichten is True:
-            sketchT.geometricConstraints.addCoincident(liney.startSketchPoint,point_nose)
-        
-        if ausrichten is True:
-            dim.addDistanceDimension(linex.endSketchPoint, point_tail, 0, textPoint, True)
-            dim[-1].value = 0
-        
-        if param_drive != "":
-            _user_parameters[str(driver_name)].expression = str(param_drive) + " * 0.1 / mm"
-            _user_parameters[str(driver_name)].isFavorite = True
-            for parameter in design.allParameters:
-                if parameter.name == str(param_drive):
-                    parameter.isFavorite = True
- 
-        if ausrichten is False:
-            if param_drive == "":
-                dim.addDistanceDimension(linex.endSketchPoint, linex.startSketchPoint, 0, textPoint, True)
-                dim[-1].value = 10
-                dim[-1].parameter.name = "wurzeltiefe" + str(suf)
-                for parameter in design.allParameters:
-                    if parameter.name == "wurzeltiefe" + str(suf):
-                        parameter.isFavorite = True
-                        temp = "root" + str(suf)
-                        _user_parameters[str(temp)].expression = "wurzeltiefe" + str(suf) + " * 0.1 / mm"
-                        _user_parameters[str(temp)].isFavorite = False
-            else:
-                _user_parameters[str(driver_name)].expression = str(param_drive) + " * 0.1 / mm"
-                _user_parameters[str(driver_name)].isFavorite = True
-                for parameter in design.allParameters:
-                    if parameter.name == str(param_drive):
-                        parameter.isFavorite = True
-                        dim.addDistanceDimension(linex.endSketchPoint, linex.startSketchPoint, 0, textPoint, True)
-                        dim[-1].parameter.name = "wurzeltiefe" + str(suf)                     
-                        for parameter in design.allParameters:
-                            if parameter.name == "wurzeltiefe" + str(suf):
-                                parameter.expression = str(param_drive) + "  / mm"
 
-       
 class FoilCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
     def __init__(self):
         super().__init__()
@@ -445,7 +663,7 @@ class FoilCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
     def notify(self, args: adsk.core.CommandEventArgs):
         try:
 
-            global dropdown_items
+            global dropdown_items, dropdown_filter, dropdown_ranges
 
 
             cmd = adsk.core.Command.cast(args.command)
@@ -454,6 +672,10 @@ class FoilCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             args.command.execute.add(onExecute)
             _handlers.append(onExecute)
 
+            onActivate = FoilCommandActivateHandler()
+            cmd.activate.add(onActivate)
+            _handlers.append(onActivate)
+
             onDestroy = FoilCommandDestroyHandler()
             args.command.destroy.add(onDestroy)
             _handlers.append(onDestroy)
@@ -472,6 +694,8 @@ class FoilCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             i1.setSelectionLimits(0, 2)
             i2 = tab1ChildInputs.addStringValueInput(ST02_INPUT_COMMAND_ID, ST02_INPUT_COMMAND_ID, "suffix")
             i3 = tab1ChildInputs.addStringValueInput(ST03_INPUT_COMMAND_ID, ST03_INPUT_COMMAND_ID, "")
+            tab1ChildInputs.addBoolValueInput(CB01_INPUT_COMMAND_ID, CB01_INPUT_COMMAND_ID, True, "", False)
+            tab1ChildInputs.addBoolValueInput(CB02_INPUT_COMMAND_ID, CB02_INPUT_COMMAND_ID, True, "", True)
             
             inst_text1 = ""
             tab1ChildInputs.addTextBoxCommandInput('fullWidth_textBox', '', inst_text1, 12, True)
@@ -482,23 +706,38 @@ class FoilCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             tab2ChildInputs.addBoolValueInput(B1_BUTTON_ID, B1_BUTTON_NAME, False, "", True)
             tab2ChildInputs.addBoolValueInput(B2_BUTTON_ID, B2_BUTTON_NAME, False, "", True)
             tab2ChildInputs.addBoolValueInput(B3_BUTTON_ID, B3_BUTTON_NAME, False, "", True)
+            tab2ChildInputs.addBoolValueInput(CB03_INPUT_COMMAND_ID, CB03_INPUT_COMMAND_ID, True, "", False)
 
+            tab2ChildInputs.addStringValueInput(F1_FILTER_ID, F1_FILTER_NAME, "")
+            tab2ChildInputs.addStringValueInput(F2_DESCRIPTOR_FILTER_ID, F2_DESCRIPTOR_FILTER_NAME, "")
             dropdownInput = tab2ChildInputs.addDropDownCommandInput(D1_DROPDOWN_ID, D1_DROPDOWN_NAME, adsk.core.DropDownStyles.TextListDropDownStyle)
             dropdown_items = dropdownInput.listItems
             dropdownInput.maxVisibleItems = 20
             dropdownInput.isFullWidth
 
-            db = sqlDatabase(DATABASE)
+            tab2ChildInputs.addBoolValueInput(B4_BUTTON_ID, B4_BUTTON_NAME, False, "", True)
+            tab2ChildInputs.addBoolValueInput(B5_BUTTON_ID, B5_BUTTON_NAME, False, "", True)
+
+            exportFormatInput = tab2ChildInputs.addDropDownCommandInput(D2_EXPORT_FORMAT_ID, D2_EXPORT_FORMAT_ID, adsk.core.DropDownStyles.TextListDropDownStyle)
+            for i, name in enumerate(EXPORT_FORMATS):
+                exportFormatInput.listItems.add(name, i == 0, '')
+            tab2ChildInputs.addBoolValueInput(CB04_INPUT_COMMAND_ID, CB04_INPUT_COMMAND_ID, True, "", False)
+            tab2ChildInputs.addBoolValueInput(B6_BUTTON_ID, B6_BUTTON_NAME, False, "", True)
 
-            db.create_airfoil_table() 
-            airfoil_list = db.get_sorted_airfoils()
-           
-            for i in range(len(airfoil_list)):
-                dropdown_items.add(str(airfoil_list[i]), False, '')
+            dropdown_filter = ""
+            dropdown_ranges = {}
 
             inst_text2 = ""
             tab2ChildInputs.addTextBoxCommandInput('fullWidth_textBox', '', inst_text2, 12, True)
 
+            tabCmdInput4 = inputs.addTabCommandInput('tab_4', 'Wing')
+            tab4ChildInputs = tabCmdInput4.children
+
+            i4 = tab4ChildInputs.addSelectionInput(SE02_SECTION_PLANES_ID, SE02_SECTION_PLANES_ID, "select section planes")
+            i4.addSelectionFilter(adsk.core.SelectionCommandInput.ConstructionPlanes)
+            i4.setSelectionLimits(0, 0)
+            tab4ChildInputs.addTextBoxCommandInput(TB01_SECTIONS_ID, TB01_SECTIONS_ID, "", 12, False)
+
             tabCmdInput3 = inputs.addTabCommandInput('tab_3', 'Info')
             tab3ChildInputs = tabCmdInput3.children
             
@@ -507,11 +746,14 @@ class FoilCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
                             <p>put in a unique suffix (only letters)</p> \
                             <p>put in a driving parameter like d1 if you wish.</p> \
                             <p>Select degree 9 *.bez.dat (10 Points each side) generated with <a href="https://github.com/marc-frank/BezierAirfoilDesigner">BezierAirfoilDesigner</a> by M. Frank from Database</p>
+                            <p>Wing: one section per line "airfoil; chord; suffix; offset" (chord in mm or a parameter, offset in mm from the xy-plane). The n-th selected plane replaces the offset of the n-th line.</p>
                         """
             tab3ChildInputs.addTextBoxCommandInput('fullWidth_textBox', '', inst_text3, 18, True)
 
             textinp = "suffix"
 
+            _startup.lap("create inputs")
+
         except:
             if ui:
                 ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
@@ -519,6 +761,7 @@ class FoilCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
 
 def run(context):
     try:
+        _startup.start()
 
         commandDefinitions = ui.commandDefinitions
 
@@ -530,159 +773,15 @@ def run(context):
         cmdDef.commandCreated.add(onCommandCreated)
         _handlers.append(onCommandCreated)
 
-        db = sqlDatabase(DATABASE)
-        db.create_airfoil_table()
-        
+        customEvent = app.registerCustomEvent(IMPORT_PROGRESS_EVENT_ID)
+        onImportProgress = FolderImportProgressHandler()
+        customEvent.add(onImportProgress)
+        _handlers.append(onImportProgress)
+
+        _startup.lap("register command")
         cmdDef.execute()
         adsk.autoTerminate(False)
 
     except:
         if ui:
             ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
-
-
-class sqlDatabase:
-    def __init__(self, db):
-        # Initialisiert die Datenbankverbindung und speichert den Pfad zur Datenbank
-        self.db = db
-        self.conn = sqlite3.connect(self.db)
-
-    def create_airfoil_table(self):
-        try:
-            c = self.conn.cursor()
-            
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS airfoil_data (
-                    airfoil_name TEXT PRIMARY KEY,
-                    x1 REAL, y1 REAL,
-                    x2 REAL, y2 REAL,
-                    x3 REAL, y3 REAL,
-                    x4 REAL, y4 REAL,
-                    x5 REAL, y5 REAL,
-                    x6 REAL, y6 REAL,
-                    x7 REAL, y7 REAL,
-                    x8 REAL, y8 REAL,
-                    x9 REAL, y9 REAL,
-                    x10 REAL, y10 REAL,
-                    x11 REAL, y11 REAL,
-                    x12 REAL, y12 REAL,
-                    x13 REAL, y13 REAL,
-                    x14 REAL, y14 REAL,
-                    x15 REAL, y15 REAL,
-                    x16 REAL, y16 REAL,
-                    x17 REAL, y17 REAL,
-                    x18 REAL, y18 REAL,
-                    x19 REAL, y19 REAL
-                )
-            ''')
-
-            self.conn.commit()
-            #print("Tabelle 'airfoil_data' erfolgreich erstellt.")
-
-        except sqlite3.Error as e:
-            print(f"Fehler beim Erstellen der Tabelle: {e}")
-
-    def read_airfoil_from_bez(self, file_path):
-            try:
-                with open(file_path, 'r') as file:
-                    lines = file.readlines()
-                    
-                    airfoil_name = lines[0].strip()
-                    
-                    coordinates = []
-                    for line in lines[1:20]:
-                        x, y = map(float, line.split())
-                        coordinates.append((x, y))
-                    
-                    self.insert_or_update_airfoil(airfoil_name, coordinates)
-            except FileNotFoundError:
-                print(f"Die Datei {file_path} wurde nicht gefunden.")
-            except Exception as e:
-                print(f"Fehler beim Lesen der Datei '{file_path}': {e}")
-
-
-    def insert_or_update_airfoil(self, airfoil_name, coordinates):
-        try:
-            c = self.conn.cursor()
-
-            c.execute('SELECT COUNT(*) FROM airfoil_data WHERE airfoil_name = ?', (airfoil_name,))
-            exists = c.fetchone()[0] > 0
-
-            flat_coordinates = [coord for pair in coordinates for coord in pair]
-
-            if exists:
-                update_query = f'''
-                    UPDATE airfoil_data
-                    SET {", ".join([f"x{i + 1} = ?, y{i + 1} = ?" for i in range(len(coordinates))])}
-                    WHERE airfoil_name = ?
-                '''
-                c.execute(update_query, (*flat_coordinates, airfoil_name))
-                print(f"Koordinaten für '{airfoil_name}' erfolgreich aktualisiert.")
-            else:
-                insert_query = f'''
-                    INSERT INTO airfoil_data (
-                        airfoil_name, {", ".join([f"x{i + 1}, y{i + 1}" for i in range(len(coordinates))])}
-                    ) VALUES (?, {", ".join(["?"] * (len(coordinates) * 2))})
-                '''
-                c.execute(insert_query, (airfoil_name, *flat_coordinates))
-                print(f"Koordinaten für '{airfoil_name}' erfolgreich eingefügt.")
-
-            self.conn.commit()
-
-        except sqlite3.Error as e:
-            print(f"Fehler beim Verarbeiten des Airfoils '{airfoil_name}': {e}")
-
-    def get_airfoil_coordinates(self, airfoil_name):
-        try:
-            c = self.conn.cursor()
-
-            c.execute(f'''
-                SELECT x1, y1, x2, y2, x3, y3, x4, y4, x5, y5, 
-                       x6, y6, x7, y7, x8, y8, x9, y9, x10, y10,
-                       x11, y11, x12, y12, x13, y13, x14, y14, 
-                       x15, y15, x16, y16, x17, y17, x18, y18, x19, y19 
-                FROM airfoil_data
-                WHERE airfoil_name = ?
-            ''', (airfoil_name,))
-
-            result = c.fetchone()
-            if result:
-
-                coordinates = [(result[i], result[i + 1]) for i in range(0, len(result), 2)]
-
-                top = coordinates[:10]
-                bottom = coordinates[9:]
-                top_r = list(reversed(top))
-
-                return top_r, bottom
-            else:
-                print(f"Airfoil '{airfoil_name}' nicht gefunden.")
-                return None, None
-
-        except sqlite3.Error as e:
-            print(f"Fehler beim Abrufen der Koordinaten für '{airfoil_name}': {e}")
-            return None, None
-
-    def get_sorted_airfoils(self):
-        try:
-            c = self.conn.cursor()
-            c.execute('SELECT airfoil_name FROM airfoil_data ORDER BY LOWER(airfoil_name) ASC')
-            airfoil_names = [row[0] for row in c.fetchall()]
-            return airfoil_names
-        except sqlite3.Error as e:
-            print(f"Fehler beim Abrufen der sortierten Airfoils: {e}")
-            return []
-
-    def delete_airfoil(self, airfoil_name):
-        try:
-            c = self.conn.cursor()
-            c.execute('DELETE FROM airfoil_data WHERE airfoil_name = ?', (airfoil_name,))
-            self.conn.commit()
-            print(f"Airfoil '{airfoil_name}' erfolgreich gelöscht.")
-
-        except sqlite3.Error as e:
-            print(f"Fehler beim Löschen des Airfoils '{airfoil_name}': {e}")
-
-    def close(self):
-        self.conn.close()
-        print("Datenbankverbindung geschlossen.")
@@ -0,0 +1,82 @@
+"""
+Gemeinsame Fixtures: beide Fusion-Skripte laufen gegen den Nachbau der Fusion-API in
+tests/fake_adsk, die Datenbank liegt in einem temporären Verzeichnis.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TESTS)
+sys.path[:0] = [os.path.join(TESTS, "fake_adsk"), ROOT]
+
+# Die Skripte legen beim Laden Datenbank- und Berichtspfade im Benutzerverzeichnis fest
+os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="airfoil_tests_")
+
+import adsk.core  # noqa: E402
+
+SAMPLE = os.path.join(ROOT, "sample.bez.dat")
+SAMPLE_NAME = "sample airfoil"
+DRIVING_PARAMETER = "span"
+
+
+@pytest.fixture
+def design():
+    # Neues leeres Design, der Datei-Dialog von bezier_airfoil_import liefert sample.bez.dat
+    return adsk.core.reset(open_file=SAMPLE)
+
+
+@pytest.fixture
+def simple_script(design):
+    import bezier_airfoil_import
+    return bezier_airfoil_import
+
+
+@pytest.fixture
+def database_script(design, tmp_path):
+    import bezier_airfoil_import_database as script
+
+    script.close_database()
+    script.DATABASE = str(tmp_path / "airfoil_data.db")
+    script.QUARANTINE_REPORT = str(tmp_path / "airfoil_quarantine.json")
+    result = script.get_database().read_airfoil_from_bez(SAMPLE)
+    assert result["imported"] == 1
+    yield script
+    script.close_database()
+
+
+@pytest.fixture(params=["simple_script", "database_script"])
+def front_end(request):
+    return request.getfixturevalue(request.param)
+
+
+def fill_design(design, count):
+    # Benutzerparameter eines gewachsenen Designs
+    for index in range(count):
+        design.userParameters.add(f"rib{index}", adsk.core.ValueInput.createByReal(index), "mm", "")
+
+
+def prepare(design, points, param_drive):
+    # Nasen- und Endleistenpunkt bzw. Bemaßungsparameter wie vor einer Platzierung in Fusion,
+    # danach beginnt die Zählung der Round-Trips von vorn
+    nose = tail = 0
+    if points != "origin":
+        sketch = design.rootComponent.sketches.add(design.rootComponent.xYConstructionPlane)
+        nose = sketch.sketchPoints.add(adsk.core.Point3D.create(0, 0, 0))
+        if points == "nose and tail":
+            tail = sketch.sketchPoints.add(adsk.core.Point3D.create(12, 1, 0))
+    if param_drive:
+        design.userParameters.add(param_drive, adsk.core.ValueInput.createByReal(20), "mm", "")
+    adsk.core.calls.clear()
+    return nose, tail
+
+
+def place(front_end, nose=0, tail=0, suffix="a", param_drive=""):
+    # Platziert sample.bez.dat über Foil.Execute des jeweiligen Skripts
+    if front_end.__name__ == "bezier_airfoil_import":
+        front_end.Foil().Execute(nose, tail, suffix, param_drive, True)
+    else:
+        front_end.Foil().Execute(nose, tail, suffix, param_drive, True, airfoil_name=SAMPLE_NAME)
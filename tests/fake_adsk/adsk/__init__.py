@@ -0,0 +1,18 @@
+"""
+Nachbau der Fusion-360-API für Tests ohne Fusion: nur die Objekte und Aufrufe, die
+airfoil_sketch und die beiden Skripte beim Platzieren eines Profils nutzen.
+
+Jeder Methodenaufruf und jede gesetzte Eigenschaft eines API-Objekts ist in Fusion ein
+Round-Trip und wird in adsk.core.calls gezählt, Schlüssel "Klasse.Name" (z.B.
+"UserParameters.add", "SketchPoint.isFixed"). adsk.core.reset() beginnt ein neues Design.
+"""
+
+from . import core, fusion, cam
+
+
+def terminate():
+    pass
+
+
+def autoTerminate(value):
+    pass
@@ -0,0 +1,3 @@
+"""
+adsk.cam: wird von den Skripten nur importiert.
+"""
@@ -0,0 +1,155 @@
+"""
+adsk.core: Anwendung, Benutzeroberfläche, Eingabewerte und die Zählung der Round-Trips.
+"""
+
+import functools
+import math
+from collections import Counter
+
+# Round-Trips seit dem letzten reset() bzw. calls.clear()
+calls = Counter()
+
+
+class Base:
+    # Gesetzte Eigenschaften zählen als Round-Trip. Interne Attribute des Nachbaus beginnen mit
+    # "_" und werden nicht gezählt, ebenso Werte, die der Konstruktor über _init setzt.
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            calls[f"{type(self).__name__}.{name}"] += 1
+        object.__setattr__(self, name, value)
+
+    def _init(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+
+def api(method):
+    # Methode eines API-Objekts, jeder Aufruf ist ein Round-Trip
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        calls[f"{type(self).__name__}.{method.__name__}"] += 1
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def api_static(owner):
+    # Statische Methode wie Point3D.create, gezählt als "<owner>.<Name>"
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            calls[f"{owner}.{function.__name__}"] += 1
+            return function(*args, **kwargs)
+        return staticmethod(wrapper)
+    return decorate
+
+
+class Point3D(Base):
+    def __init__(self, x, y, z):
+        self._init(x=float(x), y=float(y), z=float(z))
+
+    @api_static("Point3D")
+    def create(x=0.0, y=0.0, z=0.0):
+        return Point3D(x, y, z)
+
+    def distanceTo(self, other):
+        return math.dist((self.x, self.y, self.z), (other.x, other.y, other.z))
+
+
+class ValueInput(Base):
+    def __init__(self, real=None, string=None):
+        self._init(realValue=real, stringValue=string)
+
+    @api_static("ValueInput")
+    def createByReal(value):
+        return ValueInput(real=float(value))
+
+    @api_static("ValueInput")
+    def createByString(value):
+        return ValueInput(string=str(value))
+
+
+class DialogResults:
+    DialogOK = 0
+    DialogCancel = 1
+
+
+class FileDialog(Base):
+    def __init__(self, filename):
+        self._init(title="", filter="", filename=filename)
+
+    @api
+    def showOpen(self):
+        return DialogResults.DialogOK if self.filename else DialogResults.DialogCancel
+
+
+class UserInterface(Base):
+    def __init__(self):
+        self._init(_messages=[], _open_file=None)
+
+    @api
+    def messageBox(self, text, *args):
+        self._messages.append(str(text))
+        return 0
+
+    @api
+    def createFileDialog(self):
+        return FileDialog(self._open_file)
+
+
+class Application(Base):
+    _instance = None
+
+    def __init__(self):
+        self._init(userInterface=UserInterface(), activeProduct=None)
+
+    @staticmethod
+    def get():
+        if Application._instance is None:
+            Application._instance = Application()
+            reset()
+        return Application._instance
+
+
+def reset(open_file=None):
+    # Neues leeres Design als activeProduct, das bisherige und seine Parameter werden ungültig
+    # (isValid False). open_file ist der Dateiname, den der nächste Datei-Dialog liefert.
+    from . import fusion
+
+    app = Application.get()
+    if app.activeProduct is not None:
+        object.__setattr__(app.activeProduct, "isValid", False)
+        for parameter in app.activeProduct._parameters.values():
+            object.__setattr__(parameter, "isValid", False)
+    object.__setattr__(app, "activeProduct", fusion.Design())
+    ui = app.userInterface
+    ui._messages.clear()
+    ui._open_file = open_file
+    calls.clear()
+    return app.activeProduct
+
+
+def messages():
+    # Texte aller messageBox-Aufrufe seit reset()
+    return list(Application.get().userInterface._messages)
+
+
+# Basisklassen und Typen, die die Skripte beim Laden ableiten bzw. in Annotationen nennen
+class CommandEventHandler:
+    def __init__(self):
+        pass
+
+
+class CommandCreatedEventHandler(CommandEventHandler):
+    pass
+
+
+class InputChangedEventHandler(CommandEventHandler):
+    pass
+
+
+class CustomEventHandler(CommandEventHandler):
+    pass
+
+
+class CommandEventArgs(Base):
+    pass
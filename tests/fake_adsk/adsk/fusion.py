@@ -0,0 +1,295 @@
+"""
+adsk.fusion: Design mit Parametern, Skizzen, Linien, Splines, Bemaßungen und Abhängigkeiten.
+
+Wie in Fusion sind Parameternamen im Design eindeutig: userParameters.add und das Umbenennen
+eines Parameters mit einem vergebenen Namen werfen RuntimeError. allParameters zählt beim
+Durchlaufen jeden Zugriff auf ein Element als Round-Trip.
+"""
+
+from .core import Base, Point3D, api
+
+
+class Parameter(Base):
+    def __init__(self, design, name, value, unit="", comment=""):
+        self._init(_design=design, _name=None, value=value, unit=unit, comment=comment,
+                   expression=str(value), isFavorite=False, isValid=True)
+        self._rename(name)
+
+    def _rename(self, name):
+        if name in self._design._parameters:
+            raise RuntimeError(f"parameter name '{name}' is already used")
+        if self._name is not None:
+            del self._design._parameters[self._name]
+        self._name = name
+        self._design._parameters[name] = self
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        if name != self._name:
+            self._rename(name)
+
+
+class UserParameter(Parameter):
+    pass
+
+
+class ModelParameter(Parameter):
+    pass
+
+
+class UserParameters(Base):
+    def __init__(self, design):
+        self._init(_design=design, _items=[])
+
+    @api
+    def add(self, name, value, units, comment):
+        parameter = UserParameter(self._design, name, value.realValue, units, comment)
+        self._items.append(parameter)
+        return parameter
+
+    @api
+    def itemByName(self, name):
+        parameter = self._design._parameters.get(name)
+        return parameter if isinstance(parameter, UserParameter) else None
+
+    @property
+    def count(self):
+        return len(self._items)
+
+
+class ParameterList(Base):
+    # design.allParameters: Benutzer- und Modellparameter
+    def __init__(self, design):
+        self._init(_design=design)
+
+    @api
+    def itemByName(self, name):
+        return self._design._parameters.get(name)
+
+    @api
+    def item(self, index):
+        return list(self._design._parameters.values())[index]
+
+    @property
+    def count(self):
+        return len(self._design._parameters)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.item(index)
+
+
+class SketchPoint(Base):
+    def __init__(self, sketch, geometry):
+        self._init(parentSketch=sketch, geometry=geometry, isFixed=False)
+
+
+class SketchPoints(Base):
+    def __init__(self, sketch):
+        self._init(_sketch=sketch, _items=[])
+
+    @api
+    def add(self, point):
+        sketch_point = SketchPoint(self._sketch, point)
+        self._items.append(sketch_point)
+        return sketch_point
+
+
+def _sketch_point(sketch, point):
+    return point if isinstance(point, SketchPoint) else SketchPoint(sketch, point)
+
+
+class SketchLine(Base):
+    def __init__(self, sketch, start, end):
+        self._init(parentSketch=sketch, startSketchPoint=start, endSketchPoint=end,
+                   isConstruction=False, isFixed=False)
+
+    @property
+    def length(self):
+        return self.startSketchPoint.geometry.distanceTo(self.endSketchPoint.geometry)
+
+
+class SketchLines(Base):
+    def __init__(self, sketch):
+        self._init(_sketch=sketch)
+
+    @api
+    def addByTwoPoints(self, start, end):
+        return SketchLine(self._sketch, _sketch_point(self._sketch, start), _sketch_point(self._sketch, end))
+
+
+class SketchControlPointSpline(Base):
+    # Ein neuer Grad ergänzt wie in Fusion Kontrollpunkte bis Grad + 1
+    def __init__(self, sketch, points, degree):
+        self._init(parentSketch=sketch, _degree=degree, controlPoints=[], controlFrameLines=[])
+        self.controlPoints.extend(SketchPoint(sketch, point) for point in points)
+        self._update_frame()
+
+    def _update_frame(self):
+        while len(self.controlPoints) < self._degree + 1:
+            self.controlPoints.append(SketchPoint(self.parentSketch, Point3D(0, 0, 0)))
+        self.controlFrameLines[:] = [SketchLine(self.parentSketch, a, b)
+                                     for a, b in zip(self.controlPoints, self.controlPoints[1:])]
+
+    @property
+    def degree(self):
+        return self._degree
+
+    @degree.setter
+    def degree(self, degree):
+        self._degree = degree
+        self._update_frame()
+
+
+class SketchControlPointSplines(Base):
+    def __init__(self, sketch):
+        self._init(_sketch=sketch)
+
+    @api
+    def add(self, points, degree):
+        return SketchControlPointSpline(self._sketch, points, degree)
+
+
+class SketchCurves(Base):
+    def __init__(self, sketch):
+        self._init(sketchLines=SketchLines(sketch), sketchControlPointSplines=SketchControlPointSplines(sketch))
+
+
+class SketchDimension(Base):
+    def __init__(self, parameter):
+        self._init(parameter=parameter)
+
+    @property
+    def value(self):
+        return self.parameter.value
+
+    @value.setter
+    def value(self, value):
+        self.parameter._init(value=value)
+
+
+class SketchDimensions(Base):
+    def __init__(self, design):
+        self._init(_design=design, _items=[])
+
+    def _add(self, value):
+        self._design._dimension_count += 1
+        name = f"d{self._design._dimension_count}"
+        while name in self._design._parameters:
+            self._design._dimension_count += 1
+            name = f"d{self._design._dimension_count}"
+        dimension = SketchDimension(ModelParameter(self._design, name, value, "mm"))
+        self._items.append(dimension)
+        return dimension
+
+    @api
+    def addOffsetDimension(self, line, entity, text_point, is_driving=True):
+        return self._add(0.0)
+
+    @api
+    def addAngularDimension(self, line1, line2, text_point, is_driving=True):
+        return self._add(90.0)
+
+    @api
+    def addDistanceDimension(self, point1, point2, orientation, text_point, is_driving=True):
+        return self._add(point1.geometry.distanceTo(point2.geometry))
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    @property
+    def count(self):
+        return len(self._items)
+
+
+class GeometricConstraints(Base):
+    def __init__(self):
+        self._init(_items=[])
+
+    @api
+    def addCoincident(self, point, entity):
+        self._items.append(("coincident", point, entity))
+        return len(self._items)
+
+
+class Sketch(Base):
+    def __init__(self, design, plane):
+        self._init(referencePlane=plane, isComputeDeferred=False, isValid=True,
+                   sketchCurves=SketchCurves(self), sketchPoints=SketchPoints(self),
+                   sketchDimensions=SketchDimensions(design), geometricConstraints=GeometricConstraints())
+
+
+class Sketches(Base):
+    def __init__(self, design):
+        self._init(_design=design, _items=[])
+
+    @api
+    def add(self, plane):
+        sketch = Sketch(self._design, plane)
+        self._items.append(sketch)
+        return sketch
+
+    @property
+    def count(self):
+        return len(self._items)
+
+
+class ConstructionPlane(Base):
+    def __init__(self, name, offset=None):
+        self._init(name=name, offset=offset)
+
+
+class ConstructionPlaneInput(Base):
+    def __init__(self):
+        self._init(_plane=None, _offset=None)
+
+    @api
+    def setByOffset(self, plane, offset):
+        self._plane = plane
+        self._offset = offset
+        return True
+
+
+class ConstructionPlanes(Base):
+    def __init__(self):
+        self._init(_items=[])
+
+    @api
+    def createInput(self):
+        return ConstructionPlaneInput()
+
+    @api
+    def add(self, plane_input):
+        plane = ConstructionPlane(f"Plane{len(self._items) + 1}", plane_input._offset)
+        self._items.append(plane)
+        return plane
+
+    @property
+    def count(self):
+        return len(self._items)
+
+
+class Component(Base):
+    def __init__(self, design):
+        self._init(sketches=Sketches(design), constructionPlanes=ConstructionPlanes(),
+                   xYConstructionPlane=ConstructionPlane("XY"))
+
+
+class Timeline(Base):
+    def __init__(self):
+        self._init(count=0)
+
+
+class Design(Base):
+    def __init__(self):
+        self._init(_parameters={}, _dimension_count=0, isValid=True, timeline=Timeline())
+        self._init(rootComponent=Component(self), userParameters=UserParameters(self),
+                   allParameters=ParameterList(self))
+
+    @staticmethod
+    def cast(product):
+        return product if isinstance(product, Design) else None
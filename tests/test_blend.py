@@ -0,0 +1,35 @@
+"""
+airfoil_cli.py blend: Zwischenprofile landen unter "<prefix> <Station in %>" in der Bibliothek.
+"""
+
+import airfoil_cli
+import airfoil_database
+from conftest import SAMPLE, SAMPLE_NAME
+
+
+def test_blend_stores_inner_stations(tmp_path, capsys):
+    database = str(tmp_path / "airfoil_data.db")
+    assert airfoil_cli.main(["--database", database, "import", SAMPLE]) == 0
+    db = airfoil_database.sqlDatabase(database)
+    top_r, bottom = db.get_airfoil_coordinates(SAMPLE_NAME)
+    db.store_airfoils([("tip", [(x, y / 2) for x, y, *_ in top_r], [(x, y / 2) for x, y, *_ in bottom])])
+    db.close()
+    capsys.readouterr()
+
+    assert airfoil_cli.main(["--database", database, "blend", SAMPLE_NAME, "tip", "--prefix", "rib",
+                             "--exponent", "2"]) == 0
+    assert capsys.readouterr().out.split("\n") == ["rib 25", "rib 50", "rib 75", ""]
+
+    db = airfoil_database.sqlDatabase(database)
+    blended_top, blended_bottom = db.get_airfoil_coordinates("rib 50")
+    db.close()
+    # Station 0.5 mit Exponent 2: ein Viertel Spitzenprofil, also 7/8 der Wurzeldicke
+    for blended, root in zip(blended_top + blended_bottom, top_r + bottom):
+        assert abs(blended[0] - root[0]) < 1e-12
+        assert abs(blended[1] - root[1] * 7 / 8) < 1e-12
+
+
+def test_blend_unknown_airfoil(tmp_path):
+    database = str(tmp_path / "airfoil_data.db")
+    assert airfoil_cli.main(["--database", database, "import", SAMPLE]) == 0
+    assert airfoil_cli.main(["--database", database, "blend", SAMPLE_NAME, "missing"]) == 1
@@ -0,0 +1,46 @@
+"""
+Schreibgeschützter Katalog: Schließen, während Ergebnisse von points() noch leben, mit NumPy
+(Array auf der gemappten Datei) und ohne (memoryview).
+"""
+
+import pytest
+
+import airfoil_catalogue
+import airfoil_database
+
+COORDINATES = [(1.0, 0.0), (0.5, 0.05), (0.0, 0.0), (0.5, -0.05), (1.0, 0.0)]
+
+
+@pytest.fixture(params=["numpy", "memoryview"])
+def catalogue_path(request, tmp_path, monkeypatch):
+    if request.param == "numpy":
+        if airfoil_catalogue.np is None:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(airfoil_catalogue, "np", None)
+    path = str(tmp_path / "airfoil_catalogue.afc")
+    airfoil_catalogue.write_catalogue(path, [[("a", COORDINATES), ("b", COORDINATES[::-1])]])
+    return path
+
+
+def test_close_with_live_points(catalogue_path):
+    catalogue = airfoil_catalogue.AirfoilCatalogue(catalogue_path)
+    points = catalogue.points(1)
+
+    catalogue.close()
+
+    # Die Ansicht bleibt lesbar, die Abbildung schließt erst mit ihr
+    values = points.ravel().tolist() if airfoil_catalogue.np is not None else points.tolist()
+    assert values == [value for point in COORDINATES[::-1] for value in point]
+
+
+def test_database_close_with_live_points(catalogue_path, tmp_path):
+    catalogue = airfoil_catalogue.AirfoilCatalogue(catalogue_path)
+    db = airfoil_database.sqlDatabase(str(tmp_path / "airfoil_data.db"), catalogue)
+    db.create_airfoil_table()
+    assert db.get_airfoil_coordinates("a") is not None
+    points = catalogue.points(0)
+
+    db.close()
+
+    assert len(points) > 0
@@ -0,0 +1,307 @@
+"""
+Import in die Profildatenbank ohne Fusion: Parser, Prüfung, Quarantäne, Ordnerabgleich und
+Migration gegen eine Datenbank in tmp_path. Läuft mit und ohne NumPy.
+"""
+
+import math
+import os
+import re
+import shutil
+import sqlite3
+
+import pytest
+
+import airfoil_database
+import airfoil_parser
+import airfoil_validation
+from conftest import SAMPLE, SAMPLE_NAME
+
+
+def sample_coordinates():
+    with open(SAMPLE, encoding="utf-8") as file:
+        [(airfoil_name, coordinates)] = airfoil_parser.parse_bez_text(file.read())
+    return coordinates
+
+
+def bez_text(airfoil_name, factor=1.0):
+    # sample.bez.dat unter anderem Namen, die Dicke mit factor skaliert
+    return airfoil_parser.format_bez_text(airfoil_name, [(x, y * factor) for x, y in sample_coordinates()])
+
+
+def naca_text(name, thickness=0.12, points=41):
+    # Symmetrisches NACA-Profil als Selig-Punktdatei: Endleiste oben -> Nase -> Endleiste unten
+    xs = [(1 - math.cos(math.pi * i / (points - 1))) / 2 for i in range(points)]
+    ys = [5 * thickness * (0.2969 * math.sqrt(x) - 0.126 * x - 0.3516 * x ** 2 + 0.2843 * x ** 3 - 0.1036 * x ** 4)
+          for x in xs]
+    upper = [(x, y) for x, y in zip(reversed(xs), reversed(ys))]
+    lower = [(x, -y) for x, y in zip(xs[1:], ys[1:])]
+    return name + "\n" + "".join(f"{x:.6f} {y:.6f}\n" for x, y in upper + lower)
+
+
+def degenerate_text(name):
+    # Unterseite ohne Länge: alle Punkte auf der Nase
+    upper = naca_text(name).splitlines()[1:21]
+    return name + "\n" + "\n".join(upper + ["0 0"] * 20) + "\n"
+
+
+def descriptor_count(db):
+    return db.conn.execute('SELECT COUNT(*) FROM airfoil_descriptors').fetchone()[0]
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = airfoil_database.sqlDatabase(str(tmp_path / "airfoil_data.db"))
+    database.create_airfoil_table()
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def folder(tmp_path):
+    path = tmp_path / "library"
+    path.mkdir()
+    return path
+
+
+# Parser
+
+def test_sections_end_at_any_line_that_is_not_a_point():
+    points = "".join(f"{x} {y}\n" for x, y in sample_coordinates())
+    text = f"NACA 2412\n{points}\n2412 mod\n{points}0.1 0.2 0.3\n{points}"
+
+    sections = list(airfoil_parser.iter_bez_sections(text.splitlines(), degree=9))
+
+    assert [name for name, coordinates in sections] == ["NACA 2412", "2412 mod", "0.1 0.2 0.3"]
+    assert all(coordinates == sample_coordinates() for name, coordinates in sections)
+
+
+def test_section_with_wrong_point_count_names_its_line():
+    points = "".join(f"{x} {y}\n" for x, y in sample_coordinates())
+    text = f"good\n{points}short\n1.0 0.0\n0.0 0.0\n1.0 0.0\n1.0 0.0\n"
+
+    sections = airfoil_parser.iter_bez_sections(text.splitlines(), degree=9)
+
+    # Abschnitte werden einzeln geparst, der Fehler kommt erst mit dem zweiten
+    assert next(sections)[0] == "good"
+    with pytest.raises(ValueError, match=r"airfoil 'short' \(line 21\): 4 control points"):
+        next(sections)
+
+
+def test_bez_text_is_lossless_and_positional():
+    coordinates = [(1.0, 0.0), (0.5, 1e-05), (0.0, 1e-07), (0.0, 0.0), (0.0, -0.08604208958076319),
+                   (0.5, -1.2345678901234567e-09), (1.0, -0.0)]
+    text = airfoil_parser.format_bez_text("round trip", coordinates)
+
+    for line in text.splitlines()[1:]:
+        assert re.fullmatch(r"-?\d+\.\d{16,} -?\d+\.\d{16,}", line), line
+    [(airfoil_name, parsed)] = airfoil_parser.parse_bez_text(text)
+    assert airfoil_name == "round trip"
+    assert parsed == coordinates
+
+
+# Prüfung
+
+def validation_cases():
+    coordinates = sample_coordinates()
+
+    def changed(index, point):
+        points = list(coordinates)
+        points[index] = point
+        return points
+
+    swapped = list(coordinates)
+    swapped[3], swapped[4] = swapped[4], swapped[3]
+    return [
+        (coordinates, []),
+        (changed(5, (math.nan, 0.0)), [airfoil_validation.NON_FINITE]),
+        (changed(18, (math.inf, 0.0)), [airfoil_validation.NON_FINITE]),
+        ([(-x, y) for x, y in coordinates], [airfoil_validation.NO_CHORD]),
+        (changed(8, (0.01, coordinates[8][1])), [airfoil_validation.LEADING_EDGE]),
+        # Polygon nicht monoton, die Kurve schon
+        (swapped, []),
+        (changed(1, (1.6, coordinates[1][1])), [airfoil_validation.UPPER_NOT_MONOTONIC]),
+        (changed(17, (1.6, coordinates[17][1])), [airfoil_validation.LOWER_NOT_MONOTONIC]),
+        (changed(0, (1.0, 0.02)), ["trailing edge open by 2.00% of chord"]),
+        (coordinates[:17], ["17 control points, expected 19"]),
+    ]
+
+
+def test_validation_reasons(monkeypatch):
+    airfoils, expected = zip(*validation_cases())
+    assert airfoil_validation.validate_airfoils(airfoils) == list(expected)
+
+    # Reines Python liefert dieselben Gründe wie der NumPy-Weg
+    monkeypatch.setattr(airfoil_validation, "np", None)
+    assert airfoil_validation.validate_airfoils(airfoils) == list(expected)
+
+
+# Import und Quarantäne
+
+def test_rejected_sections_are_quarantined_and_replaced_on_reread(db, tmp_path):
+    path = tmp_path / "wing.bez.dat"
+    open_edge = [(x, y + 0.02 if i == 0 else y) for i, (x, y) in enumerate(sample_coordinates())]
+    path.write_text(bez_text("root") + airfoil_parser.format_bez_text("tip", open_edge))
+
+    result = db.read_airfoil_from_bez(str(path))
+
+    assert (result["imported"], result["quarantined"]) == (1, 1)
+    assert [(entry["airfoil_name"], entry["reasons"]) for entry in db.quarantine_entries()] == \
+        [("tip", ["trailing edge open by 2.00% of chord"])]
+
+    # Erneut gelesen ersetzen die neuen Gründe die alten
+    no_leading_edge = [(0.01, y) if i == 8 else (x, y) for i, (x, y) in enumerate(sample_coordinates())]
+    path.write_text(bez_text("root") + airfoil_parser.format_bez_text("tip", no_leading_edge))
+    db.read_airfoil_from_bez(str(path))
+    assert [(entry["airfoil_name"], entry["reasons"]) for entry in db.quarantine_entries()] == \
+        [("tip", [airfoil_validation.LEADING_EDGE])]
+
+    path.write_text(bez_text("root") + bez_text("tip", 0.5))
+    result = db.read_airfoil_from_bez(str(path))
+    assert (result["imported"], result["updated"], result["quarantined"]) == (1, 1, 0)
+    assert db.quarantine_entries() == []
+
+
+def test_degenerate_point_file_is_quarantined(db, folder):
+    shutil.copy(SAMPLE, folder / "sample.bez.dat")
+    (folder / "naca0012.dat").write_text(naca_text("NACA 0012"))
+    (folder / "flat.dat").write_text(degenerate_text("flat"))
+
+    result = db.sync_folder(str(folder), workers=1)
+
+    assert result["imported"] == 2
+    assert result["failed"] == 1
+    assert result["quarantined"] == 1
+    assert db.get_airfoil_coordinates(SAMPLE_NAME)[0] is not None
+    assert db.get_airfoil_coordinates("NACA 0012")[0] is not None
+    [entry] = db.quarantine_entries()
+    assert entry["path"] == str(folder / "flat.dat")
+    assert entry["airfoil_name"] == "flat"
+    assert entry["reasons"] == ["airfoil side has zero length"]
+
+
+def test_degenerate_single_file(db, tmp_path):
+    path = tmp_path / "flat.dat"
+    path.write_text(degenerate_text("flat"))
+
+    result = db.read_airfoil_from_bez(str(path))
+
+    assert result["imported"] == 0
+    assert result["errors"] == [(str(path), "'flat': airfoil side has zero length")]
+
+
+# Ordnerabgleich
+
+def test_sync_folder_skips_unchanged_and_removes_missing(db, folder):
+    (folder / "a.bez.dat").write_text(bez_text("A"))
+    (folder / "b.bez.dat").write_text(bez_text("B"))
+    (folder / "copy of a.bez.dat").write_text(bez_text("A"))
+
+    result = db.sync_folder(str(folder), workers=1)
+    assert (result["imported"], result["updated"], result["skipped"]) == (2, 0, 0)
+
+    result = db.sync_folder(str(folder), workers=1)
+    assert (result["imported"], result["updated"], result["skipped"]) == (0, 0, 3)
+
+    # Neue mtime, gleicher Inhalt: gelesen, aber nicht geschrieben
+    stat = os.stat(folder / "a.bez.dat")
+    os.utime(folder / "a.bez.dat", (stat.st_atime, stat.st_mtime + 10))
+    result = db.sync_folder(str(folder), workers=1)
+    assert (result["imported"], result["updated"], result["skipped"]) == (0, 0, 3)
+
+    (folder / "b.bez.dat").write_text(bez_text("B", 0.5))
+    result = db.sync_folder(str(folder), workers=1)
+    assert (result["imported"], result["updated"], result["skipped"]) == (0, 1, 2)
+
+    # A kommt noch aus a.bez.dat und bleibt erhalten
+    os.remove(folder / "copy of a.bez.dat")
+    result = db.sync_folder(str(folder), remove_missing=True, workers=1)
+    assert result["removed"] == 1
+    assert db.search_airfoils() == ["A", "B"]
+
+    os.remove(folder / "b.bez.dat")
+    result = db.sync_folder(str(folder), workers=1)
+    assert result["removed"] == 0
+    assert db.search_airfoils() == ["A", "B"]
+    result = db.sync_folder(str(folder), remove_missing=True, workers=1)
+    assert result["removed"] == 1
+    assert db.search_airfoils() == ["A"]
+
+
+def test_unparsable_file_is_skipped_until_it_changes(db, folder):
+    shutil.copy(SAMPLE, folder / "sample.bez.dat")
+    broken = folder / "broken.bez.dat"
+    broken.write_text("broken\n1.0 0.0\n0.5 0.1\n")
+
+    first = db.sync_folder(str(folder), workers=1)
+    assert (first["imported"], first["failed"], first["quarantined"]) == (1, 1, 1)
+
+    second = db.sync_folder(str(folder), workers=1)
+    assert (second["imported"], second["failed"], second["quarantined"], second["skipped"]) == (0, 0, 0, 2)
+    assert [entry["path"] for entry in db.quarantine_entries()] == [str(broken)]
+
+    broken.write_text(bez_text("repaired"))
+    third = db.sync_folder(str(folder), workers=1)
+    assert (third["imported"], third["failed"], third["skipped"]) == (1, 0, 1)
+    assert db.quarantine_entries() == []
+
+
+# Kennwerte
+
+def test_descriptors_skipped_on_import_are_computed_on_demand(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(airfoil_database, "IMPORT_DESCRIPTORS", False)
+    db.read_airfoil_from_bez(SAMPLE)
+    assert descriptor_count(db) == 0
+
+    thickness = db.statistics()["descriptors"]["thickness"][0]
+    assert descriptor_count(db) == 1
+    assert db.search_airfoils(ranges={"thickness": (thickness * 0.99, thickness * 1.01)}) == [SAMPLE_NAME]
+
+    # Ein erneuter Import mit geänderter Geometrie verwirft die alten Kennwerte
+    path = tmp_path / "thick.bez.dat"
+    path.write_text(bez_text(SAMPLE_NAME, 2.0))
+    db.read_airfoil_from_bez(str(path))
+    assert db.search_airfoils(ranges={"thickness": (thickness * 0.99, thickness * 1.01)}) == []
+    assert db.search_airfoils(ranges={"thickness": (thickness * 1.99, thickness * 2.01)}) == [SAMPLE_NAME]
+
+
+def test_descriptors_computed_on_import_match(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(airfoil_database, "IMPORT_DESCRIPTORS", True)
+    db.read_airfoil_from_bez(SAMPLE)
+    assert descriptor_count(db) == 1
+    computed = db.statistics()["descriptors"]
+
+    monkeypatch.setattr(airfoil_database, "IMPORT_DESCRIPTORS", False)
+    path = tmp_path / "same.bez.dat"
+    path.write_text(bez_text(SAMPLE_NAME))
+    db.read_airfoil_from_bez(str(path))
+    assert descriptor_count(db) == 0
+    assert db.statistics()["descriptors"] == computed
+
+
+# Migration
+
+def test_migration_from_column_schema(tmp_path):
+    path = str(tmp_path / "airfoil_data.db")
+    conn = sqlite3.connect(path)
+    conn.execute(f'CREATE TABLE airfoil_data (airfoil_name TEXT PRIMARY KEY, '
+                 f'{", ".join(f"{column} REAL" for column in airfoil_database.V1_COLUMNS)})')
+    values = [value for point in sample_coordinates() for value in point]
+    conn.execute(f'INSERT INTO airfoil_data VALUES (?, {", ".join("?" * len(values))})', [SAMPLE_NAME, *values])
+    conn.commit()
+    conn.close()
+
+    db = airfoil_database.sqlDatabase(path)
+    try:
+        db.create_airfoil_table()
+
+        assert db.conn.execute('PRAGMA user_version').fetchone()[0] == airfoil_database.SCHEMA_VERSION
+        tables = {name for name, in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {"airfoil_data", "import_manifest", "airfoil_descriptors", "quarantine"} <= tables
+        assert "airfoil_data_v1" not in tables
+        top_r, bottom = db.get_airfoil_coordinates(SAMPLE_NAME)
+        assert [tuple(point) for point in top_r] == airfoil_parser.split_polygon(sample_coordinates(), 9)[0]
+        assert [tuple(point) for point in bottom] == airfoil_parser.split_polygon(sample_coordinates(), 9)[1]
+        assert descriptor_count(db) == 1
+        assert db.quarantine_entries() == []
+    finally:
+        db.close()
@@ -0,0 +1,81 @@
+"""
+Fusion-Aufrufe je platziertem Profil: jede Verzweigung von airfoil_sketch.place_airfoil (ohne
+Punkt, mit Nasenpunkt, mit Nasen- und Endleistenpunkt, jeweils mit und ohne
+Bemaßungsparameter) aus beiden Skripten muss innerhalb von airfoil_sketch.API_CALL_BUDGET
+bleiben. Der Nachbau zählt die Aufrufe unabhängig mit, so fällt auch ein Aufruf auf, den
+place_airfoil nicht über count_api_call meldet.
+"""
+
+from collections import Counter
+
+import adsk.core
+import pytest
+
+import airfoil_placement
+import airfoil_sketch
+from conftest import DRIVING_PARAMETER, SAMPLE, fill_design, place, prepare
+
+# Zähler von airfoil_sketch -> Round-Trips des Nachbaus, die er abdeckt
+COUNTED_CALLS = {
+    "userParameters.add": ["UserParameters.add"],
+    "expression": ["UserParameter.expression", "ModelParameter.expression"],
+    "dimension": ["SketchDimensions.addOffsetDimension", "SketchDimensions.addAngularDimension",
+                  "SketchDimensions.addDistanceDimension"],
+    "addCoincident": ["GeometricConstraints.addCoincident"],
+    "isFixed": ["SketchPoint.isFixed"],
+}
+
+# Alle Round-Trips einer Platzierung (gezählt vom Nachbau, inkl. Skizze, Splines und
+# Datei-Dialog). Steigt die Zahl, schlägt der Test fehl, bis die Grenze bewusst angehoben wird.
+ROUND_TRIP_BUDGET = 403
+
+# Parameter im Design vor der Platzierung, die Round-Trips dürfen davon nicht abhängen
+DESIGN_SIZES = (0, 1000, 5000)
+
+
+@pytest.mark.parametrize("param_drive", ["", DRIVING_PARAMETER])
+@pytest.mark.parametrize("points", ["origin", "nose", "nose and tail"])
+def test_placement_stays_within_budget(front_end, design, points, param_drive):
+    nose, tail = prepare(design, points, param_drive)
+
+    place(front_end, nose, tail, "a", param_drive)
+
+    assert adsk.core.messages() == []
+    assert design.userParameters.count == 3 + 4 * 2 * airfoil_placement.CONTROL_POINTS + bool(param_drive)
+    assert airfoil_sketch.check_api_calls() == {}
+    for name, count in airfoil_sketch.api_calls.items():
+        assert count <= airfoil_sketch.API_CALL_BUDGET[name], name
+
+    for name, fake_names in COUNTED_CALLS.items():
+        assert airfoil_sketch.api_calls[name] == sum(adsk.core.calls[fake] for fake in fake_names), name
+    assert sum(adsk.core.calls.values()) <= ROUND_TRIP_BUDGET
+
+
+def test_second_placement_needs_new_suffix(database_script, design):
+    place(database_script, suffix="a")
+    with pytest.raises(RuntimeError):
+        airfoil_sketch.create_parameters(design, airfoil_placement.plan_parameters(
+            *database_script.get_database().get_airfoil_coordinates("sample airfoil"), "a"))
+
+
+def test_placement_parameters_follow_plan(database_script, design):
+    place(database_script, suffix="b")
+    top_r, bottom = database_script.get_database().get_airfoil_coordinates("sample airfoil")
+    for name, value, units, comment, expression, favorite in airfoil_placement.plan_parameters(top_r, bottom, "b"):
+        parameter = design.userParameters.itemByName(name)
+        assert parameter is not None, name
+        assert parameter.isFavorite == favorite or name == airfoil_placement.driver_name("b"), name
+
+
+def test_round_trips_independent_of_design_size(front_end):
+    # Der Bemaßungsparameter wird zuletzt angelegt, eine Suche durch allParameters würde mit
+    # der Größe des Designs wachsen
+    counts = []
+    for size in DESIGN_SIZES:
+        design = adsk.core.reset(open_file=SAMPLE)
+        fill_design(design, size)
+        nose, tail = prepare(design, "origin", DRIVING_PARAMETER)
+        place(front_end, nose, tail, "a", DRIVING_PARAMETER)
+        assert adsk.core.messages() == []
+        counts.append(Counter(adsk.core.calls))
+    assert all(count == counts[0] for count in counts[1:])
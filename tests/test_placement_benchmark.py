@@ -0,0 +1,38 @@
+"""
+Laufzeit einer Platzierung gegen den Nachbau (pytest-benchmark). Gemessen wird die Arbeit der
+Skripte zwischen den Fusion-Aufrufen; die Zahl der Aufrufe prüft test_placement.py.
+
+    python -m pytest tests/test_placement_benchmark.py --benchmark-autosave
+    python -m pytest tests/test_placement_benchmark.py --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+import adsk.core
+import pytest
+
+from conftest import DRIVING_PARAMETER, SAMPLE, fill_design, place, prepare
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("points", ["origin", "nose and tail"])
+def test_place_airfoil(benchmark, front_end, points):
+    def setup():
+        design = adsk.core.reset(open_file=SAMPLE)
+        nose, tail = prepare(design, points, DRIVING_PARAMETER)
+        return (front_end, nose, tail, "a", DRIVING_PARAMETER), {}
+
+    benchmark.pedantic(place, setup=setup, rounds=20)
+    assert adsk.core.messages() == []
+
+
+@pytest.mark.parametrize("size", [0, 1000, 5000])
+def test_place_airfoil_in_large_design(benchmark, front_end, size):
+    # Die Zeiten je Größe sollen gleich bleiben, Parameter werden über den Namen gesucht
+    def setup():
+        design = adsk.core.reset(open_file=SAMPLE)
+        fill_design(design, size)
+        nose, tail = prepare(design, "origin", DRIVING_PARAMETER)
+        return (front_end, nose, tail, "a", DRIVING_PARAMETER), {}
+
+    benchmark.pedantic(place, setup=setup, rounds=10)
+    assert adsk.core.messages() == []
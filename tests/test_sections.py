@@ -0,0 +1,73 @@
+"""
+Foil.ExecuteSections (Tab "Wing"): die Suffixe werden geprüft, bevor die erste Rippe entsteht,
+und der Profiler-Bericht umfasst alle Rippen.
+"""
+
+import adsk.core
+import pytest
+
+import airfoil_placement
+import airfoil_sketch
+from conftest import SAMPLE_NAME, place
+
+
+def sections_text(*suffixes):
+    return "\n".join(f"{SAMPLE_NAME}; {100 + 10 * i}; {suffix}; {200 * i}" for i, suffix in enumerate(suffixes))
+
+
+def execute_sections(script, *suffixes):
+    script.Foil().ExecuteSections(script.parse_sections(sections_text(*suffixes)))
+
+
+@pytest.fixture
+def profiler(database_script):
+    database_script._profiler.enabled = True
+    yield database_script._profiler
+    database_script._profiler.enabled = False
+
+
+@pytest.mark.parametrize("suffixes, message", [
+    (("a", "b", "a"), "Suffixes used more than once: ['a']"),
+    (("a", "b2", "c"), "Suffixes may contain letters only: ['b2']"),
+])
+def test_invalid_suffixes_place_nothing(database_script, design, suffixes, message):
+    execute_sections(database_script, *suffixes)
+
+    assert adsk.core.messages() == [message]
+    assert design.userParameters.count == 0
+    assert design.rootComponent.sketches.count == 0
+    assert design.rootComponent.constructionPlanes.count == 0
+
+
+def test_existing_suffix_places_nothing(database_script, design):
+    place(database_script, suffix="b")
+    parameters = design.userParameters.count
+    sketches = design.rootComponent.sketches.count
+
+    execute_sections(database_script, "a", "b", "c")
+
+    assert adsk.core.messages() == ["Airfoils with these suffixes already exist in the design: ['b']"]
+    assert design.userParameters.count == parameters
+    assert design.rootComponent.sketches.count == sketches
+    assert design.rootComponent.constructionPlanes.count == 0
+
+
+def test_profile_covers_all_sections(database_script, design, profiler):
+    place(database_script, suffix="z")
+    single_calls = dict(airfoil_sketch.api_calls)
+
+    execute_sections(database_script, "a", "b", "c")
+
+    assert adsk.core.messages() == []
+    for suffix in "abc":
+        assert design.userParameters.itemByName(airfoil_placement.driver_name(suffix)) is not None
+    report = profiler.report()
+    assert report["phases"]["section plane"]["calls"] == 3
+    assert report["phases"]["coordinates"]["calls"] == 3
+    assert report["api_calls"]["userParameters.add"] == 3 * single_calls["userParameters.add"]
+
+    # Eine einzelne Platzierung danach berichtet wieder nur über sich
+    place(database_script, suffix="d")
+    report = profiler.report()
+    assert report["phases"]["coordinates"]["calls"] == 1
+    assert report["api_calls"] == single_calls